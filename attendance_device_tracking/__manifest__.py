@@ -20,6 +20,7 @@
     "depends": ["hr_attendance", "base_geolocalize"],
     "data": [
         "security/ir.model.access.csv",
+        "data/ir_cron_data.xml",
         "views/res_config_settings_views.xml",
         "views/hr_attendance_views.xml",
     ],
@@ -1,5 +1,3 @@
-import datetime
-
 from requests.exceptions import RequestException
 
 from odoo import _, http
@@ -7,7 +5,6 @@ from odoo.exceptions import UserError
 from odoo.http import request
 from odoo.service.common import exp_version
 from odoo.tools import float_round, py_to_js_locale
-from odoo.tools.image import image_data_uri
 
 from odoo.addons.hr_attendance.controllers.main import HrAttendance as HrAttendanceController
 
@@ -20,6 +17,7 @@ class HrAttendance(HrAttendanceController):
         """Get basic attendance data for user display."""
         response = {}
         if employee:
+            settings = employee.company_id._get_attendance_kiosk_settings()
             response = {
                 "id": employee.id,
                 "hours_today": float_round(employee.hours_today, precision_digits=2),
@@ -31,42 +29,54 @@ class HrAttendance(HrAttendanceController):
                 ),
                 "last_check_in": employee.last_check_in,
                 "attendance_state": employee.attendance_state,
-                "display_systray": employee.company_id.attendance_from_systray,
-                "device_tracking_enabled": employee.company_id.attendance_device_tracking,
+                "display_systray": settings["attendance_from_systray"],
+                "device_tracking_enabled": settings["attendance_device_tracking"],
             }
         return response
 
+    @staticmethod
+    def _get_employee_avatar_url(employee):
+        """
+        Get the URL of the employee avatar, cacheable by the browser.
+
+        Kiosk replies link the avatar through the kiosk token, public users
+        having no access to the employee images.
+        """
+        unique = int(employee.write_date.timestamp()) if employee.write_date else 0
+        token = request.params.get("token")
+        if token:
+            return f"/hr_attendance/{token}/avatar/{employee.id}?unique={unique}"
+        return f"/web/image/hr.employee/{employee.id}/image_256?unique={unique}"
+
     @staticmethod
     def _get_employee_info_response(employee):
         """Get complete employee information for kiosk display."""
         response = {}
         if employee:
+            settings = employee.company_id._get_attendance_kiosk_settings()
             response = {
                 **HrAttendance._get_user_attendance_data(employee),
                 "employee_name": employee.name,
-                "employee_avatar": employee.image_256 and image_data_uri(employee.image_256),
+                "employee_avatar": HrAttendance._get_employee_avatar_url(employee),
                 "total_overtime": float_round(employee.total_overtime, precision_digits=2),
-                "kiosk_delay": employee.company_id.attendance_kiosk_delay * 1000,
+                "kiosk_delay": settings["attendance_kiosk_delay"] * 1000,
                 "attendance": {
                     "check_in": employee.last_attendance_id.check_in,
                     "check_out": employee.last_attendance_id.check_out,
                 },
-                "overtime_today": sum(
-                    request.env["hr.attendance.overtime.line"]
-                    .sudo()
-                    .search([
-                        ("employee_id", "=", employee.id),
-                        ("date", "=", datetime.date.today()),
-                    ])
-                    .mapped("duration")
-                )
-                or 0,
-                "use_pin": employee.company_id.attendance_kiosk_use_pin,
-                "display_overtime": employee.company_id.hr_attendance_display_overtime,
-                "device_tracking_enabled": employee.company_id.attendance_device_tracking,
+                "overtime_today": employee._get_overtime_today(),
+                "use_pin": settings["attendance_kiosk_use_pin"],
+                "display_overtime": settings["hr_attendance_display_overtime"],
+                "device_tracking_enabled": settings["attendance_device_tracking"],
             }
         return response
 
+    @staticmethod
+    def _get_company(token):
+        """Get the company of a kiosk token, from the per-worker cache."""
+        company_id = request.env["res.company"]._get_attendance_kiosk_company_id(token)
+        return request.env["res.company"].sudo().browse(company_id)
+
     @staticmethod
     def _get_geoip_response(
         mode, latitude=False, longitude=False, device_tracking_enabled=True
@@ -84,21 +94,39 @@ class HrAttendance(HrAttendanceController):
         if not device_tracking_enabled:
             return response
         
-        # Get location name from coordinates or IP
-        try:
-            location = request.env["base.geocoder"]._get_localisation(latitude, longitude)
-        except (UserError, RequestException):
-            location = _("Unknown")
-        
+        geo_latitude = latitude or (
+            request.geoip.location.latitude if request.geoip and request.geoip.location else False
+        )
+        geo_longitude = longitude or (
+            request.geoip.location.longitude if request.geoip and request.geoip.location else False
+        )
+        deferred = request.env["ir.config_parameter"].sudo().get_param(
+            "attendance_device_tracking.geocode_deferred"
+        )
+        if deferred:
+            # Leave the location name to the background worker
+            if geo_latitude and geo_longitude:
+                response["location_pending"] = True
+            else:
+                response["location"] = _("Unknown")
+        else:
+            # Get location name from coordinates or IP, GPS coordinates being
+            # resolved once per grid cell
+            try:
+                if latitude and longitude:
+                    location = request.env["attendance.geocode.cache"].sudo()._get_location(
+                        latitude, longitude
+                    )
+                else:
+                    location = request.env["base.geocoder"]._get_localisation(latitude, longitude)
+            except (UserError, RequestException):
+                location = _("Unknown")
+            response["location"] = location
+
         # Compile geo information
         response.update({
-            "location": location,
-            "latitude": latitude or (
-                request.geoip.location.latitude if request.geoip and request.geoip.location else False
-            ),
-            "longitude": longitude or (
-                request.geoip.location.longitude if request.geoip and request.geoip.location else False
-            ),
+            "latitude": geo_latitude,
+            "longitude": geo_longitude,
             "ip_address": request.geoip.ip if request.geoip else False,
             "browser": request.httprequest.user_agent.browser if request.httprequest.user_agent else False,
         })
@@ -153,6 +181,17 @@ class HrAttendance(HrAttendanceController):
             },
         )
 
+    @http.route("/hr_attendance/<token>/avatar/<int:employee_id>", type="http", auth="public", readonly=True)
+    def kiosk_employee_avatar(self, token, employee_id, unique=None):
+        """Serve the avatar of an employee of the kiosk company, with an ETag."""
+        company = self._get_company(token)
+        employee = request.env["hr.employee"].sudo().browse(employee_id).exists()
+        if not company or employee.company_id != company:
+            return request.not_found()
+        stream = request.env["ir.binary"]._get_image_stream_from(employee, "image_256")
+        # The unique parameter changes with the employee, the URL never goes stale
+        return stream.get_response(immutable=bool(unique))
+
     @http.route("/hr_attendance/attendance_employee_data", type="json", auth="public")
     def employee_attendance_data(self, token, employee_id):
         """Get employee attendance data for kiosk mode."""
@@ -168,20 +207,44 @@ class HrAttendance(HrAttendanceController):
         """Handle barcode scan for attendance tracking."""
         company = self._get_company(token)
         if company:
-            employee = request.env["hr.employee"].sudo().search([
-                ("barcode", "=", barcode),
-                ("company_id", "=", company.id),
-            ], limit=1)
+            # Token, badge and settings come from the per-worker caches
+            employee = request.env["hr.employee"].sudo().browse(
+                request.env["hr.employee"]._get_kiosk_employee_id(company.id, barcode)
+            )
             if employee:
+                settings = company._get_attendance_kiosk_settings()
                 employee._attendance_action_change(
                     self._get_geoip_response(
                         "kiosk",
-                        device_tracking_enabled=company.attendance_device_tracking,
+                        device_tracking_enabled=settings["attendance_device_tracking"],
                     )
                 )
                 return self._get_employee_info_response(employee)
         return {}
 
+    @http.route("/hr_attendance/attendance_sync", type="json", auth="public")
+    def attendance_sync(self, token, scans):
+        """
+        Apply the scans buffered by an offline kiosk, in one request.
+
+        :param scans: Ordered list of dicts with scan_id (generated by the
+                      kiosk), barcode, timestamp (UTC epoch milliseconds) and
+                      optional latitude and longitude
+        :return: Dictionary with the state of every scan, scans already
+                 synchronized being reported without being applied again
+        """
+        company = self._get_company(token)
+        if not company:
+            return {}
+        user_agent = request.httprequest.user_agent
+        results = request.env["hr.attendance.kiosk.scan"].sudo()._sync_scans(
+            company,
+            scans,
+            ip_address=request.geoip.ip if request.geoip else False,
+            browser=user_agent.browser if user_agent else False,
+        )
+        return {"results": results}
+
     @http.route("/hr_attendance/manual_selection", type="json", auth="public")
     def manual_selection_with_geolocation(
         self, token, employee_id, pin_code, latitude=False, longitude=False
@@ -190,15 +253,16 @@ class HrAttendance(HrAttendanceController):
         company = self._get_company(token)
         if company:
             employee = request.env["hr.employee"].sudo().browse(employee_id)
+            settings = company._get_attendance_kiosk_settings()
             if employee.company_id == company and (
-                (not company.attendance_kiosk_use_pin) or (employee.pin == pin_code)
+                (not settings["attendance_kiosk_use_pin"]) or (employee.pin == pin_code)
             ):
                 employee.sudo()._attendance_action_change(
                     self._get_geoip_response(
                         "kiosk",
                         latitude=latitude,
                         longitude=longitude,
-                        device_tracking_enabled=company.attendance_device_tracking,
+                        device_tracking_enabled=settings["attendance_device_tracking"],
                     )
                 )
                 return self._get_employee_info_response(employee)
@@ -0,0 +1,12 @@
+"""
+Shift-change load test of the attendance kiosk endpoints.
+
+The package is not loaded with the module. Run it with ``run.py`` against a
+throwaway database where the module is installed, or from Python::
+
+    from odoo.addons.attendance_device_tracking.loadtest import (
+        prepare_dataset, run_load_test,
+    )
+"""
+from .dataset import prepare_dataset
+from .runner import compare_results, run_load_test
@@ -0,0 +1,104 @@
+"""
+Load-test employees and users of the shift-change load test.
+
+The employees are recognised by their ``LT`` barcodes and reused by the next
+runs; their attendances are deleted before every run so that every run
+starts with everybody checked out.
+"""
+import logging
+import uuid
+
+from odoo import Command
+
+_logger = logging.getLogger(__name__)
+
+BARCODE_PREFIX = "LT"
+LOGIN_PREFIX = "loadtest"
+PASSWORD = "loadtest"
+
+
+def _barcode(index):
+    return f"{BARCODE_PREFIX}{index:05d}"
+
+
+def _pin(index):
+    return f"{index % 10000:04d}"
+
+
+def prepare_dataset(env, options):
+    """
+    Create the load-test employees and users of the main company and enable
+    the tracking features exercised by the run. The dataset is committed.
+
+    :param options: Dictionary with ``employees``, the number of badges, and
+                    ``users``, the number of employees given a login for
+                    the systray devices
+    :return: Dictionary with the kiosk token and the employees as
+             (id, barcode, pin, login) tuples
+    """
+    company = env.ref("base.main_company")
+    values = {"attendance_device_tracking": True}
+    if options.get("geofence") and "attendance_geofence_enabled" in company._fields:
+        # An office on the load-test positions, every check-in being allowed
+        values.update({
+            "attendance_geofence_enabled": True,
+            "attendance_lat": options["latitude"],
+            "attendance_lng": options["longitude"],
+            "attendance_radius": options["spread"] * 10,
+        })
+    if not company.attendance_kiosk_key:
+        values["attendance_kiosk_key"] = uuid.uuid4().hex
+    company.write(values)
+
+    Employee = env["hr.employee"].with_context(active_test=False)
+    existing = {
+        employee.barcode: employee
+        for employee in Employee.search([
+            ("barcode", "=like", f"{BARCODE_PREFIX}%"),
+            ("company_id", "=", company.id),
+        ])
+    }
+    missing = [
+        index for index in range(1, options["employees"] + 1)
+        if _barcode(index) not in existing
+    ]
+    created = Employee.create([
+        {
+            "name": f"Load Test {index:05d}",
+            "barcode": _barcode(index),
+            "pin": _pin(index),
+            "company_id": company.id,
+        }
+        for index in missing
+    ])
+    existing.update({employee.barcode: employee for employee in created})
+    employees = [existing[_barcode(index)] for index in range(1, options["employees"] + 1)]
+
+    for index, employee in enumerate(employees[:options["users"]], start=1):
+        if employee.user_id:
+            continue
+        employee.user_id = env["res.users"].with_context(no_reset_password=True).create({
+            "name": employee.name,
+            "login": f"{LOGIN_PREFIX}{index:05d}",
+            "password": PASSWORD,
+            "company_id": company.id,
+            "company_ids": [Command.set(company.ids)],
+        })
+
+    employee_ids = [employee.id for employee in employees]
+    env["hr.attendance"].search([("employee_id", "in", employee_ids)]).unlink()
+    if "hr.attendance.kiosk.scan" in env:
+        env["hr.attendance.kiosk.scan"].search([("employee_id", "in", employee_ids)]).unlink()
+    env.cr.commit()
+    _logger.info(
+        "Load-test dataset: %s employees (%s created), %s users",
+        len(employees), len(created), options["users"],
+    )
+    return {
+        "company_id": company.id,
+        "token": company.attendance_kiosk_key,
+        "employees": [
+            (employee.id, employee.barcode, employee.pin, employee.user_id.login or False)
+            for employee in employees
+        ],
+    }
@@ -0,0 +1,103 @@
+"""Replay a shift change against the attendance kiosk and systray routes.
+
+Run it against a throwaway database where the module is installed, the
+load-test employees and their attendances are committed::
+
+    python3 attendance_device_tracking/loadtest/run.py -c odoo.conf \
+        -d loadtest --devices 20 --requests 50 --geocoder-latency 0.3 \
+        --output result.json
+
+Pass ``--baseline`` with a previous result file to compare the latency
+percentiles and queries per request, the regressions being flagged.
+"""
+import argparse
+import json
+import re
+
+ROUTE_CHOICES = ("barcode", "manual", "systray")
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("-c", "--config", help="Odoo configuration file")
+    parser.add_argument("-d", "--database", required=True)
+    parser.add_argument("--routes", default=",".join(ROUTE_CHOICES))
+    parser.add_argument("--devices", type=int, default=10,
+                        help="Concurrent devices per route")
+    parser.add_argument("--requests", type=int, default=20,
+                        help="Check-ins/outs sent by every device")
+    parser.add_argument("--employees", type=int, default=500)
+    parser.add_argument("--think-time", type=float, default=0.0,
+                        help="Maximum random pause between two requests, in seconds")
+    parser.add_argument("--geocoder-latency", type=float, default=0.2,
+                        help="Latency of the stand-in reverse geocoder, in seconds")
+    parser.add_argument("--latitude", type=float, default=48.8584)
+    parser.add_argument("--longitude", type=float, default=2.2945)
+    parser.add_argument("--spread", type=float, default=200.0,
+                        help="Distance in meters of the positions from the office")
+    parser.add_argument("--deferred", action="store_true",
+                        help="Leave the location names to the background resolution")
+    parser.add_argument("--geofence", action="store_true",
+                        help="Enable the geofence of hr_attendance_geofence, if installed")
+    parser.add_argument("--shared-employees", action="store_true",
+                        help="Let every kiosk scan the same employees")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="Ratio to the baseline flagged as a regression")
+    parser.add_argument("--output", default="attendance_loadtest.json")
+    parser.add_argument("--baseline", help="Previous result file")
+    args = parser.parse_args()
+    args.routes = args.routes.split(",")
+    unknown = set(args.routes) - set(ROUTE_CHOICES)
+    if unknown:
+        parser.error(f"unknown routes: {', '.join(sorted(unknown))}")
+    return args
+
+
+def main():
+    args = _parse_args()
+    import odoo
+    from odoo import SUPERUSER_ID, api
+    odoo.tools.config.parse_config(["-c", args.config] if args.config else [])
+    # The test clients must land on the load-test database
+    odoo.tools.config["db_name"] = args.database
+    odoo.tools.config["dbfilter"] = f"^{re.escape(args.database)}$"
+    odoo.modules.module.initialize_sys_path()
+    odoo.service.server.load_server_wide_modules()
+    from odoo.addons.attendance_device_tracking.loadtest import (
+        compare_results, prepare_dataset, run_load_test,
+    )
+    from odoo.addons.attendance_device_tracking.loadtest.dataset import PASSWORD
+    options = {
+        "routes": args.routes,
+        "devices": args.devices,
+        "requests": args.requests,
+        "think_time": args.think_time,
+        "geocoder_latency": args.geocoder_latency,
+        "latitude": args.latitude,
+        "longitude": args.longitude,
+        "spread": args.spread,
+        "deferred": args.deferred,
+        "geofence": args.geofence,
+        "shared_employees": args.shared_employees,
+        "seed": args.seed,
+    }
+    registry = odoo.modules.registry.Registry(args.database)
+    with registry.cursor() as cr:
+        env = api.Environment(cr, SUPERUSER_ID, {})
+        dataset = prepare_dataset(env, dict(
+            options,
+            employees=args.employees,
+            users=args.devices if "systray" in args.routes else 0,
+        ))
+    dataset.update(database=args.database, password=PASSWORD)
+    result = run_load_test(registry, options, dataset)
+    with open(args.output, "w") as output:
+        json.dump(result, output, indent=2, default=str)
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            print("\n".join(compare_results(json.load(baseline), result, args.threshold)))
+
+
+if __name__ == "__main__":
+    main()
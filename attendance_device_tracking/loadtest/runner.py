@@ -0,0 +1,332 @@
+"""
+Concurrent kiosk and systray devices replaying a shift change.
+
+Every device is a thread with its own werkzeug test client calling the real
+controller routes through ``odoo.http.root``, as a threaded server would: the
+requests go through the session, database and routing layers and commit their
+attendances. The reverse geocoder is replaced by a local stand-in answering
+after a fixed latency, so the numbers do not depend on a remote service.
+
+For every route the run reports the latency percentiles, the SQL queries per
+request and the lock waits sampled in ``pg_stat_activity`` during the run.
+"""
+import json
+import logging
+import math
+import platform
+import random
+import resource
+import statistics
+import threading
+import time
+from unittest.mock import patch
+
+from werkzeug.test import Client
+
+import odoo
+from odoo import fields, release
+
+_logger = logging.getLogger(__name__)
+
+RESULT_VERSION = 1
+ROUTES = {
+    "barcode": "/hr_attendance/attendance_barcode_scanned",
+    "manual": "/hr_attendance/manual_selection",
+    "systray": "/hr_attendance/systray_check_in_out",
+}
+METERS_PER_DEGREE = 111320.0
+LOCK_SAMPLE_INTERVAL = 0.05
+
+
+def _stand_in_geocoder(latency):
+    """Reverse geocoder answering locally after ``latency`` seconds."""
+
+    def _get_localisation(self, latitude, longitude):
+        time.sleep(latency)
+        return f"Load test {latitude:.4f}, {longitude:.4f}"
+
+    return _get_localisation
+
+
+class _LockSampler(threading.Thread):
+    """Count the backends of the database waiting on a lock, every
+    ``LOCK_SAMPLE_INTERVAL`` seconds."""
+
+    def __init__(self, registry):
+        super().__init__(name="loadtest-lock-sampler", daemon=True)
+        self.registry = registry
+        self.stopped = threading.Event()
+        self.samples = []
+
+    def run(self):
+        with self.registry.cursor() as cr:
+            while not self.stopped.wait(LOCK_SAMPLE_INTERVAL):
+                cr.execute("""
+                    SELECT COUNT(*)
+                      FROM pg_stat_activity
+                     WHERE datname = current_database()
+                       AND wait_event_type = 'Lock'
+                """)
+                self.samples.append(cr.fetchone()[0])
+                cr.rollback()
+
+    def summary(self):
+        """Approximate lock wait, in backend-seconds, and its peak."""
+        return {
+            "samples": len(self.samples),
+            "wait_seconds": round(sum(self.samples) * LOCK_SAMPLE_INTERVAL, 3),
+            "max_waiting": max(self.samples, default=0),
+        }
+
+
+class _Device(threading.Thread):
+    """A kiosk or a user's systray sending ``requests`` check-ins/outs."""
+
+    def __init__(self, route, employees, options, dataset, barrier, seed):
+        super().__init__(name=f"loadtest-{route}-{seed}", daemon=True)
+        self.route = route
+        self.employees = employees
+        self.options = options
+        self.dataset = dataset
+        self.barrier = barrier
+        self.random = random.Random(seed)
+        self.client = Client(odoo.http.root)
+        self.runs = []
+
+    def _call(self, path, params):
+        """Post a JSON-RPC call and return its duration, queries, SQL time
+        and error, if any."""
+        thread = threading.current_thread()
+        started = time.perf_counter()
+        response = self.client.post(path, json={
+            "jsonrpc": "2.0",
+            "method": "call",
+            "id": self.random.randrange(1 << 31),
+            "params": params,
+        })
+        duration = time.perf_counter() - started
+        error = None
+        if response.status_code != 200:
+            error = f"HTTP {response.status_code}"
+        else:
+            body = json.loads(response.get_data())
+            if body.get("error"):
+                error = body["error"].get("data", {}).get("message") or body["error"]["message"]
+            elif not body.get("result"):
+                error = "Empty reply"
+        return {
+            "duration": duration,
+            "queries": getattr(thread, "query_count", 0),
+            "sql_time": getattr(thread, "query_time", 0.0),
+            "error": error,
+        }
+
+    def _position(self):
+        """A GPS position within ``spread`` meters of the office."""
+        spread = self.options["spread"] / METERS_PER_DEGREE
+        latitude = self.options["latitude"] + self.random.uniform(-spread, spread)
+        longitude = self.options["longitude"] + self.random.uniform(-spread, spread) / max(
+            math.cos(math.radians(self.options["latitude"])), 0.01
+        )
+        return latitude, longitude
+
+    def _params(self, employee):
+        employee_id, barcode, pin, _login = employee
+        if self.route == "barcode":
+            return {"token": self.dataset["token"], "barcode": barcode}
+        latitude, longitude = self._position()
+        if self.route == "manual":
+            return {
+                "token": self.dataset["token"],
+                "employee_id": employee_id,
+                "pin_code": pin,
+                "latitude": latitude,
+                "longitude": longitude,
+            }
+        return {"latitude": latitude, "longitude": longitude}
+
+    def run(self):
+        if self.route == "systray":
+            login = self._call("/web/session/authenticate", {
+                "db": self.dataset["database"],
+                "login": self.employees[0][3],
+                "password": self.dataset["password"],
+            })
+            if login["error"]:
+                _logger.error("%s: login failed: %s", self.name, login["error"])
+                self.barrier.abort()
+                return
+        try:
+            self.barrier.wait()
+        except threading.BrokenBarrierError:
+            return
+        for index in range(self.options["requests"]):
+            employee = self.employees[index % len(self.employees)]
+            self.runs.append(self._call(ROUTES[self.route], self._params(employee)))
+            if self.options["think_time"]:
+                time.sleep(self.random.uniform(0, self.options["think_time"]))
+
+
+def _percentiles(durations):
+    """Return p50, p95 and p99 of durations, in milliseconds."""
+    if len(durations) < 2:
+        return [round(sum(durations) * 1000, 2)] * 3
+    cuts = statistics.quantiles(durations, n=100, method="inclusive")
+    return [round(cuts[index] * 1000, 2) for index in (49, 94, 98)]
+
+
+def _summarize(route, devices, elapsed):
+    """Aggregate the runs of the devices of a route."""
+    runs = [run for device in devices for run in device.runs]
+    durations = [run["duration"] for run in runs]
+    p50, p95, p99 = _percentiles(durations)
+    errors = [run["error"] for run in runs if run["error"]]
+    return {
+        "key": route,
+        "route": ROUTES[route],
+        "devices": len(devices),
+        "requests": len(runs),
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "throughput": round(len(runs) / elapsed, 2) if elapsed else 0,
+        "p50": p50,
+        "p95": p95,
+        "p99": p99,
+        "max": round(max(durations, default=0) * 1000, 2),
+        "queries": round(statistics.mean(run["queries"] for run in runs), 1) if runs else 0,
+        "sql_ms": round(statistics.mean(run["sql_time"] for run in runs) * 1000, 2) if runs else 0,
+    }
+
+
+def _assign_devices(options, dataset):
+    """Split the employees between the devices of every route.
+
+    Systray devices take one employee with a login each. Kiosks take the
+    rest, each its own slice, or all of them with ``shared_employees`` so
+    that kiosks contend on the same attendances.
+    """
+    employees = dataset["employees"]
+    with_login = [employee for employee in employees if employee[3]]
+    badges = [employee for employee in employees if not employee[3]] or employees
+    assignments = []
+    kiosks = [route for route in options["routes"] if route != "systray"]
+    kiosk_count = options["devices"] * len(kiosks)
+    for route in options["routes"]:
+        for index in range(options["devices"]):
+            if route == "systray":
+                if index >= len(with_login):
+                    raise ValueError("Not enough load-test users for the systray devices")
+                assignments.append((route, [with_login[index]]))
+            elif options["shared_employees"]:
+                assignments.append((route, badges))
+            else:
+                slot = kiosks.index(route) * options["devices"] + index
+                assignments.append((route, badges[slot::kiosk_count] or badges))
+    return assignments
+
+
+def run_load_test(registry, options, dataset):
+    """
+    Run the load test and return its JSON-serialisable result.
+
+    The devices of all routes start together, like the badge queue of a
+    shift change. Deferred geocoding is switched as requested for the run
+    and restored afterwards.
+
+    :param options: Dictionary with ``routes``, ``devices`` per route,
+                    ``requests`` per device, ``think_time`` and
+                    ``geocoder_latency`` in seconds, ``spread`` in meters
+                    around ``latitude`` and ``longitude``, ``deferred``,
+                    ``shared_employees`` and the random ``seed``
+    :param dataset: Result of ``prepare_dataset`` with the database name
+                    and the users password
+    """
+    with registry.cursor() as cr:
+        parameters = odoo.api.Environment(cr, odoo.SUPERUSER_ID, {})["ir.config_parameter"]
+        deferred = parameters.get_param("attendance_device_tracking.geocode_deferred")
+        parameters.set_param("attendance_device_tracking.geocode_deferred", options["deferred"])
+
+    assignments = _assign_devices(options, dataset)
+    barrier = threading.Barrier(len(assignments) + 1)
+    devices = [
+        _Device(route, employees, options, dataset, barrier, options["seed"] + index)
+        for index, (route, employees) in enumerate(assignments)
+    ]
+    sampler = _LockSampler(registry)
+    geocoder = patch.object(
+        registry["base.geocoder"], "_get_localisation",
+        _stand_in_geocoder(options["geocoder_latency"]),
+    )
+    try:
+        with geocoder:
+            for device in devices:
+                device.start()
+            barrier.wait()
+            started = time.perf_counter()
+            sampler.start()
+            for device in devices:
+                device.join()
+            elapsed = time.perf_counter() - started
+            sampler.stopped.set()
+            sampler.join()
+    finally:
+        with registry.cursor() as cr:
+            env = odoo.api.Environment(cr, odoo.SUPERUSER_ID, {})
+            env["ir.config_parameter"].set_param(
+                "attendance_device_tracking.geocode_deferred", deferred
+            )
+            cr.execute("SHOW server_version")
+            server_version = cr.fetchone()[0]
+
+    results = [
+        _summarize(route, [device for device in devices if device.route == route], elapsed)
+        for route in options["routes"]
+    ]
+    for result in results:
+        _logger.info(
+            "%s: %s requests, p50 %.1f ms, p95 %.1f ms, p99 %.1f ms, %s queries, %s errors",
+            result["key"], result["requests"], result["p50"], result["p95"],
+            result["p99"], result["queries"], result["errors"],
+        )
+    return {
+        "version": RESULT_VERSION,
+        "created": fields.Datetime.to_string(fields.Datetime.now()),
+        "database": dataset["database"],
+        "odoo": release.version,
+        "postgresql": server_version,
+        "python": platform.python_version(),
+        "options": options,
+        "employees": len(dataset["employees"]),
+        "elapsed": round(elapsed, 3),
+        "lock_wait": sampler.summary(),
+        "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "results": results,
+    }
+
+
+def compare_results(baseline, current, threshold=1.2):
+    """Return the lines comparing the percentiles of two results, flagging
+    the routes whose p95 or queries per request grew beyond ``threshold``."""
+    previous = {result["key"]: result for result in baseline["results"]}
+    lines = [
+        f"{'route':<10} {'p50':>15} {'p95':>15} {'p99':>15} "
+        f"{'queries':>13} {'errors':>9}"
+    ]
+    for result in current["results"]:
+        old = previous.get(result["key"])
+        if not old:
+            continue
+        regressed = any(
+            old[key] and result[key] / old[key] > threshold for key in ("p95", "queries")
+        ) or result["errors"] > old["errors"]
+        lines.append(
+            f"{result['key']:<10} "
+            + " ".join(f"{old[key]:>7.1f}/{result[key]:<7.1f}" for key in ("p50", "p95", "p99"))
+            + f" {old['queries']:>6.1f}/{result['queries']:<6.1f}"
+            f" {old['errors']:>4}/{result['errors']:<4}"
+            + (" REGRESSION" if regressed else "")
+        )
+    old_lock = baseline.get("lock_wait", {}).get("wait_seconds", 0)
+    new_lock = current["lock_wait"]["wait_seconds"]
+    lines.append(f"lock wait  {old_lock:.3f}s -> {new_lock:.3f}s")
+    return lines
@@ -1,4 +1,6 @@
+from . import attendance_geocode_cache
 from . import hr_attendance
+from . import hr_attendance_kiosk_scan
 from . import hr_employee
 from . import res_company
 from . import res_config_settings
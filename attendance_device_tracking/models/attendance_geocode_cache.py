@@ -0,0 +1,253 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta, timezone
+
+from odoo import api, fields, models
+
+METERS_PER_DEGREE = 111320.0
+DEFAULT_CELL_SIZE = 50
+DEFAULT_TTL_DAYS = 30
+LRU_SIZE = 4096
+# Delay before retrying a cell the geocoder failed on, doubled on every
+# failure up to the maximum
+RETRY_DELAY_MINUTES = 5
+RETRY_MAX_DELAY_MINUTES = 24 * 60
+
+# In-process layer in front of the table, keyed by (database, cell key) and
+# holding (location, expiry timestamp) pairs
+_lru = OrderedDict()
+_lru_lock = threading.Lock()
+
+
+class AttendanceGeocodeCache(models.Model):
+    _name = "attendance.geocode.cache"
+    _description = "Attendance Reverse Geocoding Cache"
+    _order = "write_date desc"
+
+    cell_key = fields.Char(
+        string="Cell",
+        required=True,
+        readonly=True,
+        help="Cell size in meters and indexes of the grid cell",
+    )
+    latitude = fields.Float(
+        string="Latitude",
+        digits=(10, 7),
+        readonly=True,
+        aggregator=None,
+        help="Latitude of the center of the cell",
+    )
+    longitude = fields.Float(
+        string="Longitude",
+        digits=(10, 7),
+        readonly=True,
+        aggregator=None,
+        help="Longitude of the center of the cell",
+    )
+    location = fields.Char(
+        string="Location",
+        readonly=True,
+    )
+    failure_count = fields.Integer(
+        string="Failures",
+        readonly=True,
+        help="Consecutive geocoder failures on the cell",
+    )
+    retry_after = fields.Datetime(
+        string="Retry After",
+        readonly=True,
+        help="Pending locations of the cell are not resolved again before",
+    )
+
+    _sql_constraints = [
+        ("cell_key_unique", "UNIQUE(cell_key)", "A cell can only be geocoded once."),
+    ]
+
+    @api.model
+    def _get_settings(self):
+        """Return the cell size in meters and the time to live in days."""
+        params = self.env["ir.config_parameter"].sudo()
+        cell_size = int(params.get_param(
+            "attendance_device_tracking.geocode_cell_size", DEFAULT_CELL_SIZE
+        ) or DEFAULT_CELL_SIZE)
+        ttl_days = int(params.get_param(
+            "attendance_device_tracking.geocode_ttl_days", DEFAULT_TTL_DAYS
+        ) or DEFAULT_TTL_DAYS)
+        return max(cell_size, 1), max(ttl_days, 1)
+
+    @api.model
+    def _get_cell(self, latitude, longitude, cell_size):
+        """
+        Quantize coordinates to a grid of cells about ``cell_size`` meters wide.
+
+        :return: Tuple (cell key, latitude, longitude) of the cell center
+        """
+        lat_step = cell_size / METERS_PER_DEGREE
+        lat_index = math.floor(latitude / lat_step)
+        center_latitude = (lat_index + 0.5) * lat_step
+        # Meridians converge towards the poles, widen the cells accordingly
+        lon_step = lat_step / max(math.cos(math.radians(center_latitude)), 0.01)
+        lon_index = math.floor(longitude / lon_step)
+        center_longitude = min(max((lon_index + 0.5) * lon_step, -180.0), 180.0)
+        return f"{cell_size}:{lat_index}:{lon_index}", center_latitude, center_longitude
+
+    @api.model
+    def _lru_get(self, cell_key):
+        """Return the location of a cell from the process cache, or None."""
+        key = (self.env.cr.dbname, cell_key)
+        with _lru_lock:
+            entry = _lru.get(key)
+            if entry is None:
+                return None
+            if entry[1] < time.time():
+                del _lru[key]
+                return None
+            _lru.move_to_end(key)
+            return entry[0]
+
+    @api.model
+    def _lru_put(self, cell_key, location, expires_at):
+        """Store the location of a cell in the process cache."""
+        with _lru_lock:
+            _lru[(self.env.cr.dbname, cell_key)] = (location, expires_at)
+            _lru.move_to_end((self.env.cr.dbname, cell_key))
+            while len(_lru) > LRU_SIZE:
+                _lru.popitem(last=False)
+
+    @api.model
+    def _read_cell(self, cell_key, ttl_days):
+        """
+        Read the location of a cell from the table.
+
+        :return: Tuple (location, expiry timestamp), or None if the cell is
+                 missing or expired
+        """
+        self.env.cr.execute(
+            """
+            SELECT location, write_date
+              FROM attendance_geocode_cache
+             WHERE cell_key = %s
+               AND retry_after IS NULL
+               AND write_date >= NOW() AT TIME ZONE 'UTC' - %s * INTERVAL '1 day'
+            """,
+            (cell_key, ttl_days),
+        )
+        row = self.env.cr.fetchone()
+        if not row:
+            return None
+        resolved = row[1].replace(tzinfo=timezone.utc)
+        return row[0] or False, (resolved + timedelta(days=ttl_days)).timestamp()
+
+    @api.model
+    def _store_cell(self, cell_key, latitude, longitude, location):
+        """Insert or refresh the location of a cell; concurrent check-ins of
+        the same cell must not fail on the unique key."""
+        self.env.cr.execute(
+            """
+            INSERT INTO attendance_geocode_cache (
+                cell_key, latitude, longitude, location,
+                create_uid, create_date, write_uid, write_date
+            )
+            VALUES (%s, %s, %s, %s,
+                    %s, NOW() AT TIME ZONE 'UTC', %s, NOW() AT TIME ZONE 'UTC')
+            ON CONFLICT (cell_key) DO UPDATE
+               SET location = EXCLUDED.location,
+                   failure_count = 0,
+                   retry_after = NULL,
+                   write_uid = EXCLUDED.write_uid,
+                   write_date = EXCLUDED.write_date
+            """,
+            (cell_key, latitude, longitude, location or None,
+             self.env.uid, self.env.uid),
+        )
+        self.invalidate_model()
+
+    @api.model
+    def _defer_cell(self, cell_key):
+        """Record a geocoder failure on a cell, so that its pending
+        locations are retried after a delay doubling on every failure."""
+        self.env.cr.execute(
+            """
+            INSERT INTO attendance_geocode_cache (
+                cell_key, failure_count, retry_after,
+                create_uid, create_date, write_uid, write_date
+            )
+            VALUES (%(cell_key)s, 1,
+                    NOW() AT TIME ZONE 'UTC' + %(delay)s * INTERVAL '1 minute',
+                    %(uid)s, NOW() AT TIME ZONE 'UTC',
+                    %(uid)s, NOW() AT TIME ZONE 'UTC')
+            ON CONFLICT (cell_key) DO UPDATE
+               SET failure_count = attendance_geocode_cache.failure_count + 1,
+                   retry_after = NOW() AT TIME ZONE 'UTC' + LEAST(
+                       %(delay)s * POWER(2, attendance_geocode_cache.failure_count),
+                       %(max_delay)s
+                   ) * INTERVAL '1 minute',
+                   write_uid = EXCLUDED.write_uid,
+                   write_date = EXCLUDED.write_date
+            """,
+            {
+                "cell_key": cell_key,
+                "delay": RETRY_DELAY_MINUTES,
+                "max_delay": RETRY_MAX_DELAY_MINUTES,
+                "uid": self.env.uid,
+            },
+        )
+        self.invalidate_model()
+
+    @api.model
+    def _get_deferred_cells(self, cell_keys):
+        """Return the cells among ``cell_keys`` waiting for their retry."""
+        if not cell_keys:
+            return set()
+        self.env.cr.execute(
+            """
+            SELECT cell_key
+              FROM attendance_geocode_cache
+             WHERE cell_key = ANY(%s)
+               AND retry_after > NOW() AT TIME ZONE 'UTC'
+            """,
+            (list(cell_keys),),
+        )
+        return {row[0] for row in self.env.cr.fetchall()}
+
+    @api.model
+    def _get_location(self, latitude, longitude):
+        """
+        Resolve the location name of GPS coordinates through the cache.
+
+        Points of the same grid cell share one geocoder lookup, made on the
+        cell center. Geocoder errors are raised and nothing is cached.
+        """
+        cell_size, ttl_days = self._get_settings()
+        cell_key, center_latitude, center_longitude = self._get_cell(
+            latitude, longitude, cell_size
+        )
+        location = self._lru_get(cell_key)
+        if location is not None:
+            return location
+        cached = self._read_cell(cell_key, ttl_days)
+        if cached:
+            location, expires_at = cached
+        else:
+            location = self.env["base.geocoder"]._get_localisation(
+                center_latitude, center_longitude
+            )
+            self._store_cell(cell_key, center_latitude, center_longitude, location)
+            expires_at = time.time() + ttl_days * 86400
+        self._lru_put(cell_key, location or False, expires_at)
+        return location
+
+    @api.autovacuum
+    def _gc_expired_locations(self):
+        """Delete the cells older than their time to live."""
+        _cell_size, ttl_days = self._get_settings()
+        self.env.cr.execute(
+            """
+            DELETE FROM attendance_geocode_cache
+             WHERE write_date < NOW() AT TIME ZONE 'UTC' - %s * INTERVAL '1 day'
+            """,
+            (ttl_days,),
+        )
+        self.invalidate_model()
@@ -1,4 +1,16 @@
-from odoo import _, exceptions, fields, models
+import logging
+from collections import defaultdict
+
+from requests.exceptions import RequestException
+
+from odoo import _, api, exceptions, fields, models
+from odoo.tools.sql import create_index
+
+_logger = logging.getLogger(__name__)
+
+PENDING_BATCH_SIZE = 500
+# Precommit flag of the transactions that already woke up the resolution
+LOCATION_RESOLUTION_KEY = "attendance_device_tracking.location_resolution"
 
 
 def get_google_maps_url(latitude, longitude):
@@ -27,6 +39,12 @@ class HrAttendance(models.Model):
         readonly=True,
         help="Based on GPS coordinates if available or on IP address",
     )
+    in_location_pending = fields.Boolean(
+        string="Check-in Location Pending",
+        readonly=True,
+        copy=False,
+        help="The location name is resolved in the background",
+    )
     in_ip_address = fields.Char(
         string="Check-in IP Address",
         readonly=True,
@@ -65,6 +83,12 @@ class HrAttendance(models.Model):
         readonly=True,
         help="Based on GPS coordinates if available or on IP address",
     )
+    out_location_pending = fields.Boolean(
+        string="Check-out Location Pending",
+        readonly=True,
+        copy=False,
+        help="The location name is resolved in the background",
+    )
     out_ip_address = fields.Char(
         string="Check-out IP Address",
         readonly=True,
@@ -92,6 +116,18 @@ class HrAttendance(models.Model):
         string="Device Tracking Enabled",
     )
 
+    def init(self):
+        """Index the attendances waiting for their location name."""
+        super().init()
+        for prefix in ("in", "out"):
+            create_index(
+                self.env.cr,
+                f"hr_attendance_{prefix}_location_pending_index",
+                self._table,
+                [f"{prefix}_location_pending"],
+                where=f"{prefix}_location_pending",
+            )
+
     def copy(self, default=None):
         """Prevent duplication of attendance records."""
         raise exceptions.UserError(_("You cannot duplicate an attendance."))
@@ -118,3 +154,111 @@ class HrAttendance(models.Model):
             "target": "new",
         }
 
+    @api.model
+    def _get_pending_location_cells(self, prefix, cell_size, batch_size):
+        """
+        Group up to ``batch_size`` pending attendances by grid cell, oldest
+        first, leaving out the cells deferred after a geocoder failure.
+
+        :return: Tuple (attendances by cell key, whether no other pending
+                 attendance is left to resolve)
+        """
+        geocode_cache = self.env["attendance.geocode.cache"].sudo()
+        cells = defaultdict(lambda: self.browse())
+        count = last_id = 0
+        while count < batch_size:
+            attendances = self.search(
+                [(f"{prefix}_location_pending", "=", True), ("id", ">", last_id)],
+                order="id",
+                limit=batch_size,
+            )
+            if not attendances:
+                return cells, True
+            last_id = attendances[-1].id
+            cell_keys = {
+                attendance: geocode_cache._get_cell(
+                    attendance[f"{prefix}_latitude"],
+                    attendance[f"{prefix}_longitude"],
+                    cell_size,
+                )[0]
+                for attendance in attendances
+            }
+            deferred = geocode_cache._get_deferred_cells(set(cell_keys.values()))
+            for attendance, cell_key in cell_keys.items():
+                if cell_key in deferred:
+                    continue
+                if count == batch_size:
+                    return cells, False
+                cells[cell_key] |= attendance
+                count += 1
+        return cells, False
+
+    @api.model
+    def _trigger_location_resolution(self):
+        """
+        Wake up the worker resolving the pending locations.
+
+        The trigger is added once per transaction, right before it commits,
+        however many attendances of the request or sync batch were left
+        pending.
+        """
+        precommit = self.env.cr.precommit
+        if precommit.data.get(LOCATION_RESOLUTION_KEY):
+            return
+        cron = self.env.ref(
+            "attendance_device_tracking.ir_cron_resolve_attendance_locations",
+            raise_if_not_found=False,
+        )
+        if cron:
+            precommit.data[LOCATION_RESOLUTION_KEY] = True
+            precommit.add(cron.sudo()._trigger)
+
+    @api.model
+    def _cron_resolve_pending_locations(self, batch_size=PENDING_BATCH_SIZE):
+        """
+        Resolve the pending check-in and check-out locations in bulk.
+
+        Pending attendances are taken oldest first and grouped by grid cell
+        so that every cell is resolved once. Cells the geocoder fails on are
+        deferred, for a delay growing with every failure: their attendances
+        stay pending and are left out of the batches until then, so they
+        never hold back the newer ones.
+        """
+        geocode_cache = self.env["attendance.geocode.cache"].sudo()
+        cell_size, _ttl_days = geocode_cache._get_settings()
+        resolved = failed = 0
+        exhausted = True
+        for prefix in ("in", "out"):
+            latitude_field = f"{prefix}_latitude"
+            longitude_field = f"{prefix}_longitude"
+            cells, prefix_exhausted = self._get_pending_location_cells(
+                prefix, cell_size, batch_size
+            )
+            exhausted = exhausted and prefix_exhausted
+            for cell_key, cell_attendances in cells.items():
+                try:
+                    location = geocode_cache._get_location(
+                        cell_attendances[0][latitude_field],
+                        cell_attendances[0][longitude_field],
+                    )
+                except (exceptions.UserError, RequestException) as error:
+                    _logger.warning(
+                        "Could not resolve the location of %s attendances: %s",
+                        len(cell_attendances), error,
+                    )
+                    geocode_cache._defer_cell(cell_key)
+                    failed += len(cell_attendances)
+                    continue
+                cell_attendances.write({
+                    f"{prefix}_location": location or _("Unknown"),
+                    f"{prefix}_location_pending": False,
+                })
+                resolved += len(cell_attendances)
+        # Do not reschedule at once on geocoder failures, nor when only
+        # deferred cells are left: the next run retries them
+        remaining = 0 if failed or exhausted else self.search_count([
+            "|",
+            ("in_location_pending", "=", True),
+            ("out_location_pending", "=", True),
+        ])
+        self.env["ir.cron"]._notify_progress(done=resolved, remaining=remaining)
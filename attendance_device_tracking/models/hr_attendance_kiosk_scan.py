@@ -0,0 +1,283 @@
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from odoo import _, api, fields, models
+from odoo.exceptions import UserError, ValidationError
+
+_logger = logging.getLogger(__name__)
+
+SCAN_RETENTION_DAYS = 30
+MAX_CLOCK_SKEW = timedelta(minutes=5)
+MAX_SYNC_SCANS = 1000
+
+
+class HrAttendanceKioskScan(models.Model):
+    _name = "hr.attendance.kiosk.scan"
+    _description = "Attendance Kiosk Synchronized Scan"
+    _order = "device_time desc, id desc"
+
+    scan_id = fields.Char(
+        string="Scan ID",
+        required=True,
+        readonly=True,
+        help="Identifier generated by the kiosk, a scan being applied once",
+    )
+    company_id = fields.Many2one(
+        "res.company",
+        string="Company",
+        required=True,
+        readonly=True,
+    )
+    employee_id = fields.Many2one(
+        "hr.employee",
+        string="Employee",
+        readonly=True,
+    )
+    attendance_id = fields.Many2one(
+        "hr.attendance",
+        string="Attendance",
+        readonly=True,
+        ondelete="set null",
+    )
+    device_time = fields.Datetime(
+        string="Scan Time",
+        readonly=True,
+        help="Time of the scan on the kiosk",
+    )
+    state = fields.Selection(
+        string="Status",
+        selection=[
+            ("done", "Done"),
+            ("rejected", "Rejected"),
+        ],
+        required=True,
+        readonly=True,
+    )
+    message = fields.Char(
+        string="Message",
+        readonly=True,
+    )
+
+    _sql_constraints = [
+        (
+            "scan_id_unique",
+            "UNIQUE(company_id, scan_id)",
+            "A kiosk scan can only be synchronized once.",
+        ),
+    ]
+
+    @api.model
+    def _parse_scans(self, scans):
+        """
+        Validate the scans sent by a kiosk, in their order.
+
+        :param scans: List of dicts with scan_id, barcode, timestamp (UTC epoch
+                      milliseconds) and optional latitude and longitude
+        :return: List of (scan_id, barcode, datetime, latitude, longitude),
+                 without the scans repeated in the batch
+        """
+        if not isinstance(scans, list):
+            raise UserError(_("The scans must be a list."))
+        if len(scans) > MAX_SYNC_SCANS:
+            raise UserError(_(
+                "At most %(count)s scans can be synchronized at once.", count=MAX_SYNC_SCANS
+            ))
+        now = fields.Datetime.now()
+        parsed = {}
+        for scan in scans:
+            try:
+                scan_id = str(scan["scan_id"])
+                barcode = str(scan["barcode"])
+                device_time = datetime.fromtimestamp(
+                    int(scan["timestamp"]) / 1000, tz=timezone.utc
+                ).replace(tzinfo=None)
+                latitude = float(scan.get("latitude") or 0.0)
+                longitude = float(scan.get("longitude") or 0.0)
+            except (KeyError, TypeError, ValueError, OverflowError):
+                raise UserError(_("Invalid scan: %(scan)s", scan=scan)) from None
+            if device_time > now + MAX_CLOCK_SKEW:
+                raise UserError(_("Scan %(scan_id)s is in the future.", scan_id=scan_id))
+            parsed.setdefault(scan_id, (
+                scan_id, barcode, device_time.replace(microsecond=0), latitude, longitude
+            ))
+        return list(parsed.values())
+
+    @api.model
+    def _get_geo_values(self, company, latitude, longitude, ip_address, browser):
+        """Geo information of a synchronized scan, its location being left
+        to the background resolution."""
+        values = {"mode": "kiosk"}
+        if company.attendance_device_tracking:
+            values.update({
+                "latitude": latitude,
+                "longitude": longitude,
+                "ip_address": ip_address,
+                "browser": browser,
+            })
+            if latitude and longitude:
+                values["location_pending"] = True
+            else:
+                values["location"] = _("Unknown")
+        return values
+
+    @api.model
+    def _check_scan_positions(self, employee_by_barcode, scans):
+        """
+        Check the positions of scans against the geofences, when
+        hr_attendance_geofence is installed.
+
+        :return: Dictionary of the error messages by rejected scan_id
+        """
+        if "hr.attendance.geofence.zone" not in self.env:
+            return {}
+        errors = self.env["hr.attendance.geofence.zone"]._check_positions([
+            (employee_by_barcode[scan[1]], scan[3], scan[4]) for scan in scans
+        ])
+        return {scan[0]: error for scan, error in zip(scans, errors) if error}
+
+    @api.model
+    def _apply_employee_scans(self, employee, open_attendance, scans, geo_values, rejected):
+        """
+        Replay the scans of an employee in order: every scan checks in, or
+        checks out the open attendance. Rejected scans are skipped, like a
+        refused scan on an online kiosk, so that they do not shift the
+        direction of the next scans.
+
+        :param rejected: Dictionary of the error messages by rejected scan_id
+        :return: List of (scan, attendance) pairs of the applied scans
+        """
+        to_create = []
+        close_vals = None
+        results = []
+        pending = None  # attendance checked in by this batch, not created yet
+        for scan in scans:
+            scan_id, _barcode, device_time, _latitude, _longitude = scan
+            if scan_id in rejected:
+                continue
+            geo = geo_values[scan_id]
+            if open_attendance and close_vals is None:
+                close_vals = {"check_out": device_time}
+                close_vals.update({f"out_{key}": value for key, value in geo.items()})
+                results.append((scan, open_attendance))
+            elif pending is not None and "check_out" not in pending:
+                pending["check_out"] = device_time
+                pending.update({f"out_{key}": value for key, value in geo.items()})
+                results.append((scan, len(to_create) - 1))
+            else:
+                pending = {"employee_id": employee.id, "check_in": device_time}
+                pending.update({f"in_{key}": value for key, value in geo.items()})
+                to_create.append(pending)
+                results.append((scan, len(to_create) - 1))
+        if close_vals:
+            open_attendance.write(close_vals)
+        created = self.env["hr.attendance"].create(to_create)
+        return [
+            (scan, created[target] if isinstance(target, int) else target)
+            for scan, target in results
+        ]
+
+    @api.model
+    def _sync_scans(self, company, scans, ip_address=False, browser=False):
+        """
+        Apply a batch of scans buffered by an offline kiosk.
+
+        Employees and their open attendances are read in one query each,
+        geofences are checked in bulk when hr_attendance_geofence is installed,
+        and the attendances of every employee are created and closed in their
+        scan order. Scans already synchronized are reported, not applied again.
+
+        :return: List of dicts with scan_id, state and message, in scan order
+        """
+        scans = self._parse_scans(scans)
+        scan_ids = [scan[0] for scan in scans]
+        done = {
+            scan.scan_id: scan
+            for scan in self.search([
+                ("company_id", "=", company.id),
+                ("scan_id", "in", scan_ids),
+            ])
+        }
+        scans = [scan for scan in scans if scan[0] not in done]
+
+        employees = self.env["hr.employee"].search([
+            ("barcode", "in", list({scan[1] for scan in scans})),
+            ("company_id", "=", company.id),
+        ])
+        employee_by_barcode = {employee.barcode: employee for employee in employees}
+
+        rejected = {}
+        for scan in scans:
+            if scan[1] not in employee_by_barcode:
+                rejected[scan[0]] = _("No employee corresponds to barcode %(barcode)s.", barcode=scan[1])
+        known = [scan for scan in scans if scan[0] not in rejected]
+        rejected.update(self._check_scan_positions(employee_by_barcode, known))
+        accepted = [scan for scan in known if scan[0] not in rejected]
+
+        scans_by_employee = defaultdict(list)
+        for scan in known:
+            scans_by_employee[employee_by_barcode[scan[1]]].append(scan)
+        open_attendances = self.env["hr.attendance"].search([
+            ("employee_id", "in", [employee.id for employee in scans_by_employee]),
+            ("check_out", "=", False),
+        ]).grouped("employee_id")
+        geo_values = {
+            scan[0]: self._get_geo_values(company, scan[3], scan[4], ip_address, browser)
+            for scan in accepted
+        }
+
+        attendance_by_scan = {}
+        for employee, employee_scans in scans_by_employee.items():
+            employee_scans.sort(key=lambda scan: scan[2])
+            try:
+                # An invalid sequence of one employee must not reject the others
+                with self.env.cr.savepoint():
+                    applied = self._apply_employee_scans(
+                        employee,
+                        open_attendances.get(employee, self.env["hr.attendance"]),
+                        employee_scans,
+                        geo_values,
+                        rejected,
+                    )
+            except (UserError, ValidationError) as error:
+                _logger.info("Kiosk scans of employee %s rejected: %s", employee.id, error)
+                self.env.invalidate_all()
+                for scan in employee_scans:
+                    rejected.setdefault(scan[0], str(error))
+                continue
+            attendance_by_scan.update({scan[0]: attendance for scan, attendance in applied})
+
+        if any(values.get("location_pending") for values in geo_values.values()):
+            self.env["hr.attendance"]._trigger_location_resolution()
+
+        created = self.create([
+            {
+                "scan_id": scan[0],
+                "company_id": company.id,
+                "employee_id": employee_by_barcode[scan[1]].id
+                if scan[1] in employee_by_barcode else False,
+                "attendance_id": attendance_by_scan[scan[0]].id
+                if scan[0] in attendance_by_scan else False,
+                "device_time": scan[2],
+                "state": "rejected" if scan[0] in rejected else "done",
+                "message": rejected.get(scan[0], False),
+            }
+            for scan in scans
+        ])
+        done.update({scan.scan_id: scan for scan in created})
+        return [
+            {
+                "scan_id": scan_id,
+                "state": done[scan_id].state,
+                "message": done[scan_id].message or False,
+            }
+            for scan_id in scan_ids
+        ]
+
+    @api.autovacuum
+    def _gc_synchronized_scans(self):
+        """Forget the scans synchronized long ago, kiosks flushing their
+        buffer well before."""
+        self.search([
+            ("create_date", "<", fields.Datetime.now() - timedelta(days=SCAN_RETENTION_DAYS)),
+        ]).unlink()
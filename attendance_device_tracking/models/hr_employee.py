@@ -1,9 +1,81 @@
-from odoo import _, exceptions, fields, models
+import datetime
+import threading
+import time
+from collections import OrderedDict
+
+from odoo import _, api, exceptions, fields, models
+
+from .kiosk_lookup_cache import KioskLookupCache
+
+KIOSK_BADGE_CACHE_SIZE = 8192
+KIOSK_BADGE_MISS_TTL = 60  # seconds
+
+# Employee of a badge, keyed by (database, company, barcode)
+_kiosk_badge_cache = KioskLookupCache(KIOSK_BADGE_CACHE_SIZE, KIOSK_BADGE_MISS_TTL)
+
+OVERTIME_CACHE_SIZE = 4096
+OVERTIME_CACHE_TTL = 300  # seconds
+
+# Today's overtime per employee, keyed by (database, employee, day, last
+# attendance, its write date) and holding (overtime, expiry) pairs
+_overtime_cache = OrderedDict()
+_overtime_cache_lock = threading.Lock()
 
 
 class HrEmployee(models.Model):
     _inherit = "hr.employee"
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        employees = super().create(vals_list)
+        employees.filtered("barcode")._forget_kiosk_badges()
+        return employees
+
+    def write(self, vals):
+        res = super().write(vals)
+        if vals.keys() & {"barcode", "company_id", "active"}:
+            self.filtered("barcode")._forget_kiosk_badges()
+        return res
+
+    def _forget_kiosk_badges(self):
+        """Drop the badges of the employees from the cache of this worker,
+        where they may be cached as unknown. Other workers find them once
+        their miss expires."""
+        for employee in self:
+            _kiosk_badge_cache.discard(
+                (self.env.cr.dbname, employee.company_id.id, employee.barcode)
+            )
+
+    @api.model
+    def _get_kiosk_employee_id(self, company_id, barcode):
+        """
+        Return the id of the employee of a badge in a company.
+
+        The id comes from the per-worker cache and is checked against the
+        employee, loaded by the kiosk reply anyway: badges being unique, an
+        active employee of the company still holding the badge is the right
+        one. A stale entry is replaced by the result of a new search, so the
+        next scans of the badge hit the cache again.
+        """
+        key = (self.env.cr.dbname, company_id, barcode)
+        employee_id = _kiosk_badge_cache.get(key)
+        if employee_id == 0:
+            return 0
+        if employee_id:
+            employee = self.sudo().browse(employee_id)
+            try:
+                if employee.active and employee.barcode == barcode \
+                        and employee.company_id.id == company_id:
+                    return employee_id
+            except exceptions.MissingError:
+                pass
+        employee_id = self.sudo().search([
+            ("barcode", "=", barcode),
+            ("company_id", "=", company_id),
+        ], limit=1).id
+        _kiosk_badge_cache.set(key, employee_id)
+        return employee_id
+
     def _attendance_action_change(self, geo_information=None):
         """
         Override to support geo-tracking information during check-in/out.
@@ -27,7 +99,10 @@ class HrEmployee(models.Model):
                     f"in_{key}": geo_information[key]
                     for key in geo_information
                 })
-            return self.env["hr.attendance"].create(vals)
+            attendance = self.env["hr.attendance"].create(vals)
+            if geo_information and geo_information.get("location_pending"):
+                attendance._trigger_location_resolution()
+            return attendance
         
         # Check-out case
         attendance = self.env["hr.attendance"].search([
@@ -44,6 +119,8 @@ class HrEmployee(models.Model):
                     for key in geo_information
                 })
             attendance.write(vals)
+            if geo_information and geo_information.get("location_pending"):
+                attendance._trigger_location_resolution()
         else:
             raise exceptions.UserError(_(
                 "Cannot perform check out on %(empl_name)s, could not find corresponding check in. "
@@ -53,3 +130,39 @@ class HrEmployee(models.Model):
         
         return attendance
 
+    def _get_overtime_today(self):
+        """
+        Return today's overtime of the employee, cached per worker.
+
+        The key holds the last attendance and its write date, so a check-in or
+        check-out misses the cache of every worker without any signaling.
+        Overtime edited manually is picked up within ``OVERTIME_CACHE_TTL``.
+        """
+        self.ensure_one()
+        last_attendance = self.last_attendance_id
+        today = datetime.date.today()
+        key = (
+            self.env.cr.dbname, self.id, today,
+            last_attendance.id, last_attendance.write_date,
+        )
+        now = time.monotonic()
+        with _overtime_cache_lock:
+            entry = _overtime_cache.get(key)
+            if entry and entry[1] > now:
+                _overtime_cache.move_to_end(key)
+                return entry[0]
+        overtime = sum(
+            self.env["hr.attendance.overtime.line"]
+            .sudo()
+            .search([
+                ("employee_id", "=", self.id),
+                ("date", "=", today),
+            ])
+            .mapped("duration")
+        ) or 0
+        with _overtime_cache_lock:
+            _overtime_cache[key] = (overtime, now + OVERTIME_CACHE_TTL)
+            _overtime_cache.move_to_end(key)
+            while len(_overtime_cache) > OVERTIME_CACHE_SIZE:
+                _overtime_cache.popitem(last=False)
+        return overtime
@@ -0,0 +1,52 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class KioskLookupCache:
+    """
+    Per-worker cache of a kiosk lookup, holding record ids by key.
+
+    Entries are replaced one at a time, never cleared in bulk: the caller
+    checks a cached id against the record it points to and stores the
+    result of a new search when it is stale. Misses, cached as 0, expire
+    after ``miss_ttl`` seconds, so that a badge or key given in another
+    worker is found without any signaling.
+    """
+
+    def __init__(self, size, miss_ttl):
+        self.size = size
+        self.miss_ttl = miss_ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached id of key, 0 for a cached miss, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            record_id, expiry = entry
+            if not record_id and expiry <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return record_id
+
+    def set(self, key, record_id):
+        """Store the id of key, replacing its previous entry"""
+        expiry = None if record_id else time.monotonic() + self.miss_ttl
+        with self._lock:
+            self._entries[key] = (record_id, expiry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def discard(self, key):
+        """Forget key, e.g. once this worker gave it to a record"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -1,7 +1,25 @@
 import uuid
 from urllib.parse import urljoin
 
-from odoo import api, fields, models
+from odoo import api, fields, models, tools
+from odoo.exceptions import MissingError
+
+from .kiosk_lookup_cache import KioskLookupCache
+
+# Company fields sent with every kiosk reply
+KIOSK_SETTINGS = (
+    "attendance_kiosk_delay",
+    "attendance_kiosk_use_pin",
+    "attendance_from_systray",
+    "hr_attendance_display_overtime",
+    "attendance_device_tracking",
+)
+
+KIOSK_TOKEN_CACHE_SIZE = 1024
+KIOSK_TOKEN_MISS_TTL = 60  # seconds
+
+# Company of a kiosk token, keyed by (database, token)
+_kiosk_token_cache = KioskLookupCache(KIOSK_TOKEN_CACHE_SIZE, KIOSK_TOKEN_MISS_TTL)
 
 
 class ResCompany(models.Model):
@@ -37,3 +55,54 @@ class ResCompany(models.Model):
                 )
             else:
                 company.attendance_kiosk_url = False
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        companies = super().create(vals_list)
+        companies._forget_kiosk_tokens()
+        return companies
+
+    def write(self, vals):
+        res = super().write(vals)
+        if "attendance_kiosk_key" in vals:
+            self._forget_kiosk_tokens()
+        return res
+
+    def _forget_kiosk_tokens(self):
+        """Drop the kiosk keys of the companies from the cache of this
+        worker, where they may be cached as unknown. Other workers find them
+        once their miss expires."""
+        for company in self.sudo().filtered("attendance_kiosk_key"):
+            _kiosk_token_cache.discard((self.env.cr.dbname, company.attendance_kiosk_key))
+
+    @api.model
+    def _get_attendance_kiosk_company_id(self, token):
+        """
+        Return the id of the company of a kiosk token.
+
+        The id comes from the per-worker cache and is checked against the
+        company, loaded by the kiosk reply anyway. A stale entry is replaced
+        by the result of a new search, so the next requests of the kiosk hit
+        the cache again.
+        """
+        key = (self.env.cr.dbname, token)
+        company_id = _kiosk_token_cache.get(key)
+        if company_id == 0:
+            return 0
+        if company_id:
+            company = self.sudo().browse(company_id)
+            try:
+                if company.active and company.attendance_kiosk_key == token:
+                    return company_id
+            except MissingError:
+                pass
+        company_id = self.sudo().search([("attendance_kiosk_key", "=", token)], limit=1).id
+        _kiosk_token_cache.set(key, company_id)
+        return company_id
+
+    def _get_attendance_kiosk_settings(self):
+        """Return the kiosk settings of the company, read with the company
+        loaded by the token check."""
+        self.ensure_one()
+        company = self.sudo()
+        return tools.frozendict({field: company[field] for field in KIOSK_SETTINGS})
@@ -1,5 +1,7 @@
 from odoo import fields, models
 
+from .attendance_geocode_cache import DEFAULT_CELL_SIZE, DEFAULT_TTL_DAYS
+
 
 class ResConfigSettings(models.TransientModel):
     _inherit = "res.config.settings"
@@ -14,4 +16,20 @@ class ResConfigSettings(models.TransientModel):
         string="Device & Location Tracking",
         readonly=False,
     )
-
+    attendance_geocode_cell_size = fields.Integer(
+        string="Geocoding Cell Size",
+        config_parameter="attendance_device_tracking.geocode_cell_size",
+        default=DEFAULT_CELL_SIZE,
+        help="Width in meters of the grid cells sharing one resolved location name",
+    )
+    attendance_geocode_ttl_days = fields.Integer(
+        string="Geocoding Cache Duration",
+        config_parameter="attendance_device_tracking.geocode_ttl_days",
+        default=DEFAULT_TTL_DAYS,
+        help="Number of days a resolved location name is reused",
+    )
+    attendance_geocode_deferred = fields.Boolean(
+        string="Resolve Locations in Background",
+        config_parameter="attendance_device_tracking.geocode_deferred",
+        help="Record check-ins at once and resolve their location names with a scheduled action",
+    )
@@ -0,0 +1,3 @@
+from . import test_kiosk_cache
+from . import test_kiosk_sync
+from . import test_location_resolution
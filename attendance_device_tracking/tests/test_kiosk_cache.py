@@ -0,0 +1,112 @@
+from unittest.mock import patch
+
+from odoo.tests import TransactionCase, tagged
+
+from ..models.hr_employee import _kiosk_badge_cache
+from ..models.res_company import _kiosk_token_cache
+
+
+@tagged("post_install", "-at_install")
+class TestKioskCache(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.company = cls.env.company
+        cls.company.attendance_kiosk_key = "kiosk-cache-token"
+        cls.employee, cls.other_employee = cls.env["hr.employee"].create([
+            {"name": "Cached Badge", "barcode": "CACHE001", "company_id": cls.company.id},
+            {"name": "Other Cached Badge", "company_id": cls.company.id},
+        ])
+        cls.Employee = cls.env["hr.employee"]
+        cls.Company = cls.env["res.company"]
+
+    def setUp(self):
+        super().setUp()
+        _kiosk_badge_cache.clear()
+        _kiosk_token_cache.clear()
+
+    def _load(self, records):
+        """Load records from the database, as the kiosk reply does"""
+        self.env.invalidate_all()
+        records.read(["active"])
+
+    def test_badge_moved(self):
+        """A badge given to another employee is found without clearing the caches"""
+        company_id = self.company.id
+        self.assertEqual(self.Employee._get_kiosk_employee_id(company_id, "CACHE001"), self.employee.id)
+        self.employee.barcode = False
+        self.other_employee.barcode = "CACHE001"
+        self.assertEqual(
+            self.Employee._get_kiosk_employee_id(company_id, "CACHE001"), self.other_employee.id
+        )
+
+    def test_badge_archived_and_new(self):
+        """Archived employees lose their badge, new badges are found"""
+        company_id = self.company.id
+        self.assertFalse(self.Employee._get_kiosk_employee_id(company_id, "CACHE002"))
+        self.other_employee.barcode = "CACHE002"
+        self.assertEqual(
+            self.Employee._get_kiosk_employee_id(company_id, "CACHE002"), self.other_employee.id
+        )
+        self.other_employee.active = False
+        self.assertFalse(self.Employee._get_kiosk_employee_id(company_id, "CACHE002"))
+
+    def test_token_changed(self):
+        """A new kiosk key replaces the old one in every worker"""
+        self.assertEqual(
+            self.Company._get_attendance_kiosk_company_id("kiosk-cache-token"), self.company.id
+        )
+        self.company.attendance_kiosk_key = "kiosk-cache-token-2"
+        self.assertFalse(self.Company._get_attendance_kiosk_company_id("kiosk-cache-token"))
+        self.assertEqual(
+            self.Company._get_attendance_kiosk_company_id("kiosk-cache-token-2"), self.company.id
+        )
+
+    def test_settings_changed(self):
+        """The cached kiosk settings follow the writes of the company"""
+        self.company.attendance_kiosk_use_pin = False
+        self.assertFalse(self.company._get_attendance_kiosk_settings()["attendance_kiosk_use_pin"])
+        self.company.attendance_kiosk_use_pin = True
+        self.assertTrue(self.company._get_attendance_kiosk_settings()["attendance_kiosk_use_pin"])
+
+    def test_badge_moved_refreshes_entry(self):
+        """After a badge moved, the first scan searches it again and the next
+        ones are served by the cache"""
+        company_id = self.company.id
+        self.Employee._get_kiosk_employee_id(company_id, "CACHE001")
+        # Moved in another worker: the cache of this one is left as it is
+        with patch.object(type(self.Employee), "_forget_kiosk_badges"):
+            self.employee.barcode = False
+            self.other_employee.barcode = "CACHE001"
+        self._load(self.employee | self.other_employee)
+        with self.assertQueryCount(1):
+            self.Employee._get_kiosk_employee_id(company_id, "CACHE001")
+        self._load(self.other_employee)
+        with self.assertQueryCount(0):
+            self.assertEqual(
+                self.Employee._get_kiosk_employee_id(company_id, "CACHE001"),
+                self.other_employee.id,
+            )
+
+    def test_unknown_badge_cached(self):
+        """Unknown badges are searched once, until their miss expires"""
+        company_id = self.company.id
+        self.assertFalse(self.Employee._get_kiosk_employee_id(company_id, "UNKNOWN"))
+        with self.assertQueryCount(0):
+            self.assertFalse(self.Employee._get_kiosk_employee_id(company_id, "UNKNOWN"))
+        # Once the miss expired, the badge is searched again
+        with patch.object(_kiosk_badge_cache, "miss_ttl", -1):
+            _kiosk_badge_cache.set((self.env.cr.dbname, company_id, "UNKNOWN"), 0)
+        with self.assertQueryCount(1):
+            self.Employee._get_kiosk_employee_id(company_id, "UNKNOWN")
+
+    def test_token_moved_refreshes_entry(self):
+        """After a kiosk key changed, the old key is searched once"""
+        self.Company._get_attendance_kiosk_company_id("kiosk-cache-token")
+        with patch.object(type(self.Company), "_forget_kiosk_tokens"):
+            self.company.attendance_kiosk_key = "kiosk-cache-token-3"
+        self._load(self.company)
+        with self.assertQueryCount(1):
+            self.assertFalse(self.Company._get_attendance_kiosk_company_id("kiosk-cache-token"))
+        with self.assertQueryCount(0):
+            self.assertFalse(self.Company._get_attendance_kiosk_company_id("kiosk-cache-token"))
@@ -0,0 +1,100 @@
+from datetime import timedelta, timezone
+from unittest.mock import patch
+
+from odoo import fields
+from odoo.tests import TransactionCase, tagged
+
+from ..models.hr_attendance_kiosk_scan import HrAttendanceKioskScan
+
+
+@tagged("post_install", "-at_install")
+class TestKioskSync(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.company = cls.env.company
+        cls.employee, cls.other_employee = cls.env["hr.employee"].create([
+            {"name": "Offline Scan", "barcode": "SYNC0001", "company_id": cls.company.id},
+            {"name": "Other Offline Scan", "barcode": "SYNC0002", "company_id": cls.company.id},
+        ])
+        cls.start = fields.Datetime.now().replace(microsecond=0) - timedelta(hours=4)
+        cls.Scan = cls.env["hr.attendance.kiosk.scan"]
+
+    def _scan(self, scan_id, barcode, minutes):
+        device_time = self.start + timedelta(minutes=minutes)
+        return {
+            "scan_id": scan_id,
+            "barcode": barcode,
+            "timestamp": int(device_time.replace(tzinfo=timezone.utc).timestamp() * 1000),
+        }
+
+    def _attendances(self, employee):
+        return self.env["hr.attendance"].search(
+            [("employee_id", "=", employee.id)], order="check_in"
+        )
+
+    def test_device_time(self):
+        """The timestamps of the kiosk are read as UTC, to the second"""
+        scans = self.Scan._parse_scans([self._scan("a", "SYNC0001", 0)])
+        self.assertEqual(scans[0][2], self.start)
+
+    def test_sync_alternates(self):
+        """Scans check in and out in their device time order, as online scans do"""
+        results = self.Scan._sync_scans(self.company, [
+            self._scan("b", "SYNC0001", 30),
+            self._scan("a", "SYNC0001", 0),
+            self._scan("c", "SYNC0001", 60),
+            self._scan("d", "SYNC0002", 10),
+        ])
+        self.assertEqual([result["state"] for result in results], ["done"] * 4)
+        first, second = self._attendances(self.employee)
+        self.assertEqual(
+            (first.check_in, first.check_out),
+            (self.start, self.start + timedelta(minutes=30)),
+        )
+        self.assertEqual(second.check_in, self.start + timedelta(minutes=60))
+        self.assertFalse(second.check_out)
+        self.assertEqual(self.employee.attendance_state, "checked_in")
+        self.assertEqual(self.other_employee.attendance_state, "checked_in")
+
+        # The next batch checks out the attendance left open
+        self.Scan._sync_scans(self.company, [self._scan("e", "SYNC0001", 90)])
+        self.assertEqual(second.check_out, self.start + timedelta(minutes=90))
+        self.assertEqual(self.employee.attendance_state, "checked_out")
+
+    def test_sync_idempotent(self):
+        """A batch sent again is reported without being applied twice"""
+        scans = [
+            self._scan("a", "SYNC0001", 0),
+            self._scan("b", "SYNC0001", 30),
+            self._scan("c", "UNKNOWN", 40),
+        ]
+        results = self.Scan._sync_scans(self.company, scans)
+        attendances = self._attendances(self.employee)
+        self.assertEqual(len(attendances), 1)
+        self.assertEqual(results[2]["state"], "rejected")
+
+        self.assertEqual(self.Scan._sync_scans(self.company, scans + scans[:1]), results)
+        self.assertEqual(self._attendances(self.employee), attendances)
+        self.assertEqual(self.Scan.search_count([("scan_id", "in", ["a", "b", "c"])]), 3)
+
+    def test_rejected_scans_skipped(self):
+        """A scan rejected by the geofence does not change the direction of the next ones"""
+        with patch.object(
+            HrAttendanceKioskScan, "_check_scan_positions",
+            lambda self, employee_by_barcode, scans: {"b": "Outside the geofence"},
+        ):
+            results = self.Scan._sync_scans(self.company, [
+                self._scan("a", "SYNC0001", 0),
+                self._scan("b", "SYNC0001", 30),
+                self._scan("c", "SYNC0001", 60),
+            ])
+        self.assertEqual(
+            [(result["state"], result["message"]) for result in results],
+            [("done", False), ("rejected", "Outside the geofence"), ("done", False)],
+        )
+        attendance = self._attendances(self.employee)
+        self.assertEqual(
+            (attendance.check_in, attendance.check_out),
+            (self.start, self.start + timedelta(minutes=60)),
+        )
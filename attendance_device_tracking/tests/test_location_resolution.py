@@ -0,0 +1,76 @@
+from unittest.mock import patch
+
+from requests.exceptions import RequestException
+
+from odoo.tests import TransactionCase, tagged
+
+# Coordinates of a cell the geocoder fails on, and of another one
+FAILING_POINT = (48.8584, 2.2945)
+OTHER_POINT = (50.8503, 4.3517)
+
+
+@tagged("post_install", "-at_install")
+class TestLocationResolution(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.employees = cls.env["hr.employee"].create([
+            {"name": f"Pending Location {index}"} for index in range(3)
+        ])
+        cls.cron = cls.env.ref(
+            "attendance_device_tracking.ir_cron_resolve_attendance_locations"
+        )
+
+    def _count_triggers(self):
+        return self.env["ir.cron.trigger"].search_count([("cron_id", "=", self.cron.id)])
+
+    def test_one_trigger_per_transaction(self):
+        """Pending check-ins and check-outs wake up the resolution once per transaction."""
+        self.env.cr.precommit.run()
+        triggers = self._count_triggers()
+        geo_information = {
+            "latitude": 48.8584,
+            "longitude": 2.2945,
+            "location_pending": True,
+        }
+        for employee in self.employees:
+            employee._attendance_action_change(geo_information)
+        self.employees[0]._attendance_action_change(geo_information)
+        self.assertEqual(self._count_triggers(), triggers)
+        self.env.cr.precommit.run()
+        self.assertEqual(self._count_triggers(), triggers + 1)
+        # The next transaction triggers again
+        self.employees[1]._attendance_action_change(geo_information)
+        self.env.cr.precommit.run()
+        self.assertEqual(self._count_triggers(), triggers + 2)
+
+    def test_failed_cells_deferred(self):
+        """Cells the geocoder failed on are deferred and do not hold back
+        the newer pending check-ins."""
+        Attendance = self.env["hr.attendance"]
+        pending = Attendance.search([("in_location_pending", "=", True)])
+        pending.write({"in_location_pending": False})
+        points = [FAILING_POINT, FAILING_POINT, OTHER_POINT]
+        attendances = Attendance.create([{
+            "employee_id": employee.id,
+            "in_latitude": latitude,
+            "in_longitude": longitude,
+            "in_location_pending": True,
+        } for employee, (latitude, longitude) in zip(self.employees, points)])
+
+        def get_localisation(latitude, longitude):
+            if round(latitude) == round(FAILING_POINT[0]):
+                raise RequestException("Geocoder unavailable")
+            return "Brussels"
+
+        geocoder = type(self.env["base.geocoder"])
+        with patch.object(geocoder, "_get_localisation", side_effect=get_localisation):
+            Attendance._cron_resolve_pending_locations(batch_size=2)
+            self.assertEqual(
+                attendances.mapped("in_location_pending"), [True, True, True]
+            )
+            Attendance._cron_resolve_pending_locations(batch_size=2)
+        self.assertEqual(attendances.mapped("in_location_pending"), [True, True, False])
+        self.assertEqual(attendances[2].in_location, "Brussels")
+        cell = self.env["attendance.geocode.cache"].search([("retry_after", "!=", False)])
+        self.assertEqual(cell.failure_count, 1)
@@ -14,9 +14,13 @@
     'license': 'LGPL-3',
 
     'depends': ['base', 'hr', 'hr_attendance'],
+    'external_dependencies': {'python': ['numpy']},
 
     'data': [
         'security/ir.model.access.csv',
+        'security/hr_attendance_geofence_security.xml',
+        'data/ir_cron_data.xml',
+        'views/hr_attendance_geofence_zone_views.xml',
         'views/res_config_settings_views.xml',
         'views/hr_attendance_views.xml',
     ],
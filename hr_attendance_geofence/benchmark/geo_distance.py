@@ -0,0 +1,86 @@
+# Part of hr_attendance_geofence
+"""Micro-benchmark of the geo-distance helpers of ``tools/geo.py``.
+
+Times the former per-point Haversine, the scalar fast path and the NumPy
+batch over the same random check-in positions around an office, and reports
+the worst deviation of each from the exact distance. No Odoo needed::
+
+    python3 hr_attendance_geofence/benchmark/geo_distance.py --points 200000
+"""
+import argparse
+import importlib.util
+import random
+import time
+from math import asin, cos, radians, sin, sqrt
+from pathlib import Path
+
+
+def _load_geo():
+    """Load tools/geo.py on its own — importing the addon needs Odoo."""
+    path = Path(__file__).resolve().parent.parent / 'tools' / 'geo.py'
+    spec = importlib.util.spec_from_file_location('geo', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _legacy_haversine(lat1, lon1, lat2, lon2):
+    """The per-record helper the models and controller used to duplicate."""
+    R = 6_371_000
+    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
+    a = (sin((lat2 - lat1) / 2) ** 2
+         + cos(lat1) * cos(lat2) * sin((lon2 - lon1) / 2) ** 2)
+    return 2 * R * asin(sqrt(a))
+
+
+def _best_of(repeat, func):
+    """Return the best wall time of ``repeat`` runs and the last result."""
+    best = float('inf')
+    result = None
+    for _i in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--points', type=int, default=100_000,
+                        help='Number of check-in positions')
+    parser.add_argument('--spread', type=float, default=0.02,
+                        help='Maximum offset in degrees from the office')
+    parser.add_argument('--lat', type=float, default=48.8584,
+                        help='Office latitude')
+    parser.add_argument('--lng', type=float, default=2.2945,
+                        help='Office longitude')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    geo = _load_geo()
+    rng = random.Random(args.seed)
+    lats = [args.lat + rng.uniform(-args.spread, args.spread) for _i in range(args.points)]
+    lngs = [args.lng + rng.uniform(-args.spread, args.spread) for _i in range(args.points)]
+    office = geo.GeoCenter(args.lat, args.lng)
+
+    exact = [geo.haversine(lat, lng, args.lat, args.lng) for lat, lng in zip(lats, lngs)]
+    cases = {
+        'legacy haversine': lambda: [
+            _legacy_haversine(lat, lng, args.lat, args.lng) for lat, lng in zip(lats, lngs)],
+        'scalar fast path': lambda: [
+            office.distance(lat, lng) for lat, lng in zip(lats, lngs)],
+        'numpy batch': lambda: office.distances(lats, lngs),
+    }
+    print(f"{args.points} points within {args.spread}° of "
+          f"({args.lat}, {args.lng}), best of {args.repeat}")
+    print(f"{'case':<18} {'total ms':>10} {'ns/point':>10} {'max error m':>12}")
+    for name, func in cases.items():
+        seconds, result = _best_of(args.repeat, func)
+        error = max(abs(float(value) - reference) for value, reference in zip(result, exact))
+        print(f"{name:<18} {seconds * 1000:>10.2f} "
+              f"{seconds * 1e9 / args.points:>10.1f} {error:>12.6f}")
+
+
+if __name__ == '__main__':
+    main()
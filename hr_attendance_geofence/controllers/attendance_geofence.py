@@ -1,27 +1,20 @@
 # Part of hr_attendance_geofence
 import logging
-from math import asin, cos, radians, sin, sqrt
 
 from odoo import _, http
 from odoo.http import request
 from odoo.addons.hr_attendance.controllers.main import HrAttendance
 
-_logger = logging.getLogger(__name__)
-
+from ..tools.geo import distance
 
-def _haversine_distance(lat1, lon1, lat2, lon2):
-    """Return distance in metres between two GPS coordinates."""
-    R = 6_371_000
-    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-    a = (sin((lat2 - lat1) / 2) ** 2
-         + cos(lat1) * cos(lat2) * sin((lon2 - lon1) / 2) ** 2)
-    return 2 * R * asin(sqrt(a))
+_logger = logging.getLogger(__name__)
 
 
-def _check_geofence(company, latitude, longitude):
+def _check_geofence(company, latitude, longitude, employee=None):
     """
     Returns (allowed: bool, error_message: str|None).
     - If geofence is disabled → always allowed.
+    - If the employee has geofence zones → allowed inside one of them only.
     - If geofence is enabled but coords not configured → allowed (misconfiguration fallback).
     - If geofence is enabled and no GPS from client → blocked.
     - If outside radius → blocked with distance info.
@@ -29,7 +22,13 @@ def _check_geofence(company, latitude, longitude):
     if not company.attendance_geofence_enabled:
         return True, None
 
-    if not (company.attendance_lat and company.attendance_lng):
+    Zone = request.env['hr.attendance.geofence.zone'].sudo()
+    # The stored flag spares the zone lookup to the companies without zones
+    has_zones = bool(employee) and company.attendance_geofence_has_zones and bool(
+        Zone.search_count(Zone._get_employee_domain(employee, company), limit=1)
+    )
+
+    if not has_zones and not (company.attendance_lat and company.attendance_lng):
         _logger.warning(
             "hr_attendance_geofence: geofence enabled for company %s "
             "but office coordinates not configured — skipping check.",
@@ -43,7 +42,18 @@ def _check_geofence(company, latitude, longitude):
             "Please allow location permission on this device and try again."
         )
 
-    dist = _haversine_distance(
+    if has_zones:
+        _configured, zone = Zone._find_zone(employee, company, latitude, longitude)
+        if not zone:
+            custom_msg = company.attendance_geofence_message or ""
+            return False, _(
+                "Check-in blocked: you are outside the geofence zones you may "
+                "check in/out in. %(custom)s",
+                custom=custom_msg,
+            ).strip()
+        return True, None
+
+    dist = distance(
         latitude, longitude,
         company.attendance_lat, company.attendance_lng,
     )
@@ -76,7 +86,8 @@ class AttendanceGeofenceController(HrAttendance):
         if not company:
             return {}
 
-        allowed, error = _check_geofence(company, latitude, longitude)
+        employee = request.env['hr.employee'].sudo().browse(employee_id).exists()
+        allowed, error = _check_geofence(company, latitude, longitude, employee)
         if not allowed:
             return {'geofence_error': error}
 
@@ -97,7 +108,16 @@ class AttendanceGeofenceController(HrAttendance):
         if not company:
             return {}
 
-        allowed, error = _check_geofence(company, latitude, longitude)
+        Employee = request.env['hr.employee'].sudo()
+        if hasattr(Employee, '_get_kiosk_employee_id'):
+            # Per-worker badge cache of attendance_device_tracking
+            employee = Employee.browse(Employee._get_kiosk_employee_id(company.id, barcode))
+        else:
+            employee = Employee.search([
+                ('barcode', '=', barcode),
+                ('company_id', '=', company.id),
+            ], limit=1)
+        allowed, error = _check_geofence(company, latitude, longitude, employee)
         if not allowed:
             # Return in the same shape the kiosk checks: no employee_name → show error
             return {'geofence_error': error}
@@ -117,6 +137,8 @@ class AttendanceGeofenceController(HrAttendance):
             'lng':      company.attendance_lng,
             'radius':   company.attendance_radius,
             'message':  company.attendance_geofence_message or '',
+            # Zones are checked server-side only
+            'zones':    company.attendance_geofence_has_zones,
         }
 
     # ── Backend systray / My Attendances toggle ──────────────────────────────
@@ -128,7 +150,7 @@ class AttendanceGeofenceController(HrAttendance):
             return {'success': False, 'error': _('No employee linked to your account.')}
 
         company = employee.company_id
-        allowed, error = _check_geofence(company, lat, lng)
+        allowed, error = _check_geofence(company, lat, lng, employee)
         if not allowed:
             return {'success': False, 'error': error}
 
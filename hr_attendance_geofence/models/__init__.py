@@ -1,2 +1,3 @@
 from . import res_company
 from . import hr_attendance
+from . import hr_attendance_geofence_zone
@@ -1,19 +1,26 @@
-from math import asin, cos, radians, sin, sqrt
-
 from odoo import _, api, fields, models
 from odoo.exceptions import ValidationError
+from odoo.tools import format_datetime
+
+from ..tools.geo import GeoCenter, pairwise_distances
+
+
+# ── SQL Haversine (batched recompute) ───────────────────────────────────────
 
+def _haversine_sql(lat_column: str, lng_column: str) -> str:
+    """Return the SQL expression of the distance in metres between a GPS
+    point and the %(office_lat)s / %(office_lng)s parameters."""
+    return f"""
+        ROUND((2 * 6371000 * ASIN(SQRT(LEAST(1,
+            POWER(SIN(RADIANS({lat_column} - %(office_lat)s) / 2), 2)
+            + COS(RADIANS(%(office_lat)s)) * COS(RADIANS({lat_column}))
+            * POWER(SIN(RADIANS({lng_column} - %(office_lng)s) / 2), 2)
+        ))))::numeric, 2)"""
 
-# ── Haversine helper ────────────────────────────────────────────────────────
 
-def _haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    """Return the great-circle distance in metres between two GPS points."""
-    R = 6_371_000  # Earth radius in metres
-    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-    dlat = lat2 - lat1
-    dlon = lon2 - lon1
-    a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
-    return 2 * R * asin(sqrt(a))
+DISTANCE_CHUNK_SIZE = 50_000
+GEO_FIELDS = {'check_in_lat', 'check_in_lng', 'check_out_lat', 'check_out_lng'}
+GEOFENCE_ERROR_LINES = 50  # violations listed in a bulk validation error
 
 
 # ── Model ───────────────────────────────────────────────────────────────────
@@ -43,79 +50,234 @@ class HrAttendance(models.Model):
         compute='_compute_distances',
     )
 
+    # Set instead of raising when created or updated in geofence import mode
+    geofence_violation = fields.Char(
+        string='Geofence Violation',
+        readonly=True,
+        copy=False,
+        help='Geofence violation of an attendance imported with geofence_import_mode, '
+             'kept instead of rejecting the import.',
+    )
+
     # ── Computed distances (safe — no write inside constrains) ───────────────
 
+    # Moving the office pin does not trigger this compute: the whole history
+    # of the company is recomputed in SQL by _recompute_company_distances.
     @api.depends(
         'check_in_lat', 'check_in_lng',
         'check_out_lat', 'check_out_lng',
-        'employee_id.company_id.attendance_lat',
-        'employee_id.company_id.attendance_lng',
+        'employee_id.company_id',
     )
     def _compute_distances(self):
-        for rec in self:
-            company = rec.employee_id.company_id or self.env.company
+        # One vectorised batch per office instead of per-record trigonometry
+        for company, recs in self.grouped(
+                lambda rec: rec.employee_id.company_id or self.env.company).items():
             office_lat = company.attendance_lat
             office_lng = company.attendance_lng
-
-            if office_lat and office_lng:
-                if rec.check_in_lat or rec.check_in_lng:
-                    rec.check_in_distance = round(
-                        _haversine(rec.check_in_lat, rec.check_in_lng,
-                                   office_lat, office_lng), 2)
-                else:
+            if not (office_lat and office_lng):
+                for rec in recs:
                     rec.check_in_distance = 0.0
-
-                if rec.check_out_lat or rec.check_out_lng:
-                    rec.check_out_distance = round(
-                        _haversine(rec.check_out_lat, rec.check_out_lng,
-                                   office_lat, office_lng), 2)
-                else:
                     rec.check_out_distance = 0.0
-            else:
-                rec.check_in_distance = 0.0
-                rec.check_out_distance = 0.0
+                continue
+
+            office = GeoCenter(office_lat, office_lng)
+            for prefix in ('check_in', 'check_out'):
+                lats = recs.mapped(f'{prefix}_lat')
+                lngs = recs.mapped(f'{prefix}_lng')
+                dists = office.distances(lats, lngs)
+                for rec, lat, lng, dist in zip(recs, lats, lngs, dists):
+                    rec[f'{prefix}_distance'] = round(float(dist), 2) if (lat or lng) else 0.0
 
     # ── Geofence validation (validate only — no field writes here) ───────────
 
-    @api.constrains('check_in_lat', 'check_in_lng', 'check_out_lat', 'check_out_lng')
-    def _check_geofence(self):
+    def _get_geofence_violations(self):
+        """
+        Check the check-in and check-out positions of many attendances at
+        once: the zones to test are selected in SQL on their bounding box,
+        and the distances to the offices are computed in a single vectorised
+        pass.
+
+        :return: Dictionary {attendance: error message} of the attendances
+                 outside their geofence
+        """
+        Zone = self.env['hr.attendance.geofence.zone'].sudo()
+        companies = {rec: rec.employee_id.company_id or self.env.company for rec in self}
+        enabled = self.env['res.company'].union(*companies.values()).filtered(
+            'attendance_geofence_enabled')
+        if not enabled:
+            return {}
+        zoned = Zone._get_zoned_employees({
+            (rec.employee_id, company) for rec, company in companies.items() if company in enabled
+        })
+
+        zone_points = []    # (attendance, blocked, lat, lng) against the zones
+        office_points = []  # (attendance, blocked, lat, lng) against the office radius
         for rec in self:
-            company = rec.employee_id.company_id or self.env.company
-            if not company.attendance_geofence_enabled:
+            company = companies[rec]
+            if company not in enabled:
                 continue
-            if not (company.attendance_lat and company.attendance_lng):
-                continue  # geofence centre not configured yet
-
-            # Validate check-in position
-            if rec.check_in_lat or rec.check_in_lng:
-                dist = _haversine(
-                    rec.check_in_lat, rec.check_in_lng,
-                    company.attendance_lat, company.attendance_lng,
-                )
-                if dist > company.attendance_radius:
-                    raise ValidationError(
-                        _(
-                            "Check-in blocked: you are %(dist).0f m away from the office "
-                            "(allowed radius: %(radius).0f m).\n%(msg)s",
-                            dist=dist,
-                            radius=company.attendance_radius,
-                            msg=company.attendance_geofence_message or '',
-                        )
-                    )
-
-            # Validate check-out position
-            if rec.check_out_lat or rec.check_out_lng:
-                dist = _haversine(
-                    rec.check_out_lat, rec.check_out_lng,
-                    company.attendance_lat, company.attendance_lng,
-                )
+            for lat, lng, blocked in (
+                (rec.check_in_lat, rec.check_in_lng, _("Check-in blocked")),
+                (rec.check_out_lat, rec.check_out_lng, _("Check-out blocked")),
+            ):
+                if not (lat or lng):
+                    continue
+                # Zones of the employee take precedence over the office radius
+                if (rec.employee_id.id, company.id) in zoned:
+                    zone_points.append((rec, blocked, lat, lng))
+                elif company.attendance_lat and company.attendance_lng:
+                    office_points.append((rec, blocked, lat, lng))
+                # else: geofence centre not configured yet
+
+        errors = {}
+        candidates = Zone._get_candidate_zones([
+            (rec.employee_id, companies[rec], lat, lng) for rec, _blocked, lat, lng in zone_points
+        ])
+        for (rec, blocked, lat, lng), zones in zip(zone_points, candidates):
+            if not any(zone._contains(lat, lng) for zone in zones):
+                errors.setdefault(rec, []).append(_(
+                    "%(blocked)s: you are outside the geofence zones "
+                    "you may check in/out in.\n%(msg)s",
+                    blocked=blocked,
+                    msg=companies[rec].attendance_geofence_message or '',
+                ))
+
+        if office_points:
+            offices = [companies[rec] for rec, _blocked, _lat, _lng in office_points]
+            dists = pairwise_distances(
+                [company.attendance_lat for company in offices],
+                [company.attendance_lng for company in offices],
+                [lat for _rec, _blocked, lat, _lng in office_points],
+                [lng for _rec, _blocked, _lat, lng in office_points],
+            )
+            for (rec, blocked, _lat, _lng), company, dist in zip(office_points, offices, dists):
                 if dist > company.attendance_radius:
-                    raise ValidationError(
-                        _(
-                            "Check-out blocked: you are %(dist).0f m away from the office "
-                            "(allowed radius: %(radius).0f m).\n%(msg)s",
-                            dist=dist,
-                            radius=company.attendance_radius,
-                            msg=company.attendance_geofence_message or '',
-                        )
-                    )
+                    errors.setdefault(rec, []).append(_(
+                        "%(blocked)s: you are %(dist).0f m away from the office "
+                        "(allowed radius: %(radius).0f m).\n%(msg)s",
+                        blocked=blocked,
+                        dist=float(dist),
+                        radius=company.attendance_radius,
+                        msg=company.attendance_geofence_message or '',
+                    ))
+        return {rec: '\n'.join(messages).strip() for rec, messages in errors.items()}
+
+    @api.constrains('check_in_lat', 'check_in_lng', 'check_out_lat', 'check_out_lng')
+    def _check_geofence(self):
+        # Import mode: flag the violations (see create/write) instead of raising
+        if self.env.context.get('geofence_import_mode'):
+            return
+        violations = self._get_geofence_violations()
+        if not violations:
+            return
+        if len(violations) == 1:
+            raise ValidationError(next(iter(violations.values())))
+        # Report every violating attendance at once, not the first one only
+        lines = [
+            f"- {rec.employee_id.name} ({format_datetime(self.env, rec.check_in)}): "
+            + message.replace('\n', ' ')
+            for rec, message in list(violations.items())[:GEOFENCE_ERROR_LINES]
+        ]
+        if len(violations) > GEOFENCE_ERROR_LINES:
+            lines.append(_("... and %(count)s more.", count=len(violations) - GEOFENCE_ERROR_LINES))
+        raise ValidationError(_(
+            "%(count)s attendances are outside their geofence:\n%(lines)s",
+            count=len(violations),
+            lines='\n'.join(lines),
+        ))
+
+    # ── Geofence import mode (violations recorded, not raised) ───────────────
+
+    def _flag_geofence_violations(self):
+        """Record the geofence violations of the attendances created or
+        updated in import mode, one write per distinct message."""
+        violations = self._get_geofence_violations()
+        by_message = {}
+        for rec in self:
+            message = violations.get(rec) or False
+            if rec.geofence_violation != message:
+                by_message.setdefault(message, []).append(rec.id)
+        for message, ids in by_message.items():
+            self.browse(ids).with_context(geofence_import_mode=False).write(
+                {'geofence_violation': message})
+        return violations
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        if self.env.context.get('geofence_import_mode'):
+            records._flag_geofence_violations()
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        if self.env.context.get('geofence_import_mode') and GEO_FIELDS & vals.keys():
+            self._flag_geofence_violations()
+        return res
+
+    # ── Batched distance recompute (office pin moved) ────────────────────────
+
+    @api.model
+    def _recompute_company_distances(self, company, chunk_size=DISTANCE_CHUNK_SIZE):
+        """
+        Recompute the distances of the next chunk of attendances of a company
+        in a single UPDATE, from its recompute cursor.
+
+        :return: Number of attendances updated, 0 once the company is done
+        """
+        office_lat = company.attendance_lat
+        office_lng = company.attendance_lng
+        office_set = bool(office_lat and office_lng)
+        self.env.cr.execute(
+            f"""
+            UPDATE hr_attendance att
+               SET check_in_distance = CASE
+                       WHEN %(office_set)s AND (att.check_in_lat != 0 OR att.check_in_lng != 0)
+                       THEN {_haversine_sql('att.check_in_lat', 'att.check_in_lng')}
+                       ELSE 0 END,
+                   check_out_distance = CASE
+                       WHEN %(office_set)s AND (att.check_out_lat != 0 OR att.check_out_lng != 0)
+                       THEN {_haversine_sql('att.check_out_lat', 'att.check_out_lng')}
+                       ELSE 0 END
+             WHERE att.id IN (
+                    SELECT chunk.id
+                      FROM hr_attendance chunk
+                      JOIN hr_employee emp ON emp.id = chunk.employee_id
+                     WHERE emp.company_id = %(company_id)s
+                       AND chunk.id > %(from_id)s
+                  ORDER BY chunk.id
+                     LIMIT %(limit)s
+                   )
+         RETURNING att.id
+            """,
+            {
+                'office_set': office_set,
+                'office_lat': office_lat or 0.0,
+                'office_lng': office_lng or 0.0,
+                'company_id': company.id,
+                'from_id': company.attendance_distance_recompute_from,
+                'limit': chunk_size,
+            },
+        )
+        ids = [row[0] for row in self.env.cr.fetchall()]
+        self.invalidate_model(['check_in_distance', 'check_out_distance'])
+        if ids:
+            company.attendance_distance_recompute_from = max(ids)
+        else:
+            company.attendance_distance_recompute = False
+        return len(ids)
+
+    @api.model
+    def _cron_recompute_distances(self):
+        """Recompute one chunk of distances per company whose office moved,
+        the scheduled action being rerun until every company is done."""
+        companies = self.env['res.company'].sudo().search(
+            [('attendance_distance_recompute', '=', True)])
+        done = sum(self._recompute_company_distances(company) for company in companies)
+        remaining = 0
+        for company in companies.filtered('attendance_distance_recompute'):
+            remaining += self.search_count([
+                ('employee_id.company_id', '=', company.id),
+                ('id', '>', company.attendance_distance_recompute_from),
+            ])
+        self.env['ir.cron']._notify_progress(done=done, remaining=remaining)
@@ -0,0 +1,333 @@
+from math import cos, radians
+
+from odoo import _, api, fields, models
+from odoo.exceptions import ValidationError
+from odoo.tools.sql import create_index
+
+from ..tools.geo import GeoCenter, distance
+
+METRES_PER_DEGREE = 111_320
+
+
+def _point_in_polygon(lat: float, lng: float, points: list) -> bool:
+    """Ray casting test of a point against a polygon of (lat, lng) vertices.
+
+    Zones span a few hundred metres, so the vertices are treated as plane
+    coordinates.
+    """
+    inside = False
+    j = len(points) - 1
+    for i, (lat_i, lng_i) in enumerate(points):
+        lat_j, lng_j = points[j]
+        if (lat_i > lat) != (lat_j > lat) and \
+                lng < (lng_j - lng_i) * (lat - lat_i) / (lat_j - lat_i) + lng_i:
+            inside = not inside
+        j = i
+    return inside
+
+
+class HrAttendanceGeofenceZone(models.Model):
+    _name = 'hr.attendance.geofence.zone'
+    _description = 'Attendance Geofence Zone'
+    _order = 'sequence, name'
+
+    name = fields.Char(string='Zone', required=True)
+    sequence = fields.Integer(default=10)
+    active = fields.Boolean(default=True)
+    company_id = fields.Many2one(
+        'res.company', string='Company', required=True, index=True,
+        default=lambda self: self.env.company,
+    )
+    zone_type = fields.Selection(
+        [('circle', 'Circle'), ('polygon', 'Polygon')],
+        string='Shape', required=True, default='circle',
+    )
+
+    # ── Shape ───────────────────────────────────────────────────────────────
+    latitude = fields.Float(
+        string='Centre Latitude', digits=(10, 7),
+        help='Latitude of the centre of a circle zone.',
+    )
+    longitude = fields.Float(
+        string='Centre Longitude', digits=(10, 7),
+        help='Longitude of the centre of a circle zone.',
+    )
+    radius = fields.Float(
+        string='Radius (m)', default=100.0,
+        help='Radius in metres of a circle zone.',
+    )
+    polygon = fields.Text(
+        string='Vertices',
+        help='Vertices of a polygon zone, one "latitude, longitude" pair per line.',
+    )
+
+    # ── Assignment — a zone without employees nor departments applies to
+    #    every employee of the company ─────────────────────────────────────
+    employee_ids = fields.Many2many(
+        'hr.employee', string='Employees',
+        help='Employees allowed to check in/out in this zone.',
+    )
+    department_ids = fields.Many2many(
+        'hr.department', string='Departments',
+        help='Departments whose employees may check in/out in this zone.',
+    )
+
+    # ── Bounding box, indexed to prefilter the candidate zones ─────────────
+    min_lat = fields.Float(digits=(10, 7), compute='_compute_bounding_box', store=True)
+    max_lat = fields.Float(digits=(10, 7), compute='_compute_bounding_box', store=True)
+    min_lng = fields.Float(digits=(10, 7), compute='_compute_bounding_box', store=True)
+    max_lng = fields.Float(digits=(10, 7), compute='_compute_bounding_box', store=True)
+
+    def init(self):
+        create_index(
+            self.env.cr,
+            'hr_attendance_geofence_zone_bounding_box_index',
+            self._table,
+            ['company_id', 'min_lat', 'max_lat', 'min_lng', 'max_lng'],
+            where='active',
+        )
+
+    # ── Shape helpers ───────────────────────────────────────────────────────
+
+    def _get_polygon_points(self):
+        """Return the vertices of a polygon zone as (lat, lng) tuples."""
+        self.ensure_one()
+        points = []
+        for line in (self.polygon or '').splitlines():
+            if not line.strip():
+                continue
+            try:
+                lat, lng = (float(value) for value in line.split(','))
+            except ValueError:
+                raise ValidationError(_(
+                    'Zone %(zone)s: "%(line)s" is not a "latitude, longitude" pair.',
+                    zone=self.name, line=line.strip(),
+                )) from None
+            points.append((lat, lng))
+        return points
+
+    @api.depends('zone_type', 'latitude', 'longitude', 'radius', 'polygon')
+    def _compute_bounding_box(self):
+        for zone in self:
+            if zone.zone_type == 'polygon':
+                points = zone._get_polygon_points() or [(0.0, 0.0)]
+                lats = [lat for lat, _lng in points]
+                lngs = [lng for _lat, lng in points]
+                zone.min_lat, zone.max_lat = min(lats), max(lats)
+                zone.min_lng, zone.max_lng = min(lngs), max(lngs)
+            else:
+                dlat = zone.radius / METRES_PER_DEGREE
+                dlng = dlat / max(cos(radians(zone.latitude)), 0.01)
+                zone.min_lat = zone.latitude - dlat
+                zone.max_lat = zone.latitude + dlat
+                zone.min_lng = zone.longitude - dlng
+                zone.max_lng = zone.longitude + dlng
+
+    @api.constrains('zone_type', 'latitude', 'longitude', 'radius', 'polygon')
+    def _check_shape(self):
+        for zone in self:
+            if zone.zone_type == 'polygon':
+                if len(zone._get_polygon_points()) < 3:
+                    raise ValidationError(_(
+                        'Zone %(zone)s: a polygon needs at least 3 vertices.',
+                        zone=zone.name,
+                    ))
+            elif zone.radius <= 0 or not (zone.latitude or zone.longitude):
+                raise ValidationError(_(
+                    'Zone %(zone)s: a circle needs a centre and a positive radius.',
+                    zone=zone.name,
+                ))
+
+    def _contains(self, latitude, longitude):
+        """Exact point-in-zone test, run on the prefiltered candidates only."""
+        self.ensure_one()
+        if self.zone_type == 'polygon':
+            return _point_in_polygon(latitude, longitude, self._get_polygon_points())
+        return distance(latitude, longitude, self.latitude, self.longitude) <= self.radius
+
+    # ── Lookup ──────────────────────────────────────────────────────────────
+
+    @api.model
+    def _get_employee_domain(self, employee, company):
+        """Domain of the active zones an employee may check in/out in."""
+        return [
+            ('company_id', '=', company.id),
+            '|', '|',
+            '&', ('employee_ids', '=', False), ('department_ids', '=', False),
+            ('employee_ids', 'in', employee.ids),
+            ('department_ids', 'in', employee.department_id.ids),
+        ]
+
+    @api.model
+    def _find_zone(self, employee, company, latitude, longitude):
+        """
+        Look up the zone of an employee containing a GPS position.
+
+        Only the zones whose bounding box holds the position are tested.
+
+        :return: Tuple (zones configured: bool, matching zone or empty recordset)
+        """
+        zones = self.sudo()
+        domain = zones._get_employee_domain(employee, company)
+        if not zones.search_count(domain, limit=1):
+            return False, zones
+        candidates = zones.search(domain + [
+            ('min_lat', '<=', latitude), ('max_lat', '>=', latitude),
+            ('min_lng', '<=', longitude), ('max_lng', '>=', longitude),
+        ])
+        for zone in candidates:
+            if zone._contains(latitude, longitude):
+                return True, zone
+        return True, zones.browse()
+
+    @api.model
+    def _get_applies_clause(self, zone_alias, employee_alias):
+        """SQL predicate of the zones applying to an employee: the zones
+        without employees nor departments, and the zones of the employee or
+        of their department."""
+        employees = self._fields['employee_ids']
+        departments = self._fields['department_ids']
+        return f"""(
+            EXISTS (
+                SELECT 1 FROM {employees.relation} rel
+                 WHERE rel.{employees.column1} = {zone_alias}.id
+                   AND rel.{employees.column2} = {employee_alias}.id)
+            OR EXISTS (
+                SELECT 1 FROM {departments.relation} rel
+                 WHERE rel.{departments.column1} = {zone_alias}.id
+                   AND rel.{departments.column2} = {employee_alias}.department_id)
+            OR (NOT EXISTS (
+                    SELECT 1 FROM {employees.relation} rel
+                     WHERE rel.{employees.column1} = {zone_alias}.id)
+                AND NOT EXISTS (
+                    SELECT 1 FROM {departments.relation} rel
+                     WHERE rel.{departments.column1} = {zone_alias}.id))
+        )"""
+
+    @api.model
+    def _get_zoned_employees(self, pairs):
+        """
+        Return the (employee id, company id) pairs of ``pairs`` for which
+        the employee may check in/out in at least one active zone of the
+        company, in a single query.
+
+        :param pairs: Iterable of (employee, company) records
+        """
+        pairs = list(pairs)
+        if not pairs:
+            return set()
+        self.flush_model()
+        self.env['hr.employee'].flush_model(['department_id'])
+        self.env.cr.execute(f"""
+            SELECT point.employee_id, point.company_id
+              FROM unnest(%s::int[], %s::int[]) AS point(employee_id, company_id)
+              JOIN hr_employee emp ON emp.id = point.employee_id
+             WHERE EXISTS (
+                    SELECT 1 FROM {self._table} zone
+                     WHERE zone.company_id = point.company_id
+                       AND zone.active
+                       AND {self._get_applies_clause('zone', 'emp')})
+        """, (
+            [employee.id for employee, _company in pairs],
+            [company.id for _employee, company in pairs],
+        ))
+        return set(self.env.cr.fetchall())
+
+    @api.model
+    def _get_candidate_zones(self, points):
+        """
+        Return the zones to test for many (employee, company, latitude,
+        longitude) points: the active zones of the company applying to the
+        employee whose bounding box holds the point. They are selected in a
+        single query served by the bounding box index, so that the exact
+        ``_contains`` test only runs on them.
+
+        :return: List of zone recordsets, in the order of the points
+        """
+        if not points:
+            return []
+        self.flush_model()
+        self.env['hr.employee'].flush_model(['department_id'])
+        self.env.cr.execute(f"""
+            SELECT point.index, zone.id
+              FROM unnest(%s::int[], %s::int[], %s::float8[], %s::float8[])
+                   WITH ORDINALITY AS point(employee_id, company_id, lat, lng, index)
+              JOIN hr_employee emp ON emp.id = point.employee_id
+              JOIN {self._table} zone
+                ON zone.company_id = point.company_id
+               AND zone.active
+               AND zone.min_lat <= point.lat AND zone.max_lat >= point.lat
+               AND zone.min_lng <= point.lng AND zone.max_lng >= point.lng
+             WHERE {self._get_applies_clause('zone', 'emp')}
+          ORDER BY point.index, zone.sequence, zone.name, zone.id
+        """, (
+            [employee.id for employee, _company, _lat, _lng in points],
+            [company.id for _employee, company, _lat, _lng in points],
+            [lat for _employee, _company, lat, _lng in points],
+            [lng for _employee, _company, _lat, lng in points],
+        ))
+        candidate_ids = [[] for _point in points]
+        for index, zone_id in self.env.cr.fetchall():
+            candidate_ids[index - 1].append(zone_id)
+        # One recordset sharing its prefetch, read at once by _contains
+        zones = self.sudo().browse({zone_id for ids in candidate_ids for zone_id in ids})
+        return [zones.browse(ids) for ids in candidate_ids]
+
+    @api.model
+    def _check_positions(self, positions, require_position=True):
+        """
+        Check many (employee, latitude, longitude) positions at once, the
+        zones of all their companies being loaded in a single query.
+
+        :param require_position: Reject missing coordinates, as the kiosk
+                                 does, instead of skipping them
+        :return: List of error messages, False for the allowed positions
+        """
+        employees = self.env['hr.employee'].union(*(position[0] for position in positions))
+        companies = employees.company_id.filtered('attendance_geofence_enabled')
+        offices = {
+            company: GeoCenter(company.attendance_lat, company.attendance_lng)
+            for company in companies if company.attendance_lat and company.attendance_lng
+        }
+        zoned = self._get_zoned_employees(
+            (employee, employee.company_id)
+            for employee in employees if employee.company_id in companies
+        )
+        located = [
+            index for index, (employee, latitude, longitude) in enumerate(positions)
+            if (employee.id, employee.company_id.id) in zoned and (latitude or longitude)
+        ]
+        candidates = dict(zip(located, self._get_candidate_zones([
+            (employee, employee.company_id, latitude, longitude)
+            for employee, latitude, longitude in (positions[index] for index in located)
+        ])))
+        errors = []
+        for index, (employee, latitude, longitude) in enumerate(positions):
+            company = employee.company_id
+            if company not in companies:
+                errors.append(False)
+                continue
+            has_zones = (employee.id, company.id) in zoned
+            if not has_zones and company not in offices:
+                errors.append(False)  # geofence centre not configured yet
+            elif not (latitude or longitude):
+                errors.append(require_position and _(
+                    "Location access is required to check in/out. "
+                    "Please allow location permission on this device and try again."
+                ))
+            elif has_zones:
+                inside = any(zone._contains(latitude, longitude) for zone in candidates[index])
+                errors.append(not inside and _(
+                    "You are outside the geofence zones you may check in/out in. %(custom)s",
+                    custom=company.attendance_geofence_message or '',
+                ).strip())
+            else:
+                dist = offices[company].distance(latitude, longitude)
+                errors.append(dist > company.attendance_radius and _(
+                    "You are %(dist).0f m away from the office "
+                    "(allowed radius: %(radius).0f m). %(custom)s",
+                    dist=dist,
+                    radius=company.attendance_radius,
+                    custom=company.attendance_geofence_message or '',
+                ).strip())
+        return errors
@@ -1,4 +1,6 @@
-from odoo import fields, models
+from odoo import api, fields, models
+
+OFFICE_FIELDS = {'attendance_lat', 'attendance_lng'}
 
 
 class ResCompany(models.Model):
@@ -31,6 +33,47 @@ class ResCompany(models.Model):
         help='Message shown to the employee when they are outside the geofence.',
     )
 
+    attendance_geofence_zone_ids = fields.One2many(
+        'hr.attendance.geofence.zone', 'company_id', string='Geofence Zones')
+    attendance_geofence_has_zones = fields.Boolean(
+        string='Has Geofence Zones',
+        compute='_compute_attendance_geofence_has_zones', store=True,
+        help='Stored with the company so that the kiosk routes skip the zone '
+             'lookup of companies without zones.',
+    )
+
+    # ── Distance recompute, run in background when the office moves ─────────
+    attendance_distance_recompute = fields.Boolean(
+        string='Attendance Distances Outdated',
+        readonly=True,
+        help='The distances of the attendances are being recomputed for the new office location.',
+    )
+    attendance_distance_recompute_from = fields.Integer(
+        string='Distance Recompute Cursor',
+        readonly=True,
+        help='Last attendance whose distances were recomputed.',
+    )
+
+    @api.depends('attendance_geofence_zone_ids', 'attendance_geofence_zone_ids.active')
+    def _compute_attendance_geofence_has_zones(self):
+        for company in self:
+            company.attendance_geofence_has_zones = bool(company.attendance_geofence_zone_ids)
+
+    def write(self, vals):
+        office_moved = bool(OFFICE_FIELDS & vals.keys())
+        if office_moved:
+            vals = dict(vals, attendance_distance_recompute=True,
+                        attendance_distance_recompute_from=0)
+        res = super().write(vals)
+        if office_moved:
+            cron = self.env.ref(
+                'hr_attendance_geofence.ir_cron_recompute_attendance_distances',
+                raise_if_not_found=False,
+            )
+            if cron:
+                cron.sudo()._trigger()
+        return res
+
 
 class ResConfigSettings(models.TransientModel):
     _inherit = 'res.config.settings'
@@ -45,3 +88,5 @@ class ResConfigSettings(models.TransientModel):
         related='company_id.attendance_radius', readonly=False)
     attendance_geofence_message = fields.Char(
         related='company_id.attendance_geofence_message', readonly=False)
+    attendance_distance_recompute = fields.Boolean(
+        related='company_id.attendance_distance_recompute')
@@ -51,7 +51,7 @@ export async function assertWithinGeofence(rpc) {
         lat = pos.coords.latitude;
         lng = pos.coords.longitude;
 
-        if (cfg.enabled && cfg.lat && cfg.lng) {
+        if (cfg.enabled && cfg.lat && cfg.lng && !cfg.zones) {
             const dist = haversine(lat, lng, cfg.lat, cfg.lng);
             if (dist > cfg.radius) {
                 throw new Error(
@@ -0,0 +1,2 @@
+from . import test_geofence_import
+from . import test_geofence_zone
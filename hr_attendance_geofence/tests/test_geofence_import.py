@@ -0,0 +1,65 @@
+from odoo.exceptions import ValidationError
+from odoo.tests import TransactionCase, tagged
+from odoo.tools.safe_eval import safe_eval
+
+OFFICE = (48.8584, 2.2945)
+FAR = (48.87, 2.2945)
+
+
+@tagged('post_install', '-at_install')
+class TestGeofenceImport(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.env.company.write({
+            'attendance_geofence_enabled': True,
+            'attendance_lat': OFFICE[0],
+            'attendance_lng': OFFICE[1],
+            'attendance_radius': 100.0,
+        })
+        cls.employee = cls.env['hr.employee'].create({
+            'name': 'Imported Employee', 'company_id': cls.env.company.id,
+        })
+        cls.Attendance = cls.env['hr.attendance']
+
+    def _values(self, position, day=5):
+        return {
+            'employee_id': self.employee.id,
+            'check_in': f'2026-01-{day:02d} 08:00:00',
+            'check_out': f'2026-01-{day:02d} 17:00:00',
+            'check_in_lat': position[0],
+            'check_in_lng': position[1],
+        }
+
+    def test_rejected_outside_import_mode(self):
+        """Outside import mode, attendances outside the geofence are rejected"""
+        with self.assertRaises(ValidationError):
+            self.Attendance.create(self._values(FAR))
+
+    def test_import_mode_flags(self):
+        """In import mode, violations are recorded on the attendances"""
+        Attendance = self.Attendance.with_context(geofence_import_mode=True)
+        inside, outside = Attendance.create([self._values(OFFICE, 5), self._values(FAR, 6)])
+        self.assertFalse(inside.geofence_violation)
+        self.assertIn('away from the office', outside.geofence_violation)
+
+        inside.with_context(geofence_import_mode=True).write({'check_in_lat': FAR[0]})
+        self.assertTrue(inside.geofence_violation)
+        outside.with_context(geofence_import_mode=True).write({'check_in_lat': OFFICE[0]})
+        self.assertFalse(outside.geofence_violation)
+
+    def test_import_action(self):
+        """Files loaded from the import action keep their violations"""
+        action = self.env.ref('hr_attendance_geofence.action_hr_attendance_geofence_import')
+        context = safe_eval(action.context)
+        self.assertTrue(context['geofence_import_mode'])
+        result = self.Attendance.with_context(geofence_import_mode=True).load(
+            ['employee_id/.id', 'check_in', 'check_out', 'check_in_lat', 'check_in_lng'],
+            [[str(self.employee.id), '2026-01-07 08:00:00', '2026-01-07 17:00:00',
+              str(FAR[0]), str(FAR[1])]],
+        )
+        self.assertFalse(result['messages'])
+        attendance = self.Attendance.browse(result['ids'])
+        self.assertTrue(attendance.geofence_violation)
+        self.assertIn(attendance, self.Attendance.search([('geofence_violation', '!=', False)]))
@@ -0,0 +1,131 @@
+from unittest.mock import patch
+
+from odoo.tests import TransactionCase, tagged
+
+from ..models.hr_attendance_geofence_zone import HrAttendanceGeofenceZone
+
+OFFICE = (48.8584, 2.2945)
+
+
+@tagged('post_install', '-at_install')
+class TestGeofenceZone(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.company = cls.env.company
+        cls.company.write({
+            'attendance_geofence_enabled': True,
+            'attendance_lat': OFFICE[0],
+            'attendance_lng': OFFICE[1],
+            'attendance_radius': 100.0,
+        })
+        cls.employee, cls.other_employee, cls.office_employee = cls.env['hr.employee'].create([
+            {'name': 'Zoned Employee', 'company_id': cls.company.id},
+            {'name': 'Other Zoned Employee', 'company_id': cls.company.id},
+            {'name': 'Office Employee', 'company_id': cls.company.id},
+        ])
+        Zone = cls.env['hr.attendance.geofence.zone']
+        cls.office_zone, cls.depot_zone, cls.yard_zone = Zone.create([
+            {
+                'name': 'Office',
+                'latitude': OFFICE[0],
+                'longitude': OFFICE[1],
+                'radius': 150.0,
+                'employee_ids': [(6, 0, cls.employee.ids)],
+            },
+            {
+                'name': 'Depot',
+                'latitude': 45.0,
+                'longitude': 5.0,
+                'radius': 150.0,
+                'employee_ids': [(6, 0, cls.employee.ids)],
+            },
+            {
+                'name': 'Yard',
+                'zone_type': 'polygon',
+                'polygon': '48.8580, 2.2940\n48.8590, 2.2940\n48.8590, 2.2950',
+                'employee_ids': [(6, 0, cls.other_employee.ids)],
+            },
+        ])
+
+    def test_zoned_employees(self):
+        """Only the employees with a zone of their company are zoned"""
+        Zone = self.env['hr.attendance.geofence.zone']
+        pairs = [(employee, self.company)
+                 for employee in self.employee | self.other_employee | self.office_employee]
+        self.assertEqual(Zone._get_zoned_employees(pairs), {
+            (self.employee.id, self.company.id),
+            (self.other_employee.id, self.company.id),
+        })
+
+    def test_candidate_zones(self):
+        """The candidates are the zones of the employee whose bounding box
+        holds the point"""
+        Zone = self.env['hr.attendance.geofence.zone']
+        candidates = Zone._get_candidate_zones([
+            (self.employee, self.company, *OFFICE),
+            (self.employee, self.company, 45.0, 5.0),
+            (self.employee, self.company, 40.0, 0.0),
+            (self.other_employee, self.company, *OFFICE),
+        ])
+        self.assertEqual(candidates, [
+            self.office_zone, self.depot_zone, Zone, self.yard_zone,
+        ])
+
+    def test_check_positions(self):
+        """The exact test only runs on the candidates of every position"""
+        Zone = self.env['hr.attendance.geofence.zone']
+        tested = []
+        contains = HrAttendanceGeofenceZone._contains
+
+        def _contains(zone, latitude, longitude):
+            tested.append(zone)
+            return contains(zone, latitude, longitude)
+
+        with patch.object(HrAttendanceGeofenceZone, '_contains', _contains):
+            errors = Zone._check_positions([
+                (self.employee, *OFFICE),
+                (self.employee, 40.0, 0.0),
+                (self.office_employee, *OFFICE),
+                (self.office_employee, 48.87, 2.2945),
+                (self.employee, 0.0, 0.0),
+            ])
+        self.assertFalse(errors[0])
+        self.assertIn('outside the geofence zones', errors[1])
+        self.assertFalse(errors[2])
+        self.assertIn('away from the office', errors[3])
+        self.assertIn('Location access is required', errors[4])
+        self.assertEqual(tested, [self.office_zone])
+
+    def test_attendance_violations(self):
+        """Attendances are checked against the candidate zones of their
+        employee, and against the office otherwise"""
+        Attendance = self.env['hr.attendance'].with_context(geofence_import_mode=True)
+        inside, outside, far = Attendance.create([
+            {'employee_id': self.employee.id, 'check_in': '2026-01-05 08:00:00',
+             'check_in_lat': OFFICE[0], 'check_in_lng': OFFICE[1]},
+            {'employee_id': self.other_employee.id, 'check_in': '2026-01-05 08:00:00',
+             'check_in_lat': 45.0, 'check_in_lng': 5.0},
+            {'employee_id': self.office_employee.id, 'check_in': '2026-01-05 08:00:00',
+             'check_in_lat': 48.87, 'check_in_lng': 2.2945},
+        ])
+        violations = (inside | outside | far)._get_geofence_violations()
+        self.assertNotIn(inside, violations)
+        self.assertIn('outside the geofence zones', violations[outside])
+        self.assertIn('away from the office', violations[far])
+
+    def test_company_has_zones(self):
+        """The stored zone flag of the company follows its active zones"""
+        self.assertTrue(self.company.attendance_geofence_has_zones)
+        company = self.env['res.company'].create({'name': 'Company Without Zones'})
+        self.assertFalse(company.attendance_geofence_has_zones)
+        zone = self.env['hr.attendance.geofence.zone'].create({
+            'name': 'New Zone',
+            'company_id': company.id,
+            'latitude': OFFICE[0],
+            'longitude': OFFICE[1],
+        })
+        self.assertTrue(company.attendance_geofence_has_zones)
+        zone.active = False
+        self.assertFalse(company.attendance_geofence_has_zones)
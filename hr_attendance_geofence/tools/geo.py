@@ -0,0 +1,79 @@
+# Part of hr_attendance_geofence
+"""
+Geo-distance helpers shared by the geofence checks and stored computes.
+
+Pure Python and NumPy only — no Odoo import — so the micro-benchmark can
+load this module on its own.
+
+Distances are in metres. Points less than ``FAST_PATH_DEGREES`` apart (a few
+km, the scale of every geofence) use the equirectangular approximation,
+whose error there is far below GPS accuracy; farther points use the exact
+Haversine formula.
+"""
+from math import asin, cos, pi, radians, sin, sqrt
+
+import numpy as np
+
+EARTH_RADIUS = 6_371_000  # metres
+METRES_PER_DEGREE = EARTH_RADIUS * pi / 180
+FAST_PATH_DEGREES = 0.05  # ~5.5 km of latitude
+
+
+def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Return the exact great-circle distance in metres between two GPS points."""
+    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
+    a = (sin((lat2 - lat1) / 2) ** 2
+         + cos(lat1) * cos(lat2) * sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS * asin(sqrt(min(a, 1.0)))
+
+
+class GeoCenter:
+    """A fixed GPS point — office, zone centre — with its cos(latitude)
+    precomputed, to measure the distance of many points from it."""
+
+    __slots__ = ('lat', 'lng', 'cos_lat', 'sin_lat')
+
+    def __init__(self, lat: float, lng: float):
+        self.lat = lat
+        self.lng = lng
+        self.cos_lat = cos(radians(lat))
+        self.sin_lat = sin(radians(lat))
+
+    def distance(self, lat: float, lng: float) -> float:
+        """Return the distance in metres of a GPS point from the centre."""
+        dlat = lat - self.lat
+        dlng = lng - self.lng
+        if abs(dlat) > FAST_PATH_DEGREES or abs(dlng) > FAST_PATH_DEGREES:
+            return haversine(self.lat, self.lng, lat, lng)
+        # Equirectangular, on the cosine of the mean latitude derived from
+        # the precomputed ones: cos(a + d) ≈ cos(a) - d·sin(a) for small d
+        x = dlng * (self.cos_lat - radians(dlat / 2) * self.sin_lat)
+        return METRES_PER_DEGREE * sqrt(dlat * dlat + x * x)
+
+    def distances(self, lats, lngs) -> np.ndarray:
+        """Return the distances in metres of arrays of GPS points from the
+        centre, with the exact Haversine formula, vectorised."""
+        lats = np.radians(np.asarray(lats, dtype=float))
+        dlat = lats - radians(self.lat)
+        dlng = np.radians(np.asarray(lngs, dtype=float)) - radians(self.lng)
+        a = (np.sin(dlat / 2) ** 2
+             + self.cos_lat * np.cos(lats) * np.sin(dlng / 2) ** 2)
+        return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def pairwise_distances(lats1, lngs1, lats2, lngs2) -> np.ndarray:
+    """Return the element-wise distances in metres between two arrays of GPS
+    points — each point against its own centre — with the exact Haversine
+    formula, vectorised."""
+    lats1 = np.radians(np.asarray(lats1, dtype=float))
+    lats2 = np.radians(np.asarray(lats2, dtype=float))
+    dlng = np.radians(np.asarray(lngs2, dtype=float) - np.asarray(lngs1, dtype=float))
+    a = (np.sin((lats2 - lats1) / 2) ** 2
+         + np.cos(lats1) * np.cos(lats2) * np.sin(dlng / 2) ** 2)
+    return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Return the distance in metres between two GPS points, through the
+    equirectangular fast path when they are close."""
+    return GeoCenter(lat2, lon2).distance(lat1, lon1)
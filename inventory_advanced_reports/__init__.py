@@ -20,5 +20,16 @@
 #
 ###############################################################################
 from . import controllers
+from . import models
 from . import report
 from . import wizard
+from .models.product_category import PARENT_PATH_INDEX
+
+
+def uninstall_hook(env):
+    """Drop the report indexes, the cached report rows and the product
+    labels, which are not managed by the ORM"""
+    env['inventory.report.index']._drop_indexes()
+    env.cr.execute(f"DROP INDEX IF EXISTS {PARENT_PATH_INDEX}")
+    env.cr.execute("DROP TABLE IF EXISTS inventory_report_cache_line")
+    env.cr.execute("DROP TABLE IF EXISTS inventory_report_product_label")
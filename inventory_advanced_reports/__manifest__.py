@@ -1,7 +1,7 @@
 
 {
     "name": "Advanced Inventory Reports",
-    'version': '18.0.1.0.0',
+    'version': '18.0.1.1.0',
     "category": 'Warehouse',
     "summary": """Helps to Manage different types of Inventory Reports like FSN
     Report, Out Of Stock Report, Inventory XYZ Report etc.""",
@@ -14,8 +14,10 @@
     'company': 'Cybrosys Techno Solutions',
     'maintainer': 'Cybrosys Techno Solutions',
     'website': 'https://www.cybrosys.com',
-    "depends": ["stock", "purchase", "sale_management"],
-    "data": ["security/ir.model.access.csv",
+    "depends": ["stock", "stock_account", "purchase", "sale_management"],
+    "data": ["security/inventory_report_security.xml",
+             "security/ir.model.access.csv",
+             "data/ir_cron_data.xml",
              "report/aging_report_views.xml",
              "report/fsn_report_views.xml",
              "report/xyz_report_views.xml",
@@ -38,13 +40,20 @@
              "wizard/inventory_over_stock_report_views.xml",
              "wizard/inventory_over_stock_data_report_views.xml",
              "wizard/inventory_stock_movement_report_views.xml",
+             "wizard/inventory_analytics_pack_report_views.xml",
+             "views/inventory_report_definition_views.xml",
+             "views/inventory_report_log_views.xml",
+             "views/inventory_report_run_views.xml",
+             "views/res_config_settings_views.xml",
              ],
     'assets': {
         'web.assets_backend': [
             'inventory_advanced_reports/static/src/js/action_manager.js']
     },
     'images': ['static/description/banner.jpg'],
+    'external_dependencies': {'python': ['numpy']},
     'license': 'LGPL-3',
+    'uninstall_hook': 'uninstall_hook',
     'installable': True,
     'auto_install': False,
     'application': False,
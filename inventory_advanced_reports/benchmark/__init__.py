@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#  Cybrosys Technologies Pvt. Ltd.
+#
+#  Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#  Author: Jumana Haseen (odoo@cybrosys.com)
+#
+#  You can modify it under the terms of the GNU LESSER
+#  GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#  You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#  (LGPL v3) along with this program.
+#  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+"""Benchmark of the inventory reports on a synthetic dataset.
+
+The package is not loaded with the module. Run it with ``run.py`` against a
+throwaway database where the module is installed, or from an Odoo shell::
+
+    from odoo.addons.inventory_advanced_reports.benchmark import \
+        generate_dataset, run_benchmark
+"""
+from .dataset import generate_dataset
+from .runner import compare_indexes, compare_results, run_benchmark
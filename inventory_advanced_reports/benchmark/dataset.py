@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#  Cybrosys Technologies Pvt. Ltd.
+#
+#  Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#  Author: Jumana Haseen (odoo@cybrosys.com)
+#
+#  You can modify it under the terms of the GNU LESSER
+#  GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#  You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#  (LGPL v3) along with this program.
+#  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+"""Synthetic inventory dataset of the report benchmark.
+
+Companies and warehouses are few and created through the ORM, which sets up
+their locations, picking types and routes. Categories, products, stock
+moves and valuation layers are cloned from one ORM-created prototype row
+with ``INSERT ... SELECT`` so that every NOT NULL column of the installed
+modules is filled without listing it here.
+"""
+import logging
+import time
+from odoo import fields
+
+_logger = logging.getLogger(__name__)
+
+PENDING_STATES = ('confirmed', 'assigned', 'waiting')
+
+
+def _get_columns(cr, table):
+    """Return the columns of a table, id excluded"""
+    cr.execute("""
+        SELECT column_name FROM information_schema.columns
+        WHERE table_name = %s AND column_name <> 'id'
+        ORDER BY ordinal_position
+    """, (table,))
+    return [column for column, in cr.fetchall()]
+
+
+def _clone(cr, table, prototype_id, source, overrides, params,
+           returning=False):
+    """Insert one copy of the prototype row of ``table`` per row of the
+    ``source`` FROM clause, with the column expressions of ``overrides``"""
+    columns = _get_columns(cr, table)
+    values = [overrides.get(column, f'proto."{column}"')
+              for column in columns]
+    query = f"""
+        INSERT INTO {table} ({', '.join(f'"{c}"' for c in columns)})
+        SELECT {', '.join(values)}
+        FROM {source}, {table} proto
+        WHERE proto.id = %(prototype_id)s
+    """
+    if returning:
+        query += " RETURNING id"
+    cr.execute(query, dict(params, prototype_id=prototype_id))
+    return [row_id for row_id, in cr.fetchall()] if returning else cr.rowcount
+
+
+def _create_companies(env, options):
+    """Create the companies and warehouses of the dataset"""
+    warehouses = env['stock.warehouse']
+    for company_index in range(options['companies']):
+        company = env['res.company'].create({
+            'name': f"Benchmark Company {company_index + 1}",
+        })
+        company_warehouses = env['stock.warehouse'].search(
+            [('company_id', '=', company.id)])
+        for warehouse_index in range(len(company_warehouses),
+                                     options['warehouses']):
+            company_warehouses |= env['stock.warehouse'].create({
+                'name': f"Benchmark {company_index + 1}-"
+                        f"{warehouse_index + 1}",
+                'code': f"B{company_index + 1}{warehouse_index + 1}"[:5],
+                'company_id': company.id,
+            })
+        warehouses |= company_warehouses[:options['warehouses']]
+    return warehouses
+
+
+def _create_products(env, options):
+    """Create the categories and products of the dataset"""
+    cr = env.cr
+    category = env['product.category'].create({'name': "Benchmark"})
+    category_ids = _clone(
+        cr, 'product_category', category.id,
+        "generate_series(1, %(count)s) AS g", {
+            'name': "'Benchmark ' || g",
+            'complete_name': "'Benchmark / Benchmark ' || g",
+            'parent_id': 'proto.id',
+        }, {'count': options['categories']}, returning=True)
+    cr.execute("""
+        UPDATE product_category SET parent_path = %s || id || '/'
+        WHERE id = ANY(%s)
+    """, (category.parent_path, category_ids))
+    product = env['product.product'].create({
+        'name': "Benchmark Product",
+        'type': 'product',
+        'categ_id': category.id,
+        'standard_price': 10.0,
+    })
+    template_ids = _clone(
+        cr, 'product_template', product.product_tmpl_id.id,
+        "generate_series(1, %(count)s) AS g", {
+            'name': "jsonb_build_object('en_US', 'Benchmark Product ' || g)",
+            'categ_id': "(%(category_ids)s::int[])"
+                        "[1 + g %% array_length(%(category_ids)s::int[], 1)]",
+        }, {'count': options['products'], 'category_ids': category_ids},
+        returning=True)
+    product_ids = _clone(
+        cr, 'product_product', product.id,
+        "unnest(%(template_ids)s::int[]) WITH ORDINALITY AS t(tmpl_id, g)", {
+            'product_tmpl_id': 't.tmpl_id',
+            'default_code': "'BENCH' || g",
+        }, {'template_ids': template_ids}, returning=True)
+    return product, product_ids
+
+
+def _create_moves(env, options, product, product_ids, warehouses):
+    """Insert the done and pending stock moves and the valuation layers of
+    the done moves, in batches committed one by one"""
+    cr = env.cr
+    supplier = env.ref('stock.stock_location_suppliers')
+    customer = env.ref('stock.stock_location_customers')
+    warehouse = warehouses[0]
+    move = env['stock.move'].create({
+        'name': "Benchmark",
+        'product_id': product.id,
+        'product_uom_qty': 1.0,
+        'product_uom': product.uom_id.id,
+        'location_id': supplier.id,
+        'location_dest_id': warehouse.lot_stock_id.id,
+        'company_id': warehouse.company_id.id,
+    })
+    layer = env['stock.valuation.layer'].create({
+        'product_id': product.id,
+        'company_id': warehouse.company_id.id,
+        'stock_move_id': move.id,
+        'quantity': 1.0,
+        'unit_cost': 10.0,
+        'value': 10.0,
+        'remaining_qty': 1.0,
+        'remaining_value': 10.0,
+        'description': "Benchmark",
+    })
+    params = {
+        'product_ids': product_ids,
+        'stock_ids': warehouses.lot_stock_id.ids,
+        'company_ids': [wh.company_id.id for wh in warehouses],
+        'supplier_id': supplier.id,
+        'customer_id': customer.id,
+        'pending_ratio': options['pending_ratio'],
+        'pending_states': list(PENDING_STATES),
+        'days': options['days'],
+        'now': fields.Datetime.now(),
+    }
+    # The random draws of a row are made once in the lateral subquery,
+    # which references ``g`` so that it is evaluated for every row.
+    source = """
+        generate_series(1, %(count)s) AS g
+        CROSS JOIN LATERAL (
+            SELECT
+                1 + floor(random() * array_length(%(stock_ids)s::int[], 1))
+                    ::int AS warehouse,
+                1 + floor(random() * array_length(%(product_ids)s::int[], 1))
+                    ::int AS product,
+                random() < 0.5 AS incoming,
+                random() < %(pending_ratio)s AS pending,
+                1 + floor(random() * 20) AS qty,
+                random() * %(days)s AS age,
+                g AS row_number
+        ) AS pick
+    """
+    qty = 'pick.qty'
+    move_overrides = {
+        'name': "'BENCH/' || g",
+        'reference': "'BENCH/' || g",
+        'product_id': "(%(product_ids)s::int[])[pick.product]",
+        'company_id': "(%(company_ids)s::int[])[pick.warehouse]",
+        'location_id': "CASE WHEN pick.incoming THEN %(supplier_id)s "
+                       "ELSE (%(stock_ids)s::int[])[pick.warehouse] END",
+        'location_dest_id': "CASE WHEN pick.incoming "
+                            "THEN (%(stock_ids)s::int[])[pick.warehouse] "
+                            "ELSE %(customer_id)s END",
+        'state': "CASE WHEN pick.pending THEN (%(pending_states)s::varchar[])"
+                 "[1 + g %% 3] ELSE 'done' END",
+        'date': "%(now)s::timestamp - pick.age * interval '1 day'",
+        'product_uom_qty': qty,
+        'product_qty': qty,
+        'quantity': qty,
+        'picking_id': 'NULL',
+        'create_date': "%(now)s::timestamp - pick.age * interval '1 day'",
+    }
+    cr.execute("SELECT setseed(%s)", (options['seed'],))
+    remaining = options['moves']
+    while remaining > 0:
+        count = min(remaining, options['batch_size'])
+        started = time.perf_counter()
+        cr.execute("SELECT COALESCE(MAX(id), 0) FROM stock_move")
+        last_move_id = cr.fetchone()[0]
+        _clone(cr, 'stock_move', move.id, source, move_overrides,
+               dict(params, count=count))
+        # Incoming layers keep a deterministic share of their quantity,
+        # outgoing layers have no remaining quantity as in stock_account.
+        _clone(cr, 'stock_valuation_layer', layer.id, """
+            stock_move sm
+            CROSS JOIN LATERAL (
+                SELECT
+                    sm.location_id = %(supplier_id)s AS incoming,
+                    10 + sm.product_id %% 50 AS unit_cost,
+                    floor(sm.product_uom_qty * ((sm.id * 7919) %% 100) / 100.0)
+                        AS remaining
+            ) AS pick
+            WHERE sm.id > %(last_move_id)s AND sm.state = 'done'
+        """, {
+            'product_id': 'sm.product_id',
+            'company_id': 'sm.company_id',
+            'stock_move_id': 'sm.id',
+            'description': 'sm.reference',
+            'quantity': "CASE WHEN pick.incoming THEN sm.product_uom_qty "
+                        "ELSE -sm.product_uom_qty END",
+            'unit_cost': 'pick.unit_cost',
+            'value': "pick.unit_cost * CASE WHEN pick.incoming "
+                     "THEN sm.product_uom_qty ELSE -sm.product_uom_qty END",
+            'remaining_qty': "CASE WHEN pick.incoming "
+                             "THEN pick.remaining END",
+            'remaining_value': "CASE WHEN pick.incoming "
+                               "THEN pick.remaining * pick.unit_cost END",
+            'create_date': 'sm.date',
+        }, dict(params, last_move_id=last_move_id))
+        cr.commit()
+        remaining -= count
+        _logger.info("Inserted %s moves in %.1fs, %s left", count,
+                     time.perf_counter() - started, remaining)
+
+
+def generate_dataset(env, options):
+    """Generate the synthetic dataset described by ``options`` and commit
+    it. Return the counts of the generated records."""
+    started = time.perf_counter()
+    warehouses = _create_companies(env, options)
+    product, product_ids = _create_products(env, options)
+    env.cr.commit()
+    _create_moves(env, options, product, product_ids, warehouses)
+    for table in ('product_product', 'stock_move', 'stock_valuation_layer'):
+        env.cr.execute(f"ANALYZE {table}")
+    env.cr.commit()
+    return {
+        'companies': len(warehouses.company_id),
+        'warehouses': len(warehouses),
+        'categories': options['categories'],
+        'products': len(product_ids),
+        'moves': options['moves'],
+        'duration': round(time.perf_counter() - started, 3),
+    }
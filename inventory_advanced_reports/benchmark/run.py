@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#  Cybrosys Technologies Pvt. Ltd.
+#
+#  Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#  Author: Jumana Haseen (odoo@cybrosys.com)
+#
+#  You can modify it under the terms of the GNU LESSER
+#  GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#  You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#  (LGPL v3) along with this program.
+#  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+"""Generate a synthetic dataset and time the inventory reports on it.
+
+Run it against a throwaway database where the module is installed, the
+dataset is committed::
+
+    python3 inventory_advanced_reports/benchmark/run.py -c odoo.conf \
+        -d benchmark --products 20000 --moves 2000000 \
+        --compare-indexes --output result.json
+
+Pass ``--skip-data`` to time an existing dataset again and ``--baseline``
+with a previous result file to compare the median timings.
+"""
+import argparse
+import json
+from datetime import date, timedelta
+
+REPORT_CHOICES = ('fsn', 'xyz', 'fsn_xyz', 'aging', 'age_breakdown',
+                  'over_stock', 'out_of_stock', 'stock_movement',
+                  'analytics_pack')
+PATH_CHOICES = ('data', 'pdf_values', 'xlsx', 'graph')
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('-c', '--config', help="Odoo configuration file")
+    parser.add_argument('-d', '--database', required=True)
+    parser.add_argument('--companies', type=int, default=2)
+    parser.add_argument('--warehouses', type=int, default=2,
+                        help="Warehouses per company")
+    parser.add_argument('--categories', type=int, default=50)
+    parser.add_argument('--products', type=int, default=5000)
+    parser.add_argument('--moves', type=int, default=500000)
+    parser.add_argument('--pending-ratio', type=float, default=0.1,
+                        help="Share of the moves left pending")
+    parser.add_argument('--days', type=int, default=730,
+                        help="Days of history of the moves")
+    parser.add_argument('--batch-size', type=int, default=500000)
+    parser.add_argument('--seed', type=float, default=0.42)
+    parser.add_argument('--skip-data', action='store_true',
+                        help="Time the dataset already in the database")
+    parser.add_argument('--reports', default=','.join(REPORT_CHOICES))
+    parser.add_argument('--paths', default=','.join(PATH_CHOICES))
+    parser.add_argument('--period', type=int, default=365,
+                        help="Days of the report period")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--compare-indexes', action='store_true',
+                        help="Time the reports again without the index pack")
+    parser.add_argument('--output', default='inventory_report_benchmark.json')
+    parser.add_argument('--baseline', help="Previous result file")
+    args = parser.parse_args()
+    for name, choices in (('reports', REPORT_CHOICES),
+                          ('paths', PATH_CHOICES)):
+        values = getattr(args, name).split(',')
+        unknown = set(values) - set(choices)
+        if unknown:
+            parser.error(f"unknown {name}: {', '.join(sorted(unknown))}")
+        setattr(args, name, values)
+    return args
+
+
+def main():
+    args = _parse_args()
+    import odoo
+    from odoo import SUPERUSER_ID, api
+    odoo.tools.config.parse_config(
+        ['-c', args.config] if args.config else [])
+    odoo.modules.module.initialize_sys_path()
+    from odoo.addons.inventory_advanced_reports.benchmark import \
+        compare_indexes, compare_results, generate_dataset, run_benchmark
+    registry = odoo.modules.registry.Registry(args.database)
+    with registry.cursor() as cr:
+        env = api.Environment(cr, SUPERUSER_ID, {})
+        dataset = None
+        if not args.skip_data:
+            dataset = generate_dataset(env, {
+                'companies': args.companies,
+                'warehouses': args.warehouses,
+                'categories': args.categories,
+                'products': args.products,
+                'moves': args.moves,
+                'pending_ratio': args.pending_ratio,
+                'days': args.days,
+                'batch_size': args.batch_size,
+                'seed': args.seed,
+            })
+        end_date = date.today()
+        result = run_benchmark(env, {
+            'start_date': end_date - timedelta(days=args.period),
+            'end_date': end_date,
+            'company_ids': env['res.company'].search([]).ids,
+            'reports': args.reports,
+            'paths': args.paths,
+            'repeat': args.repeat,
+            'compare_indexes': args.compare_indexes,
+        }, dataset=dataset)
+    with open(args.output, 'w') as output:
+        json.dump(result, output, indent=2, default=str)
+    if args.compare_indexes:
+        print("\n".join(compare_indexes(result)))
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            print("\n".join(compare_results(json.load(baseline), result)))
+
+
+if __name__ == '__main__':
+    main()
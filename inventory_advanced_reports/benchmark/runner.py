@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#  Cybrosys Technologies Pvt. Ltd.
+#
+#  Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#  Author: Jumana Haseen (odoo@cybrosys.com)
+#
+#  You can modify it under the terms of the GNU LESSER
+#  GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#  You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#  (LGPL v3) along with this program.
+#  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+"""Timings of the data, PDF values, XLSX and graph paths of the reports"""
+import io
+import json
+import logging
+import platform
+import resource
+import statistics
+import time
+import tracemalloc
+from odoo import fields, release
+from odoo.exceptions import UserError
+from odoo.addons.inventory_advanced_reports.models.inventory_report_index \
+    import REPORT_INDEXES
+
+_logger = logging.getLogger(__name__)
+
+RESULT_VERSION = 1
+PATHS = ('data', 'pdf_values', 'xlsx', 'graph')
+# Wizard model and extra wizard values of every benchmarked report
+REPORTS = {
+    'fsn': ('inventory.fsn.report', {'fsn': 'all'}),
+    'xyz': ('inventory.xyz.report', {'xyz': 'all'}),
+    'fsn_xyz': ('inventory.fsn.xyz.report', {'fsn': 'all', 'xyz': 'all'}),
+    'aging': ('inventory.aging.report', {}),
+    'age_breakdown': ('inventory.age.breakdown.report',
+                      {'age_breakdown_days': 30}),
+    'over_stock': ('inventory.over.stock.report',
+                   {'inventory_for_next_x_days': 30}),
+    'out_of_stock': ('inventory.out.of.stock.report',
+                     {'inventory_for_next_x_days': 30}),
+    'stock_movement': ('inventory.stock.movement.report', {}),
+    'analytics_pack': ('inventory.analytics.pack.report',
+                       {'inventory_for_next_x_days': 30,
+                        'age_breakdown_days': 30}),
+}
+
+
+class _Response:
+    """Sink of the XLSX exports, standing for the HTTP response"""
+
+    def __init__(self):
+        self.stream = io.BytesIO()
+
+
+def _create_wizard(env, report, options):
+    """Create the wizard of a report on the benchmark period"""
+    model, values = REPORTS[report]
+    wizard_model = env[model]
+    values = dict(values, start_date=options['start_date'],
+                  end_date=options['end_date'],
+                  company_ids=[fields.Command.set(options['company_ids'])])
+    return wizard_model.create({
+        name: value for name, value in values.items()
+        if name in wizard_model._fields})
+
+
+def _as_client_data(data):
+    """Round-trip report data through JSON as the web client does"""
+    return json.loads(json.dumps(data, default=fields.date_utils.json_default))
+
+
+def _run_data(wizard):
+    return wizard.get_report_data().get('data')
+
+
+def _run_pdf_values(wizard):
+    action = wizard.action_pdf()
+    report = wizard.env['ir.actions.report']._get_report(action['report_name'])
+    return wizard.env[f'report.{report.report_name}']._get_report_values(
+        [], data=_as_client_data(action['data'])).get('options')
+
+
+def _run_xlsx(wizard):
+    options = json.loads(wizard.action_excel()['data']['options'])
+    response = _Response()
+    wizard.get_xlsx_report(options, response)
+    return response.stream.tell()
+
+
+def _run_graph(wizard):
+    action = wizard.with_context(graph_report=True).display_report_views()
+    return wizard.env[action['res_model']].search_count(action['domain'])
+
+
+PATH_RUNNERS = {
+    'data': _run_data,
+    'pdf_values': _run_pdf_values,
+    'xlsx': _run_xlsx,
+    'graph': _run_graph,
+}
+PATH_METHODS = {
+    'data': 'get_report_data',
+    'pdf_values': 'action_pdf',
+    'xlsx': 'get_xlsx_report',
+    'graph': 'display_report_views',
+}
+
+
+def _measure(env, report, path, options):
+    """Run one path of a report in a savepoint rolled back afterwards and
+    return its duration, query count, peak memory and size"""
+    cr = env.cr
+    cr.execute('SAVEPOINT "inventory_report_benchmark"')
+    queries = cr.sql_log_count
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        wizard = _create_wizard(env, report, options)
+        result = PATH_RUNNERS[path](wizard)
+        error = None
+    except UserError as exception:
+        result, error = None, exception.args[0]
+    duration = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    queries = cr.sql_log_count - queries
+    cr.execute('ROLLBACK TO SAVEPOINT "inventory_report_benchmark"')
+    env.invalidate_all()
+    return {
+        'duration': duration,
+        'queries': queries,
+        'peak_memory_kb': peak // 1024,
+        'rows': len(result) if isinstance(result, list) else result,
+        'error': error,
+    }
+
+
+def _run_suite(env, options, indexes):
+    """Time every selected path of every selected report"""
+    results = []
+    for report in options['reports']:
+        wizard_model = env[REPORTS[report][0]]
+        for path in options['paths']:
+            if not hasattr(wizard_model, PATH_METHODS[path]):
+                continue
+            runs = [_measure(env, report, path, options)
+                    for dummy in range(options['repeat'])]
+            durations = [run['duration'] for run in runs]
+            results.append({
+                'key': f'{report}/{path}/{indexes}',
+                'report': report,
+                'path': path,
+                'indexes': indexes,
+                'runs': len(runs),
+                'min': round(min(durations), 4),
+                'median': round(statistics.median(durations), 4),
+                'max': round(max(durations), 4),
+                'queries': runs[0]['queries'],
+                'peak_memory_kb': max(run['peak_memory_kb'] for run in runs),
+                'rows': runs[0]['rows'],
+                'error': runs[0]['error'],
+            })
+            _logger.info("%s: median %.3fs, %s queries",
+                         results[-1]['key'], results[-1]['median'],
+                         results[-1]['queries'])
+    return results
+
+
+def run_benchmark(env, options, dataset=None):
+    """Run the benchmark and return its JSON-serialisable result.
+
+    The statement time limits are lifted for the run. With
+    ``compare_indexes`` the suite runs a second time with the report index
+    pack dropped. Both are done in the benchmark transaction, which is
+    rolled back.
+    """
+    cr = env.cr
+    parameters = env['ir.config_parameter'].sudo()
+    parameters.set_param('inventory_advanced_reports.statement_timeout', 0)
+    for report in REPORTS:
+        parameters.set_param(
+            f'inventory_advanced_reports.statement_timeout_{report}', False)
+    results = _run_suite(env, options, 'with')
+    if options.get('compare_indexes'):
+        cr.execute('SAVEPOINT "inventory_report_benchmark_indexes"')
+        for index in REPORT_INDEXES:
+            cr.execute(f"DROP INDEX IF EXISTS {index['name']}")
+        results += _run_suite(env, options, 'without')
+        cr.execute('ROLLBACK TO SAVEPOINT "inventory_report_benchmark_indexes"')
+    cr.execute("SHOW server_version")
+    server_version = cr.fetchone()[0]
+    cr.rollback()
+    return {
+        'version': RESULT_VERSION,
+        'created': fields.Datetime.to_string(fields.Datetime.now()),
+        'database': cr.dbname,
+        'odoo': release.version,
+        'postgresql': server_version,
+        'python': platform.python_version(),
+        'dataset': dataset,
+        'options': {
+            key: value for key, value in options.items()
+            if key in ('start_date', 'end_date', 'reports', 'paths',
+                       'repeat', 'compare_indexes')},
+        'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'results': results,
+    }
+
+
+def compare_results(baseline, current):
+    """Return the lines comparing the median timings of two results"""
+    previous = {result['key']: result for result in baseline['results']}
+    lines = [f"{'key':<44} {'before':>9} {'after':>9} {'ratio':>7} "
+             f"{'queries':>9}"]
+    for result in current['results']:
+        old = previous.get(result['key'])
+        if not old:
+            continue
+        ratio = result['median'] / old['median'] if old['median'] else 0
+        lines.append(
+            f"{result['key']:<44} {old['median']:>9.3f} "
+            f"{result['median']:>9.3f} {ratio:>7.2f} "
+            f"{old['queries']:>4}/{result['queries']:<4}")
+    return lines
+
+
+def compare_indexes(result):
+    """Return the lines comparing the timings without and with the report
+    index pack of a result run with ``compare_indexes``"""
+    without = [dict(line, key=line['key'].replace('/without', '/with'))
+               for line in result['results'] if line['indexes'] == 'without']
+    return compare_results({'results': without}, {'results': [
+        line for line in result['results'] if line['indexes'] == 'with']})
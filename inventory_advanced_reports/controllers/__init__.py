@@ -20,3 +20,4 @@
 #
 ###############################################################################
 from . import inventory_advanced_reports
+from . import inventory_report_api
@@ -23,6 +23,7 @@ import json
 from odoo import http
 from odoo.http import request, content_disposition
 from odoo.tools import html_escape
+from ..models.inventory_report_engine import REPORT_MODELS
 
 
 class XLSXReportController(http.Controller):
@@ -44,7 +45,15 @@ class XLSXReportController(http.Controller):
                         ('Content-Disposition',
                          content_disposition(report_name + '.xlsx'))
                     ])
-                report_obj.get_xlsx_report(options, response)
+                report_type = REPORT_MODELS.get(model)
+                if report_type:
+                    engine = request.env['inventory.report.engine'].with_user(
+                        uid)
+                    with engine._report_run(report_type, options), \
+                            engine._report_step('XLSX rendering', 'render'):
+                        report_obj.get_xlsx_report(options, response)
+                else:
+                    report_obj.get_xlsx_report(options, response)
             response.set_cookie('fileToken', token)
             return response
         except Exception as exception:
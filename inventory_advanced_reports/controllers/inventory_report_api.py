@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#  Cybrosys Technologies Pvt. Ltd.
+#
+#  Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#  Author: Jumana Haseen (odoo@cybrosys.com)
+#
+#  You can modify it under the terms of the GNU LESSER
+#  GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#  You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#  (LGPL v3) along with this program.
+#  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from werkzeug.exceptions import BadRequest, Forbidden, NotFound
+from odoo import fields, http
+from odoo.exceptions import UserError
+from odoo.http import request
+from ..models.inventory_report_cache import CACHED_REPORTS
+
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 5000
+
+
+class InventoryReportApiController(http.Controller):
+    """JSON API serving the inventory report data page by page"""
+
+    def _parse_ids(self, value):
+        """Return the list of ids of a comma separated parameter"""
+        try:
+            return [int(item) for item in value.split(',') if item] \
+                if value else []
+        except ValueError:
+            raise BadRequest(f"Invalid list of ids: {value}")
+
+    def _parse_filters(self, kwargs):
+        """Return the report filters of the query string parameters"""
+        try:
+            start_date = fields.Date.to_date(kwargs.get('start_date'))
+            end_date = fields.Date.to_date(kwargs.get('end_date'))
+            next_days = int(kwargs.get('inventory_for_next_x_days') or 0)
+            age_breakdown_days = int(kwargs.get('age_breakdown_days') or 30)
+        except ValueError as error:
+            raise BadRequest(str(error))
+        if not start_date or not end_date:
+            raise BadRequest("start_date and end_date are required")
+        # The user only reads the companies they are allowed to
+        allowed_company_ids = request.env.user.company_ids.ids
+        company_ids = self._parse_ids(kwargs.get('company_ids'))
+        company_ids = [company_id for company_id in company_ids
+                       if company_id in allowed_company_ids] \
+            if company_ids else request.env.companies.ids
+        if not company_ids:
+            raise Forbidden()
+        return {
+            'start_date': start_date,
+            'end_date': end_date,
+            'product_ids': self._parse_ids(kwargs.get('product_ids')),
+            'category_ids': self._parse_ids(kwargs.get('category_ids')),
+            'company_ids': sorted(company_ids),
+            'warehouse_ids': self._parse_ids(kwargs.get('warehouse_ids')),
+            'inventory_for_next_x_days': next_days,
+            'age_breakdown_days': age_breakdown_days,
+        }
+
+    def _parse_page(self, kwargs):
+        """Return the key after which the page starts and its size"""
+        try:
+            after = self._parse_ids(kwargs.get('after')) or None
+            limit = int(kwargs.get('limit') or DEFAULT_PAGE_SIZE)
+        except ValueError as error:
+            raise BadRequest(str(error))
+        if after and len(after) != 3:
+            raise BadRequest("after is product_id,company_id,warehouse_id")
+        return after, max(1, min(limit, MAX_PAGE_SIZE))
+
+    @http.route('/inventory_advanced_reports/api/<string:report>',
+                type='http', auth='user', methods=['GET'])
+    def get_report_data(self, report, **kwargs):
+        """Return a page of the rows of a report as columns of values.
+
+        The rows are ordered by product, company and warehouse; the
+        ``next`` key of the response is passed as ``after`` to read the
+        following page. The response carries an entity tag changing with
+        the stock, so that clients polling a report revalidate it with
+        ``If-None-Match`` without recomputing it.
+        """
+        if report not in CACHED_REPORTS:
+            raise NotFound()
+        if not request.env.user.has_group('stock.group_stock_user'):
+            raise Forbidden()
+        filters = self._parse_filters(kwargs)
+        after, limit = self._parse_page(kwargs)
+        cache_model = request.env['inventory.report.cache'].sudo()
+        stamp = cache_model._get_stock_stamp(filters)
+        etag = cache_model._get_etag(report, filters, stamp)
+        headers = [('ETag', f'"{etag}"'),
+                   ('Cache-Control', 'private, no-cache')]
+        if request.httprequest.if_none_match.contains(etag):
+            return request.make_response(None, headers=headers, status=304)
+        try:
+            cache = cache_model._get_result(report, filters, stamp)
+        except UserError as error:
+            request.env.cr.rollback()
+            return request.make_json_response(
+                {'error': str(error)}, headers=headers, status=503)
+        page = cache._read_page(after, limit)
+        page['total'] = cache.row_count
+        return request.make_json_response(page, headers=headers)
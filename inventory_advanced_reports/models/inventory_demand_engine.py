@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#  Cybrosys Technologies Pvt. Ltd.
+#
+#  Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#  Author: Jumana Haseen (odoo@cybrosys.com)
+#
+#  You can modify it under the terms of the GNU LESSER
+#  GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#  You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#  (LGPL v3) along with this program.
+#  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from datetime import timedelta
+import numpy as np
+from odoo import api, fields, models
+from .inventory_report_engine import PENDING_MOVE_STATES
+
+ADS_METHODS = [
+    ('flat', 'Period Average'),
+    ('window_7', 'Last 7 Days'),
+    ('window_30', 'Last 30 Days'),
+    ('window_90', 'Last 90 Days'),
+    ('smoothed', 'Exponential Smoothing'),
+]
+ADS_WINDOWS = (7, 30, 90)
+DEFAULT_SMOOTHING_ALPHA = 0.3
+STOCKOUT_HORIZON_DAYS = 365
+# Daily sales assumed for products without outflow, so that their stock
+# covers a finite number of days as in the original reports.
+MIN_ADS = 0.001
+
+
+class InventoryDemandEngine(models.AbstractModel):
+    """Average daily sales and stock coverage of the over stock and out of
+    stock reports.
+
+    The done outflow of the period is read once as a daily series per
+    product and company. The ADS variants, the exponential smoothing and
+    the coverage columns are then computed with NumPy for all the products
+    at once instead of row by row.
+    """
+    _name = 'inventory.demand.engine'
+    _description = 'Inventory Demand Engine'
+
+    @api.model
+    def _get_demand_settings(self):
+        """Return the ADS method and the smoothing factor of the settings"""
+        get_param = self.env['ir.config_parameter'].sudo().get_param
+        method = get_param('inventory_advanced_reports.ads_method') or 'flat'
+        if method not in dict(ADS_METHODS):
+            method = 'flat'
+        alpha = float(get_param('inventory_advanced_reports.smoothing_alpha')
+                      or DEFAULT_SMOOTHING_ALPHA)
+        return method, min(max(alpha, 0.01), 1.0)
+
+    @api.model
+    def _get_outflow_series(self, report_type, filters, by_warehouse=False):
+        """Return the (product_id, company_id) keys, or (product_id,
+        warehouse_id) keys with ``by_warehouse``, and the matrix of their
+        daily done outflow from internal locations over the period"""
+        engine = self.env['inventory.report.engine']
+        start_date = fields.Date.to_date(filters['start_date'])
+        end_date = fields.Date.to_date(filters['end_date'])
+        period_days = (end_date - start_date).days + 1
+        filter_clause, params = engine._get_filter_clause(
+            filters, product_column='sm.product_id')
+        params.update({'start_date': start_date, 'end_date': end_date})
+        key_column = 'src.warehouse_id' if by_warehouse else 'sm.company_id'
+        if by_warehouse:
+            filter_clause += " AND src.warehouse_id IS NOT NULL"
+        rows = engine._run_query(report_type, f"""
+            SELECT
+                sm.product_id,
+                {key_column} AS key_id,
+                sm.date::date - %(start_date)s AS day,
+                SUM(sm.product_uom_qty) AS qty
+            FROM stock_move sm
+            INNER JOIN stock_location src ON src.id = sm.location_id
+            INNER JOIN product_product pp ON pp.id = sm.product_id
+            INNER JOIN product_template pt ON pt.id = pp.product_tmpl_id
+            WHERE sm.state = 'done'
+                AND src.usage = 'internal'
+                AND sm.date BETWEEN %(start_date)s AND %(end_date)s
+                {filter_clause}
+            GROUP BY sm.product_id, {key_column}, sm.date::date
+        """, params)
+        if not rows:
+            return np.empty((0, 2), dtype=np.int64), np.zeros((0, period_days))
+        columns = np.array(
+            [(row['product_id'], row['key_id'], row['day'])
+             for row in rows], dtype=np.int64)
+        keys, inverse = np.unique(columns[:, :2], axis=0, return_inverse=True)
+        series = np.zeros((len(keys), period_days))
+        np.add.at(series, (inverse.reshape(-1), columns[:, 2]),
+                  np.array([row['qty'] for row in rows], dtype=float))
+        return keys, series
+
+    @api.model
+    def _compute_demand(self, series, alpha):
+        """Return the ADS variants of every series row: the period average,
+        the trailing window averages and the exponentially smoothed level"""
+        period_days = series.shape[1]
+        demand = {'flat': series.sum(axis=1) / period_days}
+        for window in ADS_WINDOWS:
+            demand[f'window_{window}'] = series[:, -window:].mean(axis=1)
+        # level(t) = alpha * x(t) + (1 - alpha) * level(t - 1), seeded with
+        # the first day, unrolled into one weighted sum over the days.
+        weights = alpha * (1 - alpha) ** np.arange(period_days - 1, -1, -1)
+        weights[0] = (1 - alpha) ** (period_days - 1)
+        demand['smoothed'] = series @ weights
+        return {method: np.round(ads, 2) for method, ads in demand.items()}
+
+    @api.model
+    def _get_demand(self, report_type, filters, by_warehouse=False):
+        """Return the (product_id, company_id) or (product_id, warehouse_id)
+        keys, their ADS variants and the ADS method of the settings"""
+        method, alpha = self._get_demand_settings()
+        keys, series = self._get_outflow_series(report_type, filters,
+                                                by_warehouse=by_warehouse)
+        return keys, self._compute_demand(series, alpha), method
+
+    @api.model
+    def _apply_demand(self, rows, report_type, filters):
+        """Set the ADS and the coverage columns of the rows of the over
+        stock or out of stock report from the demand engine"""
+        if not rows:
+            return rows
+        keys, demand, method = self._get_demand(report_type, filters)
+        index = {(product_id, company_id): position for position, (
+            product_id, company_id) in enumerate(keys.tolist())}
+        positions = np.array([
+            index.get((row['product_id'], row['company_id']), -1)
+            for row in rows])
+        found = positions >= 0
+        variants = {}
+        for name, ads in demand.items():
+            values = np.zeros(len(rows))
+            values[found] = ads[positions[found]]
+            variants[name] = values
+        ads = variants[method]
+        days = float(filters.get('inventory_for_next_x_days') or 0)
+        stock = np.array([float(row['virtual_stock'] or 0) for row in rows])
+        coverage = np.round(stock / np.where(ads == 0, MIN_ADS, ads), 2)
+        columns = {
+            'ads': ads,
+            'ads_7': variants['window_7'],
+            'ads_30': variants['window_30'],
+            'ads_90': variants['window_90'],
+            'ads_smoothed': variants['smoothed'],
+            'demanded_quantity': np.round(days * ads),
+            'in_stock_days': np.round(coverage),
+        }
+        if report_type == 'over_stock':
+            columns['over_stock_qty'] = np.round(stock - ads * days)
+        else:
+            shortage_days = np.maximum(days - coverage, 0)
+            columns.update({
+                'out_of_stock_days': np.round(shortage_days),
+                'out_of_stock_ratio': np.round(shortage_days, 2)
+                if days else np.zeros(len(rows)),
+                'out_of_stock_qty': np.round(shortage_days * ads),
+            })
+        columns = {name: values.tolist() for name, values in columns.items()}
+        for position, row in enumerate(rows):
+            for name, values in columns.items():
+                row[name] = values[position]
+        return rows
+
+    @api.model
+    def _set_base_demand(self, filters):
+        """Store the ADS variants on the base relation of the report engine,
+        its ``ads`` column taking the method of the settings"""
+        engine = self.env['inventory.report.engine']
+        keys, demand, method = self._get_demand('analytics_pack', filters)
+        if not len(keys):
+            return
+        self.env.cr.execute(f"""
+            UPDATE {engine._base_table} base
+            SET ads = demand.ads,
+                ads_7 = demand.ads_7,
+                ads_30 = demand.ads_30,
+                ads_90 = demand.ads_90,
+                ads_smoothed = demand.ads_smoothed
+            FROM unnest(%s::int[], %s::int[], %s::numeric[], %s::numeric[],
+                        %s::numeric[], %s::numeric[], %s::numeric[])
+                AS demand(product_id, company_id, ads, ads_7, ads_30, ads_90,
+                          ads_smoothed)
+            WHERE base.product_id = demand.product_id
+                AND base.company_id = demand.company_id
+        """, (keys[:, 0].tolist(), keys[:, 1].tolist(),
+              demand[method].tolist(), demand['window_7'].tolist(),
+              demand['window_30'].tolist(), demand['window_90'].tolist(),
+              demand['smoothed'].tolist()))
+
+    @api.model
+    def _get_stock_flows(self, report_type, product_ids, warehouse_ids,
+                         horizon):
+        """Return the (product_id, warehouse_id, day, quantity) stock flows
+        of the warehouses from today: the done moves and the overdue pending
+        moves on day 0, the other pending moves on their scheduled day"""
+        return self.env['inventory.report.engine']._run_query(
+            report_type, """
+            SELECT
+                sm.product_id,
+                wh.id AS warehouse_id,
+                GREATEST(sm.date::date - CURRENT_DATE, 0) AS day,
+                SUM(CASE WHEN dest.warehouse_id = wh.id
+                    THEN sm.product_qty ELSE -sm.product_qty END) AS qty
+            FROM stock_move sm
+            INNER JOIN stock_location src ON src.id = sm.location_id
+            INNER JOIN stock_location dest ON dest.id = sm.location_dest_id
+            INNER JOIN stock_warehouse wh
+                ON wh.id IN (src.warehouse_id, dest.warehouse_id)
+            WHERE sm.product_id = ANY(%(product_ids)s)
+                AND wh.id = ANY(%(warehouse_ids)s)
+                AND src.warehouse_id IS DISTINCT FROM dest.warehouse_id
+                AND (sm.state = 'done' OR (
+                    sm.state IN %(pending_states)s
+                    AND sm.date::date <= CURRENT_DATE + %(horizon)s))
+            GROUP BY sm.product_id, wh.id, 3
+        """, {
+                'product_ids': product_ids,
+                'warehouse_ids': warehouse_ids,
+                'pending_states': PENDING_MOVE_STATES,
+                'horizon': horizon,
+            })
+
+    @api.model
+    def _project_stockout(self, rows, report_type, filters,
+                          horizon=STOCKOUT_HORIZON_DAYS):
+        """Project the day the stock of every product and warehouse of the
+        rows hits zero, and sort the rows by urgency.
+
+        The stock of every product and warehouse is simulated day by day
+        over the horizon for all of them at once: the current stock plus
+        the pending receipts, minus the pending deliveries on their
+        scheduled day, minus the ADS of the warehouse every day. The
+        stockout day is the first day the cumulated stock is not positive.
+        Rows that do not run out within the horizon get no date and come
+        last.
+        """
+        if not rows:
+            return rows
+        row_keys = np.array([(row['product_id'], row['warehouse_id'] or 0)
+                             for row in rows], dtype=np.int64)
+        keys, row_positions = np.unique(row_keys, axis=0, return_inverse=True)
+        row_positions = row_positions.reshape(-1)
+        index = {tuple(key): position
+                 for position, key in enumerate(keys.tolist())}
+        flows = np.zeros((len(keys), horizon + 1))
+        stock_rows = self._get_stock_flows(
+            report_type, keys[:, 0].tolist(), keys[:, 1].tolist(), horizon)
+        if stock_rows:
+            positions = np.array([
+                index.get((row['product_id'], row['warehouse_id']), -1)
+                for row in stock_rows])
+            found = positions >= 0
+            np.add.at(flows, (
+                positions[found],
+                np.array([row['day'] for row in stock_rows])[found]),
+                np.array([float(row['qty']) for row in stock_rows])[found])
+        demand_keys, demand, method = self._get_demand(
+            report_type, filters, by_warehouse=True)
+        ads = np.zeros(len(keys))
+        for position, key in enumerate(demand_keys.tolist()):
+            if tuple(key) in index:
+                ads[index[tuple(key)]] = demand[method][position]
+        projected = np.cumsum(flows, axis=1) - np.outer(
+            ads, np.arange(horizon + 1))
+        stockout = projected <= 0
+        has_stockout = stockout.any(axis=1)
+        stockout_days = np.where(has_stockout, stockout.argmax(axis=1), -1)
+        today = fields.Date.context_today(self)
+        for row, position in zip(rows, row_positions.tolist()):
+            days = int(stockout_days[position])
+            row['warehouse_ads'] = float(ads[position])
+            row['days_until_stockout'] = days if days >= 0 else None
+            row['stockout_date'] = today + timedelta(days=days) \
+                if days >= 0 else None
+        rows.sort(key=lambda row: (row['days_until_stockout'] is None,
+                                   row['days_until_stockout'] or 0))
+        return rows
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#  Cybrosys Technologies Pvt. Ltd.
+#
+#  Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#  Author: Jumana Haseen (odoo@cybrosys.com)
+#
+#  You can modify it under the terms of the GNU LESSER
+#  GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#  You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#  (LGPL v3) along with this program.
+#  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+import hashlib
+import json
+from odoo import api, fields, models
+from .inventory_report_engine import REPORT_TYPES
+
+CACHE_LINE_TABLE = 'inventory_report_cache_line'
+# Reports derived from the shared base relation of the engine. The stock
+# movement report is not: its purchases, returns, adjustments, production
+# and transit moves are not aggregated in the base relation.
+CACHED_REPORTS = ('fsn', 'xyz', 'fsn_xyz', 'aging', 'age_breakdown',
+                  'over_stock', 'out_of_stock')
+# Stock tables whose rows in the scope of a report invalidate its result
+STAMP_TABLES = ('stock_move', 'stock_valuation_layer', 'purchase_order_line')
+
+
+class InventoryReportCache(models.Model):
+    """Result sets of the inventory reports derived from the shared engine.
+
+    A result is identified by the report and its filters, and stamped with
+    the state of the stock tables it was computed from. It is reused as
+    long as the stamp does not change. Its rows are kept as JSON in
+    ``inventory_report_cache_line``, keyed by product, company and
+    warehouse for keyset pagination.
+    """
+    _name = 'inventory.report.cache'
+    _description = 'Inventory Report Cache'
+    _order = 'create_date desc'
+
+    key = fields.Char(string="Key", required=True, index=True, readonly=True,
+                      help="Hash of the report and its filters")
+    report_type = fields.Selection(REPORT_TYPES, string="Report",
+                                   readonly=True, help="Cached report")
+    filters = fields.Text(string="Filters", readonly=True,
+                          help="Filters of the cached result")
+    stamp = fields.Char(string="Stamp", readonly=True,
+                        help="State of the stock tables of the result")
+    columns = fields.Text(string="Columns", readonly=True,
+                          help="Columns of the result, in order")
+    row_count = fields.Integer(string="Rows", readonly=True,
+                               help="Number of rows of the result")
+
+    _sql_constraints = [
+        ('key_uniq', 'unique(key)', "A report result is cached only once."),
+    ]
+
+    def init(self):
+        """Create the table of the cached rows"""
+        self.env.cr.execute(f"""
+            CREATE TABLE IF NOT EXISTS {CACHE_LINE_TABLE} (
+                cache_id integer NOT NULL
+                    REFERENCES {self._table} (id) ON DELETE CASCADE,
+                product_id integer NOT NULL,
+                company_id integer NOT NULL,
+                warehouse_id integer NOT NULL,
+                data jsonb NOT NULL,
+                PRIMARY KEY (cache_id, product_id, company_id, warehouse_id)
+            )
+        """)
+
+    @api.model
+    def _get_stock_stamp(self, filters):
+        """Return a stamp of the data a report reads in the scope of its
+        product, category and company filters. It changes whenever one of
+        the stock moves, valuation layers, purchase order lines or products
+        of the scope is created, written or deleted, or the day changes.
+
+        The stamp is derived from the data itself, the last write date, the
+        last id and the number of rows of every table, so it follows the
+        transaction reading it and is the same on every node.
+        """
+        self.env.flush_all()
+        engine = self.env['inventory.report.engine']
+        clause, params = engine._get_filter_clause(
+            filters, product_column='stamp.product_id',
+            company_column='stamp.company_id')
+        selects = [f"""(
+            SELECT ROW(MAX(stamp.write_date), MAX(stamp.id), COUNT(*))::text
+            FROM {table} stamp
+            WHERE TRUE {clause})""" for table in STAMP_TABLES]
+        clause, product_params = engine._get_filter_clause(
+            dict(filters, company_ids=None))
+        params.update(product_params)
+        selects.append(f"""(
+            SELECT ROW(MAX(GREATEST(pp.write_date, pt.write_date)),
+                MAX(pp.id), COUNT(*))::text
+            FROM product_product pp
+            INNER JOIN product_template pt ON pt.id = pp.product_tmpl_id
+            WHERE TRUE {clause})""")
+        self.env.cr.execute(f"""
+            SELECT concat_ws('/', CURRENT_DATE, {', '.join(selects)})
+        """, params)
+        stamp = self.env.cr.fetchone()[0]
+        return hashlib.sha1(stamp.encode()).hexdigest()[:16]
+
+    @api.model
+    def _get_cache_key(self, report_type, filters):
+        """Return the key of a report and its filters"""
+        method, alpha = self.env['inventory.demand.engine'] \
+            ._get_demand_settings()
+        lang = self.env['inventory.report.label']._get_lang()
+        normalized = json.dumps([report_type, filters, method, alpha, lang],
+                                sort_keys=True, default=str)
+        return hashlib.sha1(normalized.encode()).hexdigest()
+
+    @api.model
+    def _get_etag(self, report_type, filters, stamp=None):
+        """Return the entity tag of the current result of a report, from
+        the stamp of its data when it was already read"""
+        return (f'{self._get_cache_key(report_type, filters)[:16]}-'
+                f'{stamp or self._get_stock_stamp(filters)}')
+
+    @api.model
+    def _get_result(self, report_type, filters, stamp=None):
+        """Return the cached result of a report, computing it again when
+        the stock changed since it was cached"""
+        key = self._get_cache_key(report_type, filters)
+        stamp = stamp or self._get_stock_stamp(filters)
+        # Serialize the computation of a result between requests
+        self.env.cr.execute("SELECT pg_advisory_xact_lock(hashtext(%s))",
+                            (key,))
+        cache = self.search([('key', '=', key)], limit=1)
+        if cache.stamp == stamp:
+            return cache
+        cache.unlink()
+        engine = self.env['inventory.report.engine']
+        with engine._report_run(report_type, filters):
+            engine._create_base_table(filters)
+            query, params = engine._get_base_query(report_type, filters)
+            self.env.cr.execute(
+                f"SELECT * FROM ({query}) AS report LIMIT 0", params)
+            columns = [column.name for column in self.env.cr.description]
+            cache = self.create({
+                'key': key,
+                'report_type': report_type,
+                'filters': json.dumps(filters, default=str),
+                'stamp': stamp,
+                'columns': json.dumps(columns),
+            })
+            cache.row_count = engine._execute(f"""
+                INSERT INTO {CACHE_LINE_TABLE}
+                    (cache_id, product_id, company_id, warehouse_id, data)
+                SELECT
+                    %(cache_id)s,
+                    report.product_id,
+                    COALESCE(report.company_id, 0),
+                    COALESCE((to_jsonb(report)->>'warehouse_id')::int, 0),
+                    to_jsonb(report)
+                FROM ({query}) AS report
+            """, dict(params, cache_id=cache.id))
+        return cache
+
+    def _read_page(self, after=None, limit=500):
+        """Return the page of the rows following the (product_id,
+        company_id, warehouse_id) key ``after``, in columns, and the key
+        of its last row when more rows follow"""
+        self.ensure_one()
+        where = "cache_id = %(cache_id)s"
+        if after:
+            where += (" AND (product_id, company_id, warehouse_id)"
+                      " > %(after)s")
+        self.env.cr.execute(f"""
+            SELECT product_id, company_id, warehouse_id, data
+            FROM {CACHE_LINE_TABLE}
+            WHERE {where}
+            ORDER BY product_id, company_id, warehouse_id
+            LIMIT %(limit)s
+        """, {'cache_id': self.id, 'after': tuple(after or ()),
+              'limit': limit + 1})
+        rows = self.env.cr.fetchall()
+        next_key = list(rows[limit - 1][:3]) if len(rows) > limit else None
+        rows = rows[:limit]
+        columns = json.loads(self.columns)
+        return {
+            'columns': columns,
+            'data': {column: [row[3].get(column) for row in rows]
+                     for column in columns},
+            'count': len(rows),
+            'next': next_key,
+        }
+
+    @api.autovacuum
+    def _gc_report_caches(self):
+        """Drop the results cached more than a day ago"""
+        self.search([('create_date', '<', fields.Datetime.subtract(
+            fields.Datetime.now(), days=1))]).unlink()
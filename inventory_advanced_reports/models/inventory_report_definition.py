@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#  Cybrosys Technologies Pvt. Ltd.
+#
+#  Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#  Author: Jumana Haseen (odoo@cybrosys.com)
+#
+#  You can modify it under the terms of the GNU LESSER
+#  GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#  You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#  (LGPL v3) along with this program.
+#  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+import csv
+import io
+import json
+import logging
+from datetime import timedelta
+from werkzeug.wrappers import Response
+from odoo import _, api, fields, models
+from .inventory_report_cache import CACHED_REPORTS
+from .inventory_report_engine import REPORT_MODELS, REPORT_TYPES
+
+_logger = logging.getLogger(__name__)
+
+DEFINITION_MODELS = [(model, dict(REPORT_TYPES)[report_type])
+                     for model, report_type in REPORT_MODELS.items()]
+# Wizard fields replaced by the rolling period of the definition
+PERIOD_FIELDS = ('start_date', 'end_date')
+
+
+class InventoryReportDefinition(models.Model):
+    """Standing configuration of an inventory report wizard.
+
+    Active definitions are run overnight by a scheduled action, over a
+    period ending on the day of the run. The XLSX and CSV files of the run
+    are attached to the definition, and the result set of the reports
+    served by the JSON API is cached for the day.
+    """
+    _name = 'inventory.report.definition'
+    _description = 'Inventory Report Definition'
+    _order = 'name'
+
+    name = fields.Char(string="Name", required=True,
+                       help="Name of the saved report")
+    active = fields.Boolean(string="Active", default=True,
+                            help="Only active definitions run overnight")
+    report_model = fields.Selection(DEFINITION_MODELS, string="Report",
+                                    required=True, readonly=True,
+                                    help="Wizard of the report")
+    report_type = fields.Selection(REPORT_TYPES, string="Report Type",
+                                   compute='_compute_report_type',
+                                   store=True, help="Type of the report")
+    wizard_values = fields.Text(string="Wizard Values", readonly=True,
+                                help="Options of the wizard, as JSON")
+    period_days = fields.Integer(string="Period (Days)", default=30,
+                                 help="Number of days of the report period, "
+                                      "ending on the day of the run")
+    user_id = fields.Many2one('res.users', string="Owner", required=True,
+                              default=lambda self: self.env.user,
+                              help="User the report is run as")
+    company_id = fields.Many2one('res.company', string="Company",
+                                 required=True,
+                                 default=lambda self: self.env.company,
+                                 help="Company the report is run in")
+    state = fields.Selection([('new', 'New'), ('done', 'Done'),
+                              ('failed', 'Failed')], string="Status",
+                             default='new', readonly=True,
+                             help="Outcome of the last run")
+    message = fields.Text(string="Message", readonly=True,
+                          help="Error of the last run")
+    last_run_date = fields.Datetime(string="Last Run", readonly=True,
+                                    help="Date of the last run")
+    xlsx_attachment_id = fields.Many2one('ir.attachment', string="XLSX",
+                                         readonly=True, ondelete='set null',
+                                         help="Workbook of the last run")
+    csv_attachment_id = fields.Many2one('ir.attachment', string="CSV",
+                                        readonly=True, ondelete='set null',
+                                        help="Rows of the last run")
+    cache_id = fields.Many2one('inventory.report.cache',
+                               string="Cached Result", readonly=True,
+                               ondelete='set null',
+                               help="Result set of the last run")
+
+    @api.depends('report_model')
+    def _compute_report_type(self):
+        """Compute the report type of the wizard"""
+        for definition in self:
+            definition.report_type = REPORT_MODELS.get(definition.report_model)
+
+    def _get_wizard(self):
+        """Create the wizard of the definition, as its owner, over the
+        period ending today"""
+        self.ensure_one()
+        wizard_model = self.env[self.report_model].with_user(
+            self.user_id).with_company(self.company_id)
+        values = json.loads(self.wizard_values or '{}')
+        end_date = fields.Date.context_today(self)
+        for field_name, value in zip(PERIOD_FIELDS, (
+                end_date - timedelta(days=self.period_days), end_date)):
+            if field_name in wizard_model._fields:
+                values[field_name] = value
+        return wizard_model.create(values)
+
+    def _get_cache_filters(self, wizard):
+        """Return the filters of the cached result, as the JSON API
+        builds them"""
+        def wizard_value(field_name, default):
+            return wizard[field_name] if field_name in wizard._fields \
+                else default
+        end_date = fields.Date.context_today(self)
+        return {
+            'start_date': wizard_value(
+                'start_date', end_date - timedelta(days=self.period_days)),
+            'end_date': wizard_value('end_date', end_date),
+            'product_ids': wizard.product_ids.ids,
+            'category_ids': wizard.category_ids.ids,
+            'company_ids': sorted(wizard.company_ids.ids
+                                  or self.company_id.ids),
+            'warehouse_ids': wizard_value(
+                'warehouse_ids', wizard.env['stock.warehouse']).ids,
+            'inventory_for_next_x_days': wizard_value(
+                'inventory_for_next_x_days', 0),
+            'age_breakdown_days': wizard_value('age_breakdown_days', 30),
+        }
+
+    def _get_csv(self, options):
+        """Return the CSV file of the rows of the report options, or None
+        for the reports not made of a single table"""
+        rows = next((value for value in options.values()
+                     if isinstance(value, list) and value
+                     and isinstance(value[0], dict)), None)
+        if not rows:
+            return None
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=list(rows[0]),
+                                extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+        return output.getvalue().encode()
+
+    def _attach(self, file_name, content, mimetype):
+        """Attach a file of the run to the definition"""
+        return self.env['ir.attachment'].create({
+            'name': file_name,
+            'raw': content,
+            'mimetype': mimetype,
+            'res_model': self._name,
+            'res_id': self.id,
+        })
+
+    def _run(self):
+        """Run the report of the definition and store its files and cached
+        result set"""
+        self.ensure_one()
+        wizard = self._get_wizard()
+        engine = wizard.env['inventory.report.engine']
+        with engine._report_run(self.report_type):
+            options = json.loads(wizard.action_excel()['data']['options'])
+            response = Response()
+            with engine._report_step('XLSX rendering', 'render'):
+                wizard.get_xlsx_report(options, response)
+        stamp = fields.Date.to_string(fields.Date.context_today(self))
+        old_attachments = self.xlsx_attachment_id | self.csv_attachment_id
+        values = {
+            'xlsx_attachment_id': self._attach(
+                f'{self.name} {stamp}.xlsx', response.get_data(),
+                'application/vnd.openxmlformats-officedocument'
+                '.spreadsheetml.sheet').id,
+            'csv_attachment_id': False,
+            'cache_id': False,
+        }
+        csv_content = self._get_csv(options)
+        if csv_content:
+            values['csv_attachment_id'] = self._attach(
+                f'{self.name} {stamp}.csv', csv_content, 'text/csv').id
+        if self.report_type in CACHED_REPORTS:
+            values['cache_id'] = self.env['inventory.report.cache'] \
+                .with_user(self.user_id).with_company(self.company_id).sudo() \
+                ._get_result(self.report_type,
+                             self._get_cache_filters(wizard)).id
+        self.write(dict(values, state='done', message=False,
+                        last_run_date=fields.Datetime.now()))
+        old_attachments.unlink()
+
+    def action_run(self):
+        """Run the reports of the definitions now"""
+        for definition in self:
+            definition._run()
+
+    def _get_download_action(self, attachment):
+        """Return the action downloading an attachment"""
+        return {
+            'type': 'ir.actions.act_url',
+            'url': f'/web/content/{attachment.id}?download=true',
+            'target': 'self',
+        }
+
+    def action_download_xlsx(self):
+        """Download the workbook of the last run"""
+        self.ensure_one()
+        return self._get_download_action(self.xlsx_attachment_id)
+
+    def action_download_csv(self):
+        """Download the rows of the last run"""
+        self.ensure_one()
+        return self._get_download_action(self.csv_attachment_id)
+
+    @api.model
+    def _cron_run_definitions(self):
+        """Run the active definitions, each in a transaction of its own so
+        that a failing report does not hold back the others"""
+        for definition in self.search([]):
+            try:
+                definition._run()
+                self.env.cr.commit()
+            except Exception as error:
+                self.env.cr.rollback()
+                _logger.exception("Saved inventory report %s failed",
+                                  definition.name)
+                definition.write({
+                    'state': 'failed',
+                    'message': str(error),
+                    'last_run_date': fields.Datetime.now(),
+                })
+                self.env.cr.commit()
+
+
+class InventoryReportDefinitionMixin(models.AbstractModel):
+    """Save the options of an inventory report wizard as a definition"""
+    _name = 'inventory.report.definition.mixin'
+    _description = 'Inventory Report Definition Mixin'
+
+    def _get_run_report_data(self):
+        """Return the data of ``get_report_data`` computed in a single report
+        run, so that the statements of the report share one registration,
+        log entry and time limit"""
+        self.ensure_one()
+        engine = self.env['inventory.report.engine']
+        with engine._report_run(REPORT_MODELS[self._name],
+                                self.copy_data()[0]):
+            return self.get_report_data()
+
+    def action_save_definition(self):
+        """Save the options of the wizard as a report definition run
+        overnight"""
+        self.ensure_one()
+        values = self.copy_data()[0]
+        period_days = 30
+        if 'start_date' in self._fields and self.start_date \
+                and self.end_date:
+            period_days = (self.end_date - self.start_date).days
+        for field_name in PERIOD_FIELDS + ('compare_start_date',
+                                           'compare_end_date'):
+            values.pop(field_name, None)
+        definition = self.env['inventory.report.definition'].create({
+            'name': _("%(report)s of %(user)s",
+                      report=self._description, user=self.env.user.name),
+            'report_model': self._name,
+            'wizard_values': json.dumps(
+                values, default=fields.date_utils.json_default),
+            'period_days': period_days,
+        })
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': definition._name,
+            'res_id': definition.id,
+            'view_mode': 'form',
+            'target': 'current',
+        }
@@ -0,0 +1,1227 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#  Cybrosys Technologies Pvt. Ltd.
+#
+#  Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#  Author: Jumana Haseen (odoo@cybrosys.com)
+#
+#  You can modify it under the terms of the GNU LESSER
+#  GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#  You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#  (LGPL v3) along with this program.
+#  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+import logging
+import time
+from datetime import timedelta
+from contextlib import contextmanager
+from contextvars import ContextVar
+import psycopg2
+from psycopg2.errors import (InFailedSqlTransaction, QueryCanceled,
+                             SerializationFailure)
+from odoo import SUPERUSER_ID, _, api, fields, models, sql_db
+from odoo.exceptions import UserError
+from odoo.tools import config
+from .inventory_report_label import LABEL_TABLE
+
+_logger = logging.getLogger(__name__)
+
+REPORT_TYPES = [
+    ('fsn', 'FSN'),
+    ('xyz', 'XYZ'),
+    ('fsn_xyz', 'FSN-XYZ'),
+    ('aging', 'Aging'),
+    ('age_breakdown', 'Age Breakdown'),
+    ('over_stock', 'Over Stock'),
+    ('out_of_stock', 'Out Of Stock'),
+    ('stock_movement', 'Stock Movement'),
+    ('analytics_pack', 'Analytics Pack'),
+]
+REPORT_NAMES = {
+    'inventory_advanced_reports.report_inventory_fsn': 'fsn',
+    'inventory_advanced_reports.report_inventory_xyz': 'xyz',
+    'inventory_advanced_reports.report_inventory_fsn_xyz': 'fsn_xyz',
+    'inventory_advanced_reports.report_inventory_aging': 'aging',
+    'inventory_advanced_reports.report_inventory_breakdown': 'age_breakdown',
+    'inventory_advanced_reports.report_inventory_over_stock': 'over_stock',
+    'inventory_advanced_reports.report_inventory_out_of_stock': 'out_of_stock',
+    'inventory_advanced_reports.report_inventory_movement': 'stock_movement',
+}
+REPORT_MODELS = {
+    'inventory.fsn.report': 'fsn',
+    'inventory.xyz.report': 'xyz',
+    'inventory.fsn.xyz.report': 'fsn_xyz',
+    'inventory.aging.report': 'aging',
+    'inventory.age.breakdown.report': 'age_breakdown',
+    'inventory.over.stock.report': 'over_stock',
+    'inventory.out.of.stock.report': 'out_of_stock',
+    'inventory.stock.movement.report': 'stock_movement',
+    'inventory.analytics.pack.report': 'analytics_pack',
+}
+DEFAULT_STATEMENT_TIMEOUT = 90
+DEFAULT_SLOW_REPORT_THRESHOLD = 30
+DEFAULT_REPLICA_MAX_LAG = 30
+PENDING_MOVE_STATES = ('assigned', 'confirmed', 'waiting')
+# Flows of the stock movement comparison: measure, location side and usage
+MOVEMENT_FLOWS = [
+    ('sales', 'dest', 'customer'),
+    ('sales_return', 'src', 'customer'),
+    ('purchase', 'src', 'supplier'),
+    ('purchase_return', 'dest', 'supplier'),
+    ('internal_in', 'dest', 'internal'),
+    ('internal_out', 'src', 'internal'),
+    ('adj_in', 'dest', 'inventory'),
+    ('adj_out', 'src', 'inventory'),
+    ('production_in', 'dest', 'production'),
+    ('production_out', 'src', 'production'),
+    ('transit_in', 'dest', 'transit'),
+    ('transit_out', 'src', 'transit'),
+]
+# Measures compared between two periods by report
+COMPARISON_MEASURES = {
+    'fsn': ['opening_stock', 'closing_stock', 'average_stock', 'sales',
+            'turnover_ratio'],
+    'stock_movement': ['opening_stock'] + [flow[0] for flow in MOVEMENT_FLOWS]
+                      + ['closing_stock'],
+}
+AGE_BREAKDOWN_SLOTS = 5
+
+_active_run = ContextVar('inventory_report_run', default=None)
+
+
+class ReportTimeout(UserError):
+    """Raised when a statement of a report run exceeds its time limit"""
+
+
+class ReportCancelled(UserError):
+    """Raised when a report run is cancelled from the report runs screen"""
+
+
+class InventoryReportEngine(models.AbstractModel):
+    """Shared query engine of the inventory reports.
+
+    The engine materialises one per-product base relation for a set of
+    report filters so that several reports of the same request can be
+    derived from it without scanning stock moves and valuation layers again.
+    """
+    _name = 'inventory.report.engine'
+    _description = 'Inventory Report Engine'
+
+    _base_table = 'inventory_report_base'
+    _product_table = 'inventory_report_products'
+
+    @api.model
+    def _get_statement_timeout(self, report_type):
+        """Return the statement timeout in seconds of a report type, falling
+        back on the default of all the reports. 0 disables the limit."""
+        get_param = self.env['ir.config_parameter'].sudo().get_param
+        timeout = get_param(
+            f'inventory_advanced_reports.statement_timeout_{report_type}')
+        if not timeout or not int(timeout):
+            timeout = get_param('inventory_advanced_reports.statement_timeout',
+                                DEFAULT_STATEMENT_TIMEOUT)
+        return int(timeout or 0)
+
+    @api.model
+    def _is_instrumented(self):
+        """Return whether the statements of the reports are explained, from
+        the ``inventory_report_explain`` context key or the system
+        parameter of the Inventory settings"""
+        if 'inventory_report_explain' in self.env.context:
+            return bool(self.env.context['inventory_report_explain'])
+        return bool(self.env['ir.config_parameter'].sudo().get_param(
+            'inventory_advanced_reports.explain_reports'))
+
+    @contextmanager
+    def _report_run(self, report_type, parameters=None):
+        """Run the statements of a report under its statement timeout.
+
+        The run is registered with the backend PID and transaction start of
+        the cursor so that it can be cancelled from the report runs screen.
+        Nested calls join the run already active on the request. The
+        statements and steps of the run are timed and handed to the slow
+        report log when it ends.
+
+        The run is registered, closed and logged through one side cursor
+        held for the run: the registration is committed at once to be seen
+        by other sessions, the outcome is committed whatever becomes of the
+        transaction of the report.
+        """
+        run = _active_run.get()
+        if run:
+            yield run
+            return
+        timeout = self._get_statement_timeout(report_type)
+        self.env.cr.execute("""
+            SELECT pid, xact_start::text, current_setting('statement_timeout')
+            FROM pg_stat_activity
+            WHERE pid = pg_backend_pid()
+        """)
+        backend_pid, xact_start, previous_timeout = self.env.cr.fetchone()
+        with self.env.registry.cursor() as side_cr:
+            side_env = api.Environment(side_cr, SUPERUSER_ID, {})
+            run = {
+                'id': side_env['inventory.report.run']._register_run(
+                    report_type, self.env.uid, backend_pid, xact_start,
+                    timeout),
+                'report_type': report_type,
+                'uid': self.env.uid,
+                'timeout': timeout,
+                'parameters': parameters,
+                'instrumented': self._is_instrumented(),
+                'steps': [],
+                'accounted': 0.0,
+                'row_count': 0,
+            }
+            side_cr.commit()
+            token = _active_run.set(run)
+            state, message = 'failed', False
+            started = time.perf_counter()
+            try:
+                if timeout:
+                    self.env.cr.execute(
+                        "SELECT set_config('statement_timeout', %s, true)",
+                        (f'{timeout}s',))
+                yield run
+                state = 'partial' if run.get('partial') else 'done'
+                message = run.get('partial') or False
+            except ReportTimeout as error:
+                state, message = 'timeout', error.args[0]
+                raise
+            except ReportCancelled as error:
+                state, message = 'cancelled', error.args[0]
+                raise
+            except Exception as error:
+                message = str(error)
+                raise
+            finally:
+                _active_run.reset(token)
+                if timeout:
+                    self._restore_statement_timeout(previous_timeout)
+                side_env['inventory.report.run']._close_run(
+                    run['id'], state, message)
+                side_env['inventory.report.log']._log_run(
+                    run, state, time.perf_counter() - started)
+                # Committed here as the side cursor rolls back when it is
+                # left with the error of the report
+                side_cr.commit()
+
+    @api.model
+    def _restore_statement_timeout(self, previous_timeout):
+        """Restore the statement timeout of the transaction once a run
+        ends, so that a caller handling the error of the report does not
+        go on under its time limit. A transaction aborted by the error is
+        left alone: the rollback its caller has to issue drops the setting
+        anyway."""
+        try:
+            self.env.cr.execute(
+                "SELECT set_config('statement_timeout', %s, true)",
+                (previous_timeout,), log_exceptions=False)
+        except InFailedSqlTransaction:
+            pass
+
+    @api.model
+    def _set_run_partial(self, message):
+        """Record that the active run goes on without a part of its result,
+        e.g. a sheet of the analytics pack stopped by its time limit. The
+        run is then closed as partial instead of done."""
+        run = _active_run.get()
+        if run:
+            run['partial'] = '\n'.join(
+                filter(None, [run.get('partial'), message]))
+
+    @contextmanager
+    def _report_step(self, name, kind='python'):
+        """Time a Python post-processing or rendering step of the active
+        report run. The time of the statements and steps nested in the
+        block is not counted twice."""
+        run = _active_run.get()
+        if not run:
+            yield
+            return
+        accounted = run['accounted']
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            run['steps'].append({
+                'kind': kind,
+                'name': name,
+                'duration': elapsed - (run['accounted'] - accounted),
+            })
+            run['accounted'] = accounted + elapsed
+
+    @api.model
+    def _explain(self, query, params=None, cr=None):
+        """Return the ``EXPLAIN (ANALYZE, BUFFERS)`` plan of a statement.
+        The statement really runs, so it is rolled back to leave no side
+        effect (temporary tables) behind."""
+        cr = cr or self.env.cr
+        cr.execute('SAVEPOINT "inventory_report_explain"')
+        try:
+            cr.execute(f'EXPLAIN (ANALYZE, BUFFERS) {query}', params)
+            plan = '\n'.join(line for line, in cr.fetchall())
+        except QueryCanceled as error:
+            plan = str(error)
+        cr.execute('ROLLBACK TO SAVEPOINT "inventory_report_explain"')
+        cr.execute('RELEASE SAVEPOINT "inventory_report_explain"')
+        return plan
+
+    @api.model
+    def _execute(self, query, params=None, cr=None, explain=None,
+                 fetch=None):
+        """Execute a statement of the active report run. A statement stopped
+        by its timeout or cancelled by a user is rolled back on its own and
+        reported as a user error instead of aborting the transaction.
+
+        When the run is instrumented, the plan of ``explain`` is captured
+        instead of the plan of the statement, e.g. the query of a
+        ``DECLARE``; ``False`` captures no plan.
+
+        The savepoint of the statement is released once it succeeded, so
+        the rows of the statement are read by ``fetch``, called with the
+        cursor before the release. Return the result of ``fetch``, or the
+        number of rows of the statement without it."""
+        cr = cr or self.env.cr
+        run = _active_run.get()
+        plan = False
+        if run and run['instrumented'] and explain is not False:
+            plan = self._explain(explain or query, params, cr=cr)
+        cr.execute('SAVEPOINT "inventory_report_statement"')
+        started = time.perf_counter()
+        try:
+            cr.execute(query, params)
+        except QueryCanceled as error:
+            cr.execute('ROLLBACK TO SAVEPOINT "inventory_report_statement"')
+            cr.execute('RELEASE SAVEPOINT "inventory_report_statement"')
+            run = run or {}
+            report = dict(REPORT_TYPES).get(run.get('report_type'), '')
+            if 'statement timeout' in str(error):
+                raise ReportTimeout(_(
+                    "The %(report)s report was stopped after %(timeout)s "
+                    "seconds. Narrow its filters (dates, products, "
+                    "warehouses) or ask an administrator to raise its time "
+                    "limit in the Inventory settings.",
+                    report=report, timeout=run.get('timeout'))) from error
+            raise ReportCancelled(_(
+                "The %(report)s report was cancelled.",
+                report=report)) from error
+        row_count = cr.rowcount
+        result = fetch(cr) if fetch else row_count
+        cr.execute('RELEASE SAVEPOINT "inventory_report_statement"')
+        if run:
+            duration = time.perf_counter() - started
+            run['steps'].append({
+                'kind': 'sql',
+                'name': query.strip().split(None, 1)[0].upper(),
+                'duration': duration,
+                'row_count': row_count,
+                'query': cr.mogrify(query, params).decode(),
+                'plan': plan,
+            })
+            run['accounted'] += duration
+        return result
+
+    @contextmanager
+    def _replica_cursor(self, run, skip=False):
+        """Yield a cursor on the report replica, or None when ``skip`` is set,
+        no replica is configured, it cannot be reached or it lags behind the primary by
+        more than the maximum of the Inventory settings.
+
+        The replica is given by ``inventory_report_replica_dsn`` in the
+        server configuration, so its credentials never live in the
+        database. Its connections come from the connection pool of the
+        server.
+        """
+        dsn = config.get('inventory_report_replica_dsn')
+        get_param = self.env['ir.config_parameter'].sudo().get_param
+        if skip or not dsn \
+                or not get_param('inventory_advanced_reports.use_replica'):
+            yield None
+            return
+        max_lag = int(get_param('inventory_advanced_reports.replica_max_lag',
+                                DEFAULT_REPLICA_MAX_LAG) or 0)
+        try:
+            cr = sql_db.db_connect(dsn, allow_uri=True).cursor()
+        except psycopg2.Error as error:
+            _logger.warning("Report replica unavailable, using the primary: "
+                            "%s", error)
+            yield None
+            return
+        try:
+            cr.execute("""
+                SELECT CASE
+                    WHEN NOT pg_is_in_recovery()
+                        OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn()
+                    THEN 0
+                    ELSE EXTRACT(EPOCH FROM
+                        now() - pg_last_xact_replay_timestamp())
+                END
+            """)
+            lag = cr.fetchone()[0] or 0
+            if max_lag and lag > max_lag:
+                _logger.info("Report replica lags by %ss, using the primary",
+                             lag)
+                yield None
+                return
+            if run['timeout']:
+                cr.execute("SELECT set_config('statement_timeout', %s, true)",
+                           (f"{run['timeout']}s",))
+            yield cr
+        finally:
+            cr.close()
+
+    @api.model
+    def _fetch(self, query, params=None, cr=None):
+        """Execute a statement and return its rows as dictionaries"""
+        cr = cr or self.env.cr
+        rows = self._execute(query, params, cr=cr,
+                             fetch=lambda cr: cr.dictfetchall())
+        run = _active_run.get()
+        if run:
+            run['row_count'] += len(rows)
+        return rows
+
+    @api.model
+    def _run_query(self, report_type, query, params=None, labels=False):
+        """Run a read-only report query under the report run of
+        ``report_type`` and return its rows as dictionaries. The query runs
+        on the report replica when one is available, and on the primary
+        cursor otherwise or when the replica cancels it on a conflict with
+        recovery. With ``labels``, the product label of every row is set
+        from the label dimension, so that the query groups by product id
+        only."""
+        with self._report_run(report_type) as run:
+            rows = None
+            # The temporary tables of the request only exist on the primary
+            on_primary = any(table in query for table in (
+                self._base_table, self._product_table))
+            with self._replica_cursor(run, on_primary) as replica_cr:
+                if replica_cr:
+                    try:
+                        rows = self._fetch(query, params, cr=replica_cr)
+                    except SerializationFailure as error:
+                        _logger.warning("Report query cancelled on the "
+                                        "replica, using the primary: %s",
+                                        error)
+            if rows is None:
+                rows = self._fetch(query, params)
+            if labels:
+                with self._report_step('Product labels'):
+                    self.env['inventory.report.label']._set_labels(rows)
+            return rows
+
+    @api.model
+    def _get_category_paths(self, category_ids):
+        """Return the ``parent_path`` patterns matching the given categories
+        and all their descendants"""
+        return [f'{category.parent_path}%' for category in
+                self.env['product.category'].browse(category_ids).exists()]
+
+    @api.model
+    def _get_product_join(self, product_ids, category_ids,
+                          product_column='pp.id'):
+        """Return the join restricting a report query to the products of
+        the product and category filters, materialised by
+        :meth:`_get_filter_products`, or an empty string without such
+        filters"""
+        if not product_ids and not category_ids:
+            return ""
+        table = self._get_filter_products({'product_ids': product_ids,
+                                           'category_ids': category_ids})
+        return (f"INNER JOIN {table} filter_products"
+                f" ON filter_products.product_id = {product_column}")
+
+    @api.model
+    def _get_filter_products(self, filters):
+        """Materialise the products of the product and category filters in
+        a temporary table and return its name.
+
+        The categories are resolved with their whole subtree by prefix
+        matching on ``product_category.parent_path``. The table is built
+        once per report run and reused by the statements of the run.
+        """
+        product_ids = sorted(filters.get('product_ids') or [])
+        category_ids = sorted(filters.get('category_ids') or [])
+        key = (tuple(product_ids), tuple(category_ids))
+        run = _active_run.get()
+        self.env.cr.execute("SELECT to_regclass(%s)",
+                            (f'pg_temp.{self._product_table}',))
+        if run and run.get('filter_products') == key \
+                and self.env.cr.fetchone()[0]:
+            return self._product_table
+        self.env.cr.execute(f"DROP TABLE IF EXISTS {self._product_table}")
+        self._execute(f"""
+            CREATE TEMPORARY TABLE {self._product_table} ON COMMIT DROP AS
+            SELECT pp.id AS product_id
+            FROM product_product pp
+            INNER JOIN product_template pt ON pt.id = pp.product_tmpl_id
+            WHERE pp.id = ANY(%(product_ids)s)
+                OR pt.categ_id IN (
+                    SELECT pc.id FROM product_category pc
+                    WHERE pc.parent_path LIKE ANY(%(category_paths)s))
+        """, {'product_ids': product_ids,
+              'category_paths': self._get_category_paths(category_ids)})
+        self.env.cr.execute(
+            f"ALTER TABLE {self._product_table} ADD PRIMARY KEY (product_id)")
+        self.env.cr.execute(f"ANALYZE {self._product_table}")
+        if run:
+            run['filter_products'] = key
+        return self._product_table
+
+    @api.model
+    def _get_filter_clause(self, filters, product_column='pp.id',
+                           company_column='sm.company_id'):
+        """Return the SQL fragment and the named parameters of the product,
+        category and company filters of the report wizards. A category
+        filter selects the products of its subcategories too, through the
+        products materialised by :meth:`_get_filter_products`."""
+        clauses = []
+        params = {}
+        product_ids = filters.get('product_ids')
+        if filters.get('category_ids'):
+            clauses.append(f"{product_column} IN (SELECT product_id FROM "
+                           f"{self._get_filter_products(filters)})")
+        elif product_ids:
+            clauses.append(f"{product_column} = ANY(%(product_ids)s)")
+            params['product_ids'] = list(product_ids)
+        if filters.get('company_ids'):
+            clauses.append(f"{company_column} = ANY(%(company_ids)s)")
+            params['company_ids'] = list(filters['company_ids'])
+        clause = "".join(f" AND {clause}" for clause in clauses)
+        return clause, params
+
+    @api.model
+    def _get_age_slot_columns(self, age_column, qty_column, value_column):
+        """Return the aggregate columns splitting the layers into the age
+        breakdown slots of ``%(age_breakdown_days)s`` days. The first slot
+        also holds the quantities received today."""
+        columns = []
+        for slot in range(1, AGE_BREAKDOWN_SLOTS + 1):
+            conditions = []
+            if slot > 1:
+                conditions.append(
+                    f"{age_column} > %(age_breakdown_days)s * {slot - 1}")
+            if slot < AGE_BREAKDOWN_SLOTS:
+                conditions.append(
+                    f"{age_column} <= %(age_breakdown_days)s * {slot}")
+            condition = " AND ".join(conditions)
+            columns.append(
+                f"SUM(CASE WHEN {condition} THEN {qty_column} ELSE 0 END)"
+                f" AS age_breakdown_qty_{slot}")
+            columns.append(
+                f"SUM(CASE WHEN {condition} THEN {value_column} ELSE 0 END)"
+                f" AS age_breakdown_value_{slot}")
+        return ",\n".join(columns)
+
+    @api.model
+    def _get_layer_age_query(self, filters):
+        """Return the query aggregating the open valuation layers per product
+        and company, with their age breakdown.
+
+        Only the layers still holding stock (``remaining_qty > 0``) are read,
+        through the partial index of ``stock.valuation.layer``. The age of a
+        quantity is the age of the layer holding it, which under FIFO is the
+        date the quantity was received.
+        """
+        clause, params = self._get_filter_clause(
+            filters, company_column='svl.company_id')
+        params['age_breakdown_days'] = filters.get('age_breakdown_days') or 30
+        age_slots = self._get_age_slot_columns(
+            'layer.age', 'layer.remaining_qty', 'layer.remaining_value')
+        return f"""
+            SELECT
+                layer.product_id,
+                layer.company_id,
+                SUM(layer.remaining_qty) AS qty_available,
+                SUM(layer.remaining_value) AS stock_value,
+                MIN(layer.create_date) AS oldest_layer_date,
+                SUM(layer.remaining_qty) FILTER (WHERE layer.is_oldest)
+                    AS oldest_qty,
+                {age_slots}
+            FROM (
+                SELECT
+                    svl.product_id,
+                    svl.company_id,
+                    svl.create_date,
+                    svl.remaining_qty,
+                    COALESCE(svl.remaining_value, 0) AS remaining_value,
+                    CURRENT_DATE - svl.create_date::date AS age,
+                    svl.create_date = MIN(svl.create_date) OVER (
+                        PARTITION BY svl.product_id, svl.company_id)
+                        AS is_oldest
+                FROM stock_valuation_layer svl
+                INNER JOIN product_product pp ON pp.id = svl.product_id
+                INNER JOIN product_template pt ON pt.id = pp.product_tmpl_id
+                WHERE svl.remaining_qty > 0
+                    AND pt.type = 'product'
+                    {clause}
+            ) AS layer
+            GROUP BY layer.product_id, layer.company_id
+        """, params
+
+    @api.model
+    def _get_layer_ages(self, filters, report_type='age_breakdown'):
+        """Return the open layer aggregates of :meth:`_get_layer_age_query`
+        with the product, category and company labels."""
+        query, params = self._get_layer_age_query(filters)
+        rows = self._run_query(report_type, f"""
+            SELECT
+                ages.*,
+                pt.categ_id AS category_id,
+                pc.complete_name AS category_name,
+                company.name AS company_name
+            FROM ({query}) AS ages
+            INNER JOIN product_product pp ON pp.id = ages.product_id
+            INNER JOIN product_template pt ON pt.id = pp.product_tmpl_id
+            INNER JOIN product_category pc ON pc.id = pt.categ_id
+            LEFT JOIN res_company company ON company.id = ages.company_id
+        """, params, labels=True)
+        return sorted(rows, key=lambda row: row['product_code_and_name'] or '')
+
+    @api.model
+    def _get_aging_data(self, filters):
+        """Return the rows of the aging report: the stock of every product,
+        its value at cost and the age and quantity of its oldest layer."""
+        result_data = self._get_layer_ages(filters, report_type='aging')
+        products = self.env['product.product'].browse(
+            {row['product_id'] for row in result_data})
+        costs = {product.id: product.standard_price for product in products}
+        today = fields.Date.today()
+        for row in result_data:
+            cost = costs.get(row['product_id']) or 0.0
+            row['days_since_receipt'] = (
+                today - row['oldest_layer_date'].date()).days
+            row['current_value'] = row['qty_available'] * cost
+            row['prev_qty_available'] = row['oldest_qty']
+            row['prev_value'] = row['oldest_qty'] * cost
+        total_stock = sum(row['qty_available'] for row in result_data)
+        total_value = sum(row['current_value'] for row in result_data)
+        for row in result_data:
+            row['stock_percentage'] = round(
+                row['qty_available'] * 100 / total_stock, 2
+            ) if total_stock else 0.0
+            row['stock_value_percentage'] = round(
+                row['current_value'] * 100 / total_value, 2
+            ) if total_value else 0.0
+        return result_data
+
+    @api.model
+    def _create_base_table(self, filters):
+        """Materialise the base relation of the given filters.
+
+        The temporary table holds one row per product and company with the
+        stock levels, sales, average daily sales (ADS), valuation and age
+        breakdown of the remaining layers, and whether the product is
+        active. It is dropped at the end of the transaction.
+        """
+        move_clause, params = self._get_filter_clause(filters)
+        layer_query, layer_params = self._get_layer_age_query(filters)
+        params.update(layer_params)
+        start_date = filters['start_date']
+        end_date = filters['end_date']
+        params.update({
+            'start_date': start_date,
+            'end_date': end_date,
+            'period_days': (end_date - start_date).days + 1,
+            'pending_states': PENDING_MOVE_STATES,
+        })
+        age_columns = ", ".join(
+            f"COALESCE(layers.age_breakdown_{kind}_{slot}, 0)"
+            f" AS age_breakdown_{kind}_{slot}"
+            for slot in range(1, AGE_BREAKDOWN_SLOTS + 1)
+            for kind in ('qty', 'value'))
+        self.env.cr.execute(f"DROP TABLE IF EXISTS {self._base_table}")
+        self._execute(f"""
+            CREATE TEMPORARY TABLE {self._base_table} ON COMMIT DROP AS
+            WITH moves AS (
+                SELECT
+                    sm.product_id,
+                    sm.company_id,
+                    SUM(CASE WHEN sm.state = 'done' AND sm.date <= %(start_date)s
+                        AND sld_dest.usage = 'internal'
+                        THEN sm.product_uom_qty ELSE 0 END) -
+                    SUM(CASE WHEN sm.state = 'done' AND sm.date <= %(start_date)s
+                        AND sld_src.usage = 'internal'
+                        THEN sm.product_uom_qty ELSE 0 END) AS opening_stock,
+                    SUM(CASE WHEN sm.state = 'done' AND sm.date <= %(end_date)s
+                        AND sld_dest.usage = 'internal'
+                        THEN sm.product_uom_qty ELSE 0 END) -
+                    SUM(CASE WHEN sm.state = 'done' AND sm.date <= %(end_date)s
+                        AND sld_src.usage = 'internal'
+                        THEN sm.product_uom_qty ELSE 0 END) AS closing_stock,
+                    SUM(CASE WHEN sm.state = 'done'
+                        AND sld_dest.usage = 'internal'
+                        THEN sm.product_uom_qty ELSE 0 END) -
+                    SUM(CASE WHEN sm.state = 'done'
+                        AND sld_src.usage = 'internal'
+                        THEN sm.product_uom_qty ELSE 0 END) AS current_stock,
+                    SUM(CASE WHEN sm.state IN %(pending_states)s
+                        AND sld_dest.usage = 'internal'
+                        THEN sm.product_uom_qty ELSE 0 END) AS incoming_quantity,
+                    SUM(CASE WHEN sm.state IN %(pending_states)s
+                        AND sld_src.usage = 'internal'
+                        THEN sm.product_uom_qty ELSE 0 END) AS outgoing_quantity,
+                    SUM(CASE WHEN sm.state = 'done'
+                        AND sm.date BETWEEN %(start_date)s AND %(end_date)s
+                        AND sld_dest.usage = 'customer'
+                        THEN sm.product_uom_qty ELSE 0 END) AS sales,
+                    SUM(CASE WHEN sm.state = 'done'
+                        AND sm.date BETWEEN %(start_date)s AND %(end_date)s
+                        AND sld_src.usage = 'internal'
+                        THEN sm.product_uom_qty ELSE 0 END) AS outflow
+                FROM stock_move sm
+                INNER JOIN product_product pp ON pp.id = sm.product_id
+                INNER JOIN product_template pt ON pt.id = pp.product_tmpl_id
+                LEFT JOIN stock_location sld_dest
+                    ON sld_dest.id = sm.location_dest_id
+                LEFT JOIN stock_location sld_src ON sld_src.id = sm.location_id
+                WHERE pt.type = 'product'
+                    AND (sm.state = 'done' OR sm.state IN %(pending_states)s)
+                    {move_clause}
+                GROUP BY sm.product_id, sm.company_id
+            ), layers AS (
+                {layer_query}
+            )
+            SELECT
+                COALESCE(moves.product_id, layers.product_id) AS product_id,
+                COALESCE(moves.company_id, layers.company_id) AS company_id,
+                moves.product_id IS NOT NULL AS has_moves,
+                layers.product_id IS NOT NULL AS has_layers,
+                COALESCE(moves.opening_stock, 0) AS opening_stock,
+                COALESCE(moves.closing_stock, 0) AS closing_stock,
+                COALESCE(moves.current_stock, 0) AS current_stock,
+                COALESCE(moves.incoming_quantity, 0) AS incoming_quantity,
+                COALESCE(moves.outgoing_quantity, 0) AS outgoing_quantity,
+                COALESCE(moves.current_stock, 0)
+                    + COALESCE(moves.incoming_quantity, 0)
+                    - COALESCE(moves.outgoing_quantity, 0) AS virtual_stock,
+                COALESCE(moves.sales, 0) AS sales,
+                ROUND(COALESCE(moves.outflow, 0) / %(period_days)s, 2) AS ads,
+                0::numeric AS ads_7,
+                0::numeric AS ads_30,
+                0::numeric AS ads_90,
+                0::numeric AS ads_smoothed,
+                COALESCE(layers.qty_available, 0) AS stock_qty,
+                COALESCE(layers.stock_value, 0) AS stock_value,
+                layers.oldest_layer_date,
+                COALESCE(layers.oldest_qty, 0) AS oldest_qty,
+                {age_columns},
+                0.0::numeric AS cost,
+                pp.active AND pt.active AS active
+            FROM moves
+            FULL OUTER JOIN layers
+                ON layers.product_id = moves.product_id
+                AND layers.company_id = moves.company_id
+            INNER JOIN product_product pp
+                ON pp.id = COALESCE(moves.product_id, layers.product_id)
+            INNER JOIN product_template pt ON pt.id = pp.product_tmpl_id
+        """, params)
+        self.env.cr.execute(
+            f"CREATE INDEX ON {self._base_table} (product_id, company_id)")
+        self._set_base_costs()
+        self.env['inventory.demand.engine']._set_base_demand(filters)
+        self.env['inventory.report.label']._ensure_labels()
+        self.env.cr.execute(f"ANALYZE {self._base_table}")
+        return self._base_table
+
+    @api.model
+    def _set_base_costs(self):
+        """Store the cost price of the products on the base relation so the
+        derived reports can value their quantities in SQL."""
+        self.env.cr.execute(
+            f"SELECT DISTINCT product_id FROM {self._base_table}")
+        products = self.env['product.product'].browse(
+            [row[0] for row in self.env.cr.fetchall()])
+        if not products:
+            return
+        self.env.cr.execute(f"""
+            UPDATE {self._base_table} base
+            SET cost = product_cost.cost
+            FROM unnest(%s::int[], %s::numeric[])
+                AS product_cost(product_id, cost)
+            WHERE base.product_id = product_cost.product_id
+        """, (products.ids, [product.standard_price for product in products]))
+
+    @api.model
+    def _get_base_query(self, report, filters):
+        """Return the query and parameters deriving ``report`` from the base
+        relation built by :meth:`_create_base_table`."""
+        query_method = getattr(self, f'_get_base_{report}_query')
+        query, params = query_method(filters)
+        params['lang'] = self.env['inventory.report.label']._get_lang()
+        return f"""
+            SELECT
+                report.*,
+                label.label AS product_code_and_name,
+                pt.categ_id AS category_id,
+                pc.complete_name AS category_name,
+                company.name AS company_name
+            FROM ({query}) AS report
+            INNER JOIN product_product pp ON pp.id = report.product_id
+            INNER JOIN product_template pt ON pt.id = pp.product_tmpl_id
+            INNER JOIN product_category pc ON pc.id = pt.categ_id
+            LEFT JOIN {LABEL_TABLE} label
+                ON label.product_id = report.product_id
+                AND label.lang = %(lang)s
+            LEFT JOIN res_company company ON company.id = report.company_id
+            ORDER BY report.sequence, product_code_and_name
+        """, params
+
+    @api.model
+    def _get_warehouse_join(self, filters):
+        """Return the warehouse join of the per-warehouse reports."""
+        join = "INNER JOIN stock_warehouse sw ON sw.company_id = base.company_id"
+        if filters.get('warehouse_ids'):
+            join += " AND sw.id = ANY(%(warehouse_ids)s)"
+        return join, {'warehouse_ids': list(filters.get('warehouse_ids') or [])}
+
+    @api.model
+    def _get_fsn_classification(self, ratio_column):
+        """Return the SQL expression classifying a turnover ratio."""
+        return f"""
+            CASE
+                WHEN {ratio_column} > 3 THEN 'Fast Moving'
+                WHEN {ratio_column} >= 1 THEN 'Slow Moving'
+                ELSE 'Non Moving'
+            END"""
+
+    @api.model
+    def _get_base_fsn_query(self, filters):
+        """FSN analysis derived from the base relation."""
+        warehouse_join, params = self._get_warehouse_join(filters)
+        return f"""
+            SELECT
+                base.*,
+                sw.id AS warehouse_id,
+                0 AS sequence,
+                ratio.average_stock,
+                ratio.turnover_ratio,
+                {self._get_fsn_classification('ratio.turnover_ratio')}
+                    AS fsn_classification
+            FROM {self._base_table} base
+            {warehouse_join}
+            CROSS JOIN LATERAL (
+                SELECT
+                    (base.opening_stock + base.closing_stock) / 2
+                        AS average_stock,
+                    CASE WHEN base.sales > 0 THEN ROUND(base.sales / NULLIF(
+                        (base.opening_stock + base.closing_stock) / 2, 0), 2)
+                    ELSE 0 END AS turnover_ratio
+            ) AS ratio
+            WHERE base.has_moves
+        """, params
+
+    @api.model
+    def _get_base_xyz_query(self, filters):
+        """XYZ analysis derived from the base relation, ranked by value."""
+        return f"""
+            SELECT
+                ranked.*,
+                CASE
+                    WHEN ranked.cumulative_stock_percentage < 70 THEN 'X'
+                    WHEN ranked.cumulative_stock_percentage <= 90 THEN 'Y'
+                    ELSE 'Z'
+                END AS xyz_classification
+            FROM (
+                SELECT
+                    base.*,
+                    ROW_NUMBER() OVER (ORDER BY base.stock_value DESC)
+                        AS sequence,
+                    ROUND(COALESCE(base.stock_value * 100 / NULLIF(
+                        SUM(base.stock_value) OVER (), 0), 0), 2)
+                        AS stock_percentage,
+                    ROUND(COALESCE(SUM(base.stock_value) OVER (
+                        ORDER BY base.stock_value DESC
+                        ROWS UNBOUNDED PRECEDING) * 100 / NULLIF(
+                        SUM(base.stock_value) OVER (), 0), 0), 2)
+                        AS cumulative_stock_percentage
+                FROM {self._base_table} base
+                WHERE base.has_layers
+                    AND base.active
+            ) AS ranked
+        """, {}
+
+    @api.model
+    def _get_base_fsn_xyz_query(self, filters):
+        """FSN-XYZ analysis derived from the base relation: the FSN
+        classification per warehouse, combined with the XYZ ranking of the
+        stock values."""
+        warehouse_join, params = self._get_warehouse_join(filters)
+        return f"""
+            SELECT
+                ranked.*,
+                CASE
+                    WHEN ranked.cumulative_stock_percentage < 70 THEN 'X'
+                    WHEN ranked.cumulative_stock_percentage <= 90 THEN 'Y'
+                    ELSE 'Z'
+                END AS xyz_classification,
+                CONCAT(LEFT(ranked.fsn_classification, 1), CASE
+                    WHEN ranked.cumulative_stock_percentage < 70 THEN 'X'
+                    WHEN ranked.cumulative_stock_percentage <= 90 THEN 'Y'
+                    ELSE 'Z'
+                END) AS combined_classification
+            FROM (
+                SELECT
+                    base.*,
+                    sw.id AS warehouse_id,
+                    ROW_NUMBER() OVER (ORDER BY base.stock_value DESC)
+                        AS sequence,
+                    ratio.average_stock,
+                    ratio.turnover_ratio,
+                    {self._get_fsn_classification('ratio.turnover_ratio')}
+                        AS fsn_classification,
+                    ROUND(COALESCE(base.stock_value * 100 / NULLIF(
+                        SUM(base.stock_value) OVER (), 0), 0), 2)
+                        AS stock_percentage,
+                    ROUND(COALESCE(SUM(base.stock_value) OVER (
+                        ORDER BY base.stock_value DESC
+                        ROWS UNBOUNDED PRECEDING) * 100 / NULLIF(
+                        SUM(base.stock_value) OVER (), 0), 0), 2)
+                        AS cumulative_stock_percentage
+                FROM {self._base_table} base
+                {warehouse_join}
+                CROSS JOIN LATERAL (
+                    SELECT
+                        (base.opening_stock + base.closing_stock) / 2
+                            AS average_stock,
+                        CASE WHEN base.sales > 0 THEN ROUND(
+                            base.sales / NULLIF((base.opening_stock
+                            + base.closing_stock) / 2, 0), 2)
+                        ELSE 0 END AS turnover_ratio
+                ) AS ratio
+                WHERE base.has_moves
+                    AND base.has_layers
+                    AND base.active
+            ) AS ranked
+        """, params
+
+    @api.model
+    def _get_base_aging_query(self, filters):
+        """Aging analysis derived from the base relation."""
+        return f"""
+            SELECT
+                base.*,
+                0 AS sequence,
+                base.stock_qty AS qty_available,
+                base.stock_qty * base.cost AS current_value,
+                CURRENT_DATE - base.oldest_layer_date::date
+                    AS days_since_receipt,
+                base.oldest_qty AS prev_qty_available,
+                base.oldest_qty * base.cost AS prev_value,
+                ROUND(COALESCE(base.stock_qty * 100 / NULLIF(
+                    SUM(base.stock_qty) OVER (), 0), 0), 2)
+                    AS stock_percentage,
+                ROUND(COALESCE(base.stock_qty * base.cost * 100 / NULLIF(
+                    SUM(base.stock_qty * base.cost) OVER (), 0), 0), 2)
+                    AS stock_value_percentage
+            FROM {self._base_table} base
+            WHERE base.has_layers
+        """, {}
+
+    @api.model
+    def _get_base_age_breakdown_query(self, filters):
+        """Age breakdown derived from the base relation."""
+        return f"""
+            SELECT
+                base.*,
+                0 AS sequence,
+                base.stock_qty AS qty_available
+            FROM {self._base_table} base
+            WHERE base.has_layers
+        """, {}
+
+    @api.model
+    def _get_base_over_stock_query(self, filters):
+        """Over stock analysis derived from the base relation, per warehouse
+        of the filters, with the last confirmed purchase of each product
+        within the period."""
+        warehouse_join, params = self._get_warehouse_join(filters)
+        params.update({
+            'next_days': filters.get('inventory_for_next_x_days') or 0,
+            'start_date': filters['start_date'],
+            'end_date': filters['end_date'],
+        })
+        return f"""
+            SELECT
+                stock.*,
+                ROUND(COALESCE(stock.over_stock_qty * 100 / NULLIF(
+                    SUM(stock.over_stock_qty) OVER (), 0), 0), 2)
+                    AS over_stock_qty_percentage,
+                stock.over_stock_qty * stock.cost AS over_stock_value,
+                ROUND(COALESCE(stock.over_stock_qty * stock.cost * 100
+                    / NULLIF(SUM(stock.over_stock_qty * stock.cost) OVER (),
+                    0), 0), 2) AS over_stock_value_percentage,
+                last_po.po_date,
+                last_po.po_qty,
+                last_po.po_price_total,
+                last_po.po_currency,
+                last_po.po_partner
+            FROM (
+                SELECT
+                    base.*,
+                    sw.id AS warehouse_id,
+                    0 AS sequence,
+                    %(next_days)s AS advance_stock_days,
+                    ROUND(%(next_days)s * base.ads, 0) AS demanded_quantity,
+                    ROUND(base.virtual_stock / COALESCE(
+                        NULLIF(base.ads, 0), 0.001), 0) AS in_stock_days,
+                    ROUND(base.virtual_stock - base.ads * %(next_days)s, 0)
+                        AS over_stock_qty,
+                    ROUND(COALESCE(base.sales / NULLIF(base.virtual_stock, 0),
+                        0), 2) AS turnover_ratio,
+                    {self._get_fsn_classification(
+                        'COALESCE(base.sales / NULLIF(base.virtual_stock, 0), 0)')}
+                        AS fsn_classification
+                FROM {self._base_table} base
+                {warehouse_join}
+                WHERE base.has_moves
+                    AND base.active
+            ) AS stock
+            LEFT JOIN (
+                SELECT DISTINCT ON (pol.product_id)
+                    pol.product_id,
+                    po.date_approve AS po_date,
+                    pol.product_qty AS po_qty,
+                    pol.price_total AS po_price_total,
+                    currency.name AS po_currency,
+                    partner.name AS po_partner
+                FROM purchase_order_line pol
+                INNER JOIN purchase_order po ON po.id = pol.order_id
+                LEFT JOIN res_currency currency ON currency.id = po.currency_id
+                LEFT JOIN res_partner partner ON partner.id = po.partner_id
+                WHERE pol.state = 'purchase'
+                    AND pol.product_id IN (
+                        SELECT product_id FROM {self._base_table})
+                ORDER BY pol.product_id, po.date_approve DESC
+            ) AS last_po ON last_po.product_id = stock.product_id
+                AND last_po.po_date::date
+                    BETWEEN %(start_date)s AND %(end_date)s
+        """, params
+
+    @api.model
+    def _get_base_out_of_stock_query(self, filters):
+        """Out of stock analysis derived from the base relation."""
+        warehouse_join, params = self._get_warehouse_join(filters)
+        params['next_days'] = filters.get('inventory_for_next_x_days') or 0
+        return f"""
+            SELECT
+                stock.*,
+                CASE WHEN stock.advance_stock_days = 0 THEN 0
+                    ELSE stock.out_of_stock_days
+                END AS out_of_stock_ratio,
+                ROUND(stock.out_of_stock_days * stock.ads, 0)
+                    AS out_of_stock_qty,
+                ROUND(COALESCE(stock.out_of_stock_days * stock.ads * 100
+                    / NULLIF(SUM(stock.out_of_stock_days * stock.ads) OVER (),
+                    0), 0), 2) AS out_of_stock_qty_percentage,
+                ROUND(stock.out_of_stock_days * stock.ads, 0) * stock.cost
+                    AS out_of_stock_value
+            FROM (
+                SELECT
+                    base.*,
+                    sw.id AS warehouse_id,
+                    0 AS sequence,
+                    %(next_days)s AS advance_stock_days,
+                    ROUND(%(next_days)s * base.ads, 0) AS demanded_quantity,
+                    ROUND(coverage.days, 0) AS in_stock_days,
+                    ROUND(GREATEST(%(next_days)s - coverage.days, 0), 0)
+                        AS out_of_stock_days,
+                    ROUND(COALESCE(base.sales / NULLIF(base.virtual_stock, 0),
+                        0), 2) AS turnover_ratio,
+                    {self._get_fsn_classification(
+                        'COALESCE(base.sales / NULLIF(base.virtual_stock, 0), 0)')}
+                        AS fsn_classification
+                FROM {self._base_table} base
+                {warehouse_join}
+                CROSS JOIN LATERAL (
+                    SELECT ROUND(base.virtual_stock / COALESCE(
+                        NULLIF(base.ads, 0), 0.001), 2) AS days
+                ) AS coverage
+                WHERE base.has_moves
+                    AND base.active
+            ) AS stock
+        """, params
+
+    @api.model
+    def _get_comparison_periods(self, filters):
+        """Return the current and previous periods of a comparison. The
+        previous period defaults to the period of the same length ending
+        the day before the current one."""
+        start_date = fields.Date.to_date(filters['start_date'])
+        end_date = fields.Date.to_date(filters['end_date'])
+        compare_start_date = fields.Date.to_date(
+            filters.get('compare_start_date'))
+        compare_end_date = fields.Date.to_date(filters.get('compare_end_date'))
+        if not compare_start_date or not compare_end_date:
+            compare_end_date = start_date - timedelta(days=1)
+            compare_start_date = compare_end_date - (end_date - start_date)
+        return {
+            '': (start_date, end_date),
+            '_previous': (compare_start_date, compare_end_date),
+        }
+
+    @api.model
+    def _get_location_clause(self, side, usage, warehouse_ids=None):
+        """Return the predicate of the ``side`` location of a move having
+        the given usage. With ``warehouse_ids``, only the internal locations
+        of those warehouses are internal."""
+        clause = f"{side}.usage = '{usage}'"
+        if warehouse_ids and usage == 'internal':
+            clause += f" AND {side}.warehouse_id = ANY(%(warehouse_ids)s)"
+        return clause
+
+    @api.model
+    def _get_period_measures(self, report_type, suffix, warehouse_ids=None):
+        """Return the aggregates of the measures of a period, the dates of
+        the period being the ``start_date`` and ``end_date`` parameters
+        suffixed by ``suffix``. With ``warehouse_ids``, the stock is the
+        stock of those warehouses."""
+        start = f'%(start_date{suffix})s'
+        end = f'%(end_date{suffix})s'
+        stock = """
+            COALESCE(SUM(sm.product_uom_qty) FILTER (WHERE sm.date <= {date}
+                AND {dest}), 0)
+            - COALESCE(SUM(sm.product_uom_qty) FILTER (WHERE sm.date <= {date}
+                AND {src}), 0)"""
+        internal = {
+            side: self._get_location_clause(side, 'internal', warehouse_ids)
+            for side in ('dest', 'src')}
+        measures = [
+            f"{stock.format(date=start, **internal)} AS opening_stock{suffix}",
+            f"{stock.format(date=end, **internal)} AS closing_stock{suffix}",
+        ]
+        flows = MOVEMENT_FLOWS if report_type == 'stock_movement' \
+            else [('sales', 'dest', 'customer')]
+        measures += [
+            f"COALESCE(SUM(sm.product_uom_qty) FILTER (WHERE sm.date BETWEEN"
+            f" {start} AND {end} AND"
+            f" {self._get_location_clause(side, usage, warehouse_ids)}), 0)"
+            f" AS {measure}{suffix}"
+            for measure, side, usage in flows]
+        return measures
+
+    @api.model
+    def _get_comparison_query(self, report_type, filters):
+        """Return the query and parameters comparing the measures of the
+        FSN or stock movement report over two periods.
+
+        Both periods are aggregated in the same scan of the stock moves with
+        conditional aggregates, up to the last day of either period. A
+        warehouse filter keeps the moves in or out of the warehouses and
+        the stock of their internal locations, in both periods. Every
+        measure comes with its previous value, its delta and its change in
+        percent of the previous value.
+        """
+        periods = self._get_comparison_periods(filters)
+        filter_clause, params = self._get_filter_clause(
+            filters, product_column='sm.product_id')
+        warehouse_ids = list(filters.get('warehouse_ids') or [])
+        if warehouse_ids:
+            # Only the moves in or out of the warehouses, in both periods
+            filter_clause += (
+                " AND (src.warehouse_id = ANY(%(warehouse_ids)s)"
+                " OR dest.warehouse_id = ANY(%(warehouse_ids)s))")
+            params['warehouse_ids'] = warehouse_ids
+        for suffix, (start_date, end_date) in periods.items():
+            params.update({f'start_date{suffix}': start_date,
+                           f'end_date{suffix}': end_date})
+        params['last_date'] = max(end for _start, end in periods.values())
+        measures = ",".join(
+            measure for suffix in periods
+            for measure in self._get_period_measures(
+                report_type, suffix, warehouse_ids))
+        period_columns = ["moves.*"]
+        if report_type == 'fsn':
+            for suffix in periods:
+                average = (f"(moves.opening_stock{suffix}"
+                           f" + moves.closing_stock{suffix}) / 2")
+                ratio = (f"CASE WHEN moves.sales{suffix} > 0 THEN ROUND("
+                         f"moves.sales{suffix} / NULLIF({average}, 0), 2)"
+                         f" ELSE 0 END")
+                period_columns += [
+                    f"{average} AS average_stock{suffix}",
+                    f"{ratio} AS turnover_ratio{suffix}",
+                    f"{self._get_fsn_classification(ratio)}"
+                    f" AS fsn_classification{suffix}",
+                ]
+        comparisons = ",".join(f"""
+            {measure} - {measure}_previous AS {measure}_delta,
+            ROUND(100 * ({measure} - {measure}_previous)
+                / NULLIF(ABS({measure}_previous), 0), 2) AS {measure}_change"""
+            for measure in COMPARISON_MEASURES[report_type])
+        return f"""
+            SELECT
+                periods.*,
+                {comparisons},
+                pt.categ_id AS category_id,
+                pc.complete_name AS category_name,
+                company.name AS company_name
+            FROM (
+                SELECT {", ".join(period_columns)}
+                FROM (
+                    SELECT
+                        sm.product_id,
+                        sm.company_id,
+                        {measures}
+                    FROM stock_move sm
+                    INNER JOIN product_product pp ON pp.id = sm.product_id
+                    INNER JOIN product_template pt
+                        ON pt.id = pp.product_tmpl_id
+                    LEFT JOIN stock_location dest
+                        ON dest.id = sm.location_dest_id
+                    LEFT JOIN stock_location src ON src.id = sm.location_id
+                    WHERE sm.state = 'done'
+                        AND sm.date <= %(last_date)s
+                        {filter_clause}
+                    GROUP BY sm.product_id, sm.company_id
+                ) AS moves
+            ) AS periods
+            INNER JOIN product_product pp ON pp.id = periods.product_id
+            INNER JOIN product_template pt ON pt.id = pp.product_tmpl_id
+            INNER JOIN product_category pc ON pc.id = pt.categ_id
+            LEFT JOIN res_company company ON company.id = periods.company_id
+        """, params
+
+    @api.model
+    def _get_comparison_rows(self, report_type, filters):
+        """Return the rows of :meth:`_get_comparison_query` with the product
+        labels, ordered by label"""
+        query, params = self._get_comparison_query(report_type, filters)
+        rows = self._run_query(report_type, query, params, labels=True)
+        return sorted(rows, key=lambda row: row['product_code_and_name'] or '')
+
+    @api.model
+    def _iter_base_rows(self, report, filters, batch_size=2000):
+        """Yield the rows of ``report`` derived from the base relation in
+        batches, so large results are never held in memory at once.
+
+        The rows are read through a server-side cursor declared on the
+        query: a client-side cursor would receive the whole result before
+        the first batch."""
+        query, params = self._get_base_query(report, filters)
+        cursor = 'inventory_report_rows'
+        self._execute(f"DECLARE {cursor} NO SCROLL CURSOR FOR {query}",
+                      params, explain=query)
+        run = _active_run.get()
+        try:
+            while True:
+                rows = self._execute(
+                    f"FETCH FORWARD {int(batch_size)} FROM {cursor}",
+                    explain=False, fetch=lambda cr: cr.dictfetchall())
+                if not rows:
+                    break
+                if run:
+                    run['row_count'] += len(rows)
+                yield from rows
+        finally:
+            self.env.cr.execute(f"CLOSE {cursor}")
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#  Cybrosys Technologies Pvt. Ltd.
+#
+#  Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#  Author: Jumana Haseen (odoo@cybrosys.com)
+#
+#  You can modify it under the terms of the GNU LESSER
+#  GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#  You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#  (LGPL v3) along with this program.
+#  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+import logging
+from contextlib import closing
+from odoo import api, models, sql_db
+
+_logger = logging.getLogger(__name__)
+
+# Tables with more estimated rows than this get their indexes built with
+# CREATE INDEX CONCURRENTLY by the scheduled action instead of at install.
+LARGE_TABLE_ROWS = 100000
+
+REPORT_INDEXES = [
+    {
+        'name': 'stock_move_report_product_state_date_index',
+        'table': 'stock_move',
+        'columns': ['product_id', 'state', 'date'],
+        'include': ['product_uom_qty', 'location_id', 'location_dest_id',
+                    'company_id'],
+        'where': None,
+        'comment': "FSN, XYZ, FSN-XYZ, over stock, out of stock, stock "
+                   "movement reports and the analytics pack base table: "
+                   "done and pending moves of a product over a date range",
+    },
+    {
+        'name': 'stock_valuation_layer_report_move_index',
+        'table': 'stock_valuation_layer',
+        'columns': ['stock_move_id'],
+        'include': ['remaining_qty', 'remaining_value'],
+        'where': 'stock_move_id IS NOT NULL',
+        'comment': "FSN-XYZ report: remaining value of the layers of the "
+                   "moves of the period",
+    },
+    {
+        'name': 'stock_valuation_layer_report_valued_index',
+        'table': 'stock_valuation_layer',
+        'columns': ['product_id', 'company_id'],
+        'include': ['remaining_qty', 'remaining_value'],
+        'where': 'remaining_value IS NOT NULL',
+        'comment': "XYZ and FSN-XYZ reports: stock value per product and "
+                   "company",
+    },
+    {
+        'name': 'stock_valuation_layer_open_layer_index',
+        'table': 'stock_valuation_layer',
+        'columns': ['product_id', 'company_id', 'create_date'],
+        'include': [],
+        'where': 'remaining_qty > 0',
+        'comment': "Aging, age breakdown reports and the analytics pack: "
+                   "open layers still holding stock",
+    },
+    {
+        'name': 'purchase_order_line_report_product_state_index',
+        'table': 'purchase_order_line',
+        'columns': ['product_id', 'state'],
+        'include': ['order_id', 'product_qty', 'price_total'],
+        'where': None,
+        'comment': "Over stock report: last confirmed purchase of a product",
+    },
+]
+
+
+class InventoryReportIndex(models.AbstractModel):
+    """Indexes backing the predicates of the inventory reports.
+
+    Small tables are indexed in the install transaction. Large tables are
+    indexed with CREATE INDEX CONCURRENTLY by a scheduled action so that
+    stock moves can still be written while the index is built.
+    """
+    _name = 'inventory.report.index'
+    _description = 'Inventory Report Indexes'
+
+    def init(self):
+        """Create the missing indexes of the small tables"""
+        cr = self.env.cr
+        for index in self._get_missing_indexes(cr):
+            if self._get_table_rows(cr, index['table']) > LARGE_TABLE_ROWS:
+                _logger.info("Index %s deferred to the scheduled action: "
+                             "%s is large", index['name'], index['table'])
+                continue
+            cr.execute(self._get_index_definition(index))
+            self._comment_index(cr, index)
+
+    @api.model
+    def _get_index_definition(self, index, concurrently=False):
+        """Return the CREATE INDEX statement of an index of the pack"""
+        definition = (
+            f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}"
+            f"IF NOT EXISTS {index['name']} ON {index['table']} "
+            f"({', '.join(index['columns'])})")
+        if index['include']:
+            definition += f" INCLUDE ({', '.join(index['include'])})"
+        if index['where']:
+            definition += f" WHERE {index['where']}"
+        return definition
+
+    @api.model
+    def _comment_index(self, cr, index):
+        """Document an index with the reports it serves"""
+        cr.execute(f"COMMENT ON INDEX {index['name']} IS %s",
+                   (index['comment'],))
+
+    @api.model
+    def _get_missing_indexes(self, cr):
+        """Return the indexes of the pack that do not exist or were left
+        invalid by an interrupted concurrent build"""
+        cr.execute("""
+            SELECT c.relname
+            FROM pg_class c
+            JOIN pg_index i ON i.indexrelid = c.oid
+            WHERE c.relname = ANY(%s) AND i.indisvalid
+        """, ([index['name'] for index in REPORT_INDEXES],))
+        existing = {name for name, in cr.fetchall()}
+        return [index for index in REPORT_INDEXES
+                if index['name'] not in existing]
+
+    @api.model
+    def _get_table_rows(self, cr, table):
+        """Return the estimated number of rows of a table.
+
+        A table never vacuumed nor analyzed has no estimate (``reltuples``
+        is -1 since PostgreSQL 14, 0 before), so its rows are counted up to
+        just over ``LARGE_TABLE_ROWS``, which is enough to tell a large
+        table while keeping the count cheap.
+        """
+        cr.execute("""
+            SELECT reltuples FROM pg_class WHERE oid = to_regclass(%s)
+        """, (table,))
+        row = cr.fetchone()
+        if not row:
+            return 0
+        if row[0] > 0:
+            return row[0]
+        cr.execute(f"""
+            SELECT COUNT(*) FROM (
+                SELECT 1 FROM {table} LIMIT {LARGE_TABLE_ROWS + 1}
+            ) AS sample
+        """)
+        return cr.fetchone()[0]
+
+    @api.model
+    def _cron_create_indexes(self):
+        """Build the missing indexes concurrently.
+
+        CREATE INDEX CONCURRENTLY cannot run in a transaction and waits for
+        the transactions older than the build, so the cron transaction is
+        committed first and the indexes are built on an autocommit
+        connection of their own.
+        """
+        missing = self._get_missing_indexes(self.env.cr)
+        if not missing:
+            return
+        self.env.cr.commit()
+        db = sql_db.db_connect(self.env.cr.dbname)
+        with closing(db.cursor()) as cr:
+            cr._cnx.autocommit = True
+            for index in missing:
+                # An invalid index left by a failed build must be dropped
+                # before it can be built again.
+                cr.execute(
+                    f"DROP INDEX CONCURRENTLY IF EXISTS {index['name']}")
+                _logger.info("Building index %s", index['name'])
+                cr.execute(self._get_index_definition(
+                    index, concurrently=True))
+                self._comment_index(cr, index)
+
+    @api.model
+    def _drop_indexes(self):
+        """Drop the indexes of the pack, on uninstallation"""
+        for index in REPORT_INDEXES:
+            self.env.cr.execute(f"DROP INDEX IF EXISTS {index['name']}")
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#  Cybrosys Technologies Pvt. Ltd.
+#
+#  Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#  Author: Jumana Haseen (odoo@cybrosys.com)
+#
+#  You can modify it under the terms of the GNU LESSER
+#  GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#  You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#  (LGPL v3) along with this program.
+#  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from odoo import api, models
+
+LABEL_TABLE = 'inventory_report_product_label'
+
+
+class InventoryReportLabel(models.AbstractModel):
+    """Product label dimension of the inventory reports.
+
+    The ``[code] - name`` label of every product is kept per active
+    language in ``inventory_report_product_label``, and refreshed when a
+    product, its template or the languages change. The report queries group
+    by product id only and the labels are joined to their result.
+    """
+    _name = 'inventory.report.label'
+    _description = 'Inventory Report Product Labels'
+
+    def init(self):
+        """Create the table of the labels"""
+        self.env.cr.execute(f"""
+            CREATE TABLE IF NOT EXISTS {LABEL_TABLE} (
+                product_id integer NOT NULL
+                    REFERENCES product_product (id) ON DELETE CASCADE,
+                lang varchar NOT NULL,
+                label varchar,
+                PRIMARY KEY (product_id, lang)
+            )
+        """)
+        self._refresh_labels(missing=True)
+
+    @api.model
+    def _get_lang(self):
+        """Return the language of the report labels"""
+        return self.env.lang or 'en_US'
+
+    @api.model
+    def _refresh_labels(self, product_ids=None, langs=None, missing=False):
+        """Compute the labels of the given products, or of all products, in
+        the given languages, or in all active languages. With ``missing``,
+        only the labels not computed yet are.
+
+        The pending writes of the products, templates and languages are
+        flushed first, as the labels are computed in SQL right after the
+        ``write`` of the ORM, which only queues them."""
+        self.env['product.product'].flush_model(
+            ['default_code', 'product_tmpl_id'])
+        self.env['product.template'].flush_model(['name'])
+        self.env['res.lang'].flush_model(['active'])
+        conditions = ["lang.active"]
+        params = {}
+        if product_ids is not None:
+            conditions.append("pp.id = ANY(%(product_ids)s)")
+            params['product_ids'] = list(product_ids)
+        if langs is not None:
+            conditions.append("lang.code = ANY(%(langs)s)")
+            params['langs'] = list(langs)
+        if missing:
+            conditions.append(f"""NOT EXISTS (
+                SELECT 1 FROM {LABEL_TABLE} label
+                WHERE label.product_id = pp.id AND label.lang = lang.code)""")
+        self.env.cr.execute(f"""
+            INSERT INTO {LABEL_TABLE} (product_id, lang, label)
+            SELECT
+                pp.id,
+                lang.code,
+                CASE
+                    WHEN pp.default_code IS NOT NULL
+                        THEN CONCAT(pp.default_code, ' - ', COALESCE(
+                            pt.name->>lang.code, pt.name->>'en_US'))
+                    ELSE
+                        COALESCE(pt.name->>lang.code, pt.name->>'en_US')
+                END
+            FROM product_product pp
+            INNER JOIN product_template pt ON pt.id = pp.product_tmpl_id
+            CROSS JOIN res_lang lang
+            WHERE {' AND '.join(conditions)}
+            ON CONFLICT (product_id, lang) DO UPDATE SET label = EXCLUDED.label
+        """, params)
+
+    @api.model
+    def _ensure_labels(self, product_ids=None):
+        """Compute the missing labels of the report language, such as the
+        labels of products inserted without the ORM"""
+        self._refresh_labels(product_ids, [self._get_lang()], missing=True)
+
+    @api.model
+    def _get_labels(self, product_ids):
+        """Return the labels of the given products in the report language"""
+        product_ids = list(set(product_ids))
+        if not product_ids:
+            return {}
+        self._ensure_labels(product_ids)
+        self.env.cr.execute(f"""
+            SELECT product_id, label FROM {LABEL_TABLE}
+            WHERE product_id = ANY(%s) AND lang = %s
+        """, (product_ids, self._get_lang()))
+        return dict(self.env.cr.fetchall())
+
+    @api.model
+    def _set_labels(self, rows, column='product_code_and_name'):
+        """Set the label of the product of every row"""
+        labels = self._get_labels(row['product_id'] for row in rows)
+        for row in rows:
+            row[column] = labels.get(row['product_id'])
+        return rows
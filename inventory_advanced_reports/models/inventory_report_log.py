@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#  Cybrosys Technologies Pvt. Ltd.
+#
+#  Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#  Author: Jumana Haseen (odoo@cybrosys.com)
+#
+#  You can modify it under the terms of the GNU LESSER
+#  GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#  You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#  (LGPL v3) along with this program.
+#  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+import json
+from odoo import api, fields, models
+from .inventory_report_engine import DEFAULT_SLOW_REPORT_THRESHOLD, \
+    REPORT_TYPES
+
+STEP_KINDS = [
+    ('sql', 'SQL'),
+    ('python', 'Python'),
+    ('render', 'Rendering'),
+]
+
+
+class InventoryReportLog(models.Model):
+    """Timings of the slow or instrumented inventory report runs"""
+    _name = 'inventory.report.log'
+    _description = 'Inventory Slow Report Log'
+    _order = 'create_date desc, id desc'
+    _rec_name = 'report_type'
+
+    report_type = fields.Selection(REPORT_TYPES, string="Report",
+                                   readonly=True, help="Report generated")
+    run_id = fields.Many2one('inventory.report.run', string="Run",
+                             readonly=True, ondelete='set null',
+                             help="Run of the report")
+    user_id = fields.Many2one('res.users', string="User", readonly=True,
+                              help="User who generated the report")
+    state = fields.Selection(related='run_id.state', string="Status")
+    instrumented = fields.Boolean(string="Explained", readonly=True,
+                                  help="The plans of the statements were"
+                                       " captured with EXPLAIN ANALYZE")
+    parameters = fields.Text(string="Parameters", readonly=True,
+                             help="Filters of the report")
+    duration = fields.Float(string="Duration (s)", readonly=True,
+                            help="Total duration of the run")
+    sql_duration = fields.Float(string="SQL (s)", readonly=True,
+                                help="Time spent in the statements")
+    python_duration = fields.Float(string="Python (s)", readonly=True,
+                                   help="Time spent post-processing rows")
+    render_duration = fields.Float(string="Rendering (s)", readonly=True,
+                                   help="Time spent rendering the document")
+    query_count = fields.Integer(string="Queries", readonly=True,
+                                 help="Number of report statements")
+    row_count = fields.Integer(string="Rows", readonly=True,
+                               help="Number of rows returned to the report")
+    line_ids = fields.One2many('inventory.report.log.line', 'log_id',
+                               string="Steps", readonly=True,
+                               help="Statements and steps of the run")
+
+    @api.model
+    def _log_run(self, run, state, duration):
+        """Store the steps of a report run when it was instrumented or
+        slower than the threshold of the Inventory settings. It is called on
+        the side cursor of the run, so failed runs are logged too."""
+        threshold = float(self.env['ir.config_parameter'].sudo().get_param(
+            'inventory_advanced_reports.slow_report_threshold',
+            DEFAULT_SLOW_REPORT_THRESHOLD) or 0)
+        if not run['instrumented'] and (
+                not threshold or duration < threshold):
+            return
+        steps = run['steps']
+        totals = {kind: sum(step['duration'] for step in steps
+                            if step['kind'] == kind)
+                  for kind, dummy in STEP_KINDS}
+        self.sudo().create({
+            'report_type': run['report_type'],
+            'run_id': run['id'],
+            'user_id': run['uid'],
+            'instrumented': run['instrumented'],
+            'parameters': json.dumps(run['parameters'], indent=2,
+                                     default=str)
+            if run['parameters'] else False,
+            'duration': duration,
+            'sql_duration': totals['sql'],
+            'python_duration': totals['python'],
+            'render_duration': totals['render'],
+            'query_count': sum(1 for step in steps
+                               if step['kind'] == 'sql'),
+            'row_count': run['row_count'],
+            'line_ids': [fields.Command.create({
+                'sequence': sequence,
+                'kind': step['kind'],
+                'name': step['name'],
+                'duration': step['duration'],
+                'row_count': step.get('row_count', 0),
+                'query': step.get('query'),
+                'plan': step.get('plan'),
+            }) for sequence, step in enumerate(steps)],
+        })
+
+    @api.autovacuum
+    def _gc_report_logs(self):
+        """Drop the logs older than 30 days"""
+        self.search([('create_date', '<', fields.Datetime.subtract(
+            fields.Datetime.now(), days=30))]).unlink()
+
+
+class InventoryReportLogLine(models.Model):
+    """One statement or step of a logged inventory report run"""
+    _name = 'inventory.report.log.line'
+    _description = 'Inventory Slow Report Log Step'
+    _order = 'log_id, sequence, id'
+
+    log_id = fields.Many2one('inventory.report.log', string="Log",
+                             required=True, ondelete='cascade',
+                             help="Log of the run")
+    sequence = fields.Integer(string="Sequence", help="Order of the step")
+    kind = fields.Selection(STEP_KINDS, string="Type", help="Type of step")
+    name = fields.Char(string="Step", help="Name of the step")
+    duration = fields.Float(string="Duration (s)", help="Duration of the step")
+    row_count = fields.Integer(string="Rows",
+                               help="Rows produced by the statement")
+    query = fields.Text(string="Query", help="Statement with its parameters")
+    plan = fields.Text(string="Plan",
+                       help="EXPLAIN (ANALYZE, BUFFERS) of the statement")
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#  Cybrosys Technologies Pvt. Ltd.
+#
+#  Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#  Author: Jumana Haseen (odoo@cybrosys.com)
+#
+#  You can modify it under the terms of the GNU LESSER
+#  GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#  You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#  (LGPL v3) along with this program.
+#  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from odoo import _, api, fields, models
+from odoo.exceptions import UserError
+from .inventory_report_engine import REPORT_TYPES
+
+
+class InventoryReportRun(models.Model):
+    """Inventory report runs, registered with the PostgreSQL backend running
+    their statements so they can be cancelled"""
+    _name = 'inventory.report.run'
+    _description = 'Inventory Report Run'
+    _order = 'start_date desc, id desc'
+
+    report_type = fields.Selection(REPORT_TYPES, string="Report",
+                                   required=True, readonly=True,
+                                   help="Report being generated")
+    user_id = fields.Many2one('res.users', string="User", readonly=True,
+                              help="User who started the report")
+    backend_pid = fields.Integer(string="Backend PID", readonly=True,
+                                 help="PID of the PostgreSQL backend running"
+                                      " the report statements")
+    backend_xact_start = fields.Char(string="Backend Transaction Start",
+                                     readonly=True,
+                                     help="Exact start of the transaction"
+                                          " of the run on its backend")
+    statement_timeout = fields.Integer(string="Time Limit (s)", readonly=True,
+                                       help="Statement timeout of the run,"
+                                            " 0 for no limit")
+    start_date = fields.Datetime(string="Started On", readonly=True,
+                                 help="Start of the run")
+    end_date = fields.Datetime(string="Finished On", readonly=True,
+                               help="End of the run")
+    duration = fields.Float(string="Duration (s)", readonly=True,
+                            help="Duration of the run in seconds")
+    state = fields.Selection([
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('partial', 'Partial'),
+        ('timeout', 'Timed Out'),
+        ('cancelled', 'Cancelled'),
+        ('failed', 'Failed'),
+    ], string="Status", default='running', readonly=True,
+        help="Status of the run")
+    message = fields.Text(string="Message", readonly=True,
+                          help="Error reported to the user")
+
+    @api.model
+    def _register_run(self, report_type, uid, backend_pid, xact_start,
+                      timeout):
+        """Register a running report. It is called on the side cursor of
+        the run, committed at once so that the run is visible to other
+        sessions while the report is running."""
+        return self.sudo().create({
+            'report_type': report_type,
+            'user_id': uid,
+            'backend_pid': backend_pid,
+            'backend_xact_start': xact_start,
+            'statement_timeout': timeout,
+            'start_date': fields.Datetime.now(),
+        }).id
+
+    @api.model
+    def _close_run(self, run_id, state, message=False):
+        """Record the outcome of a run, on the side cursor of the run"""
+        run = self.sudo().browse(run_id)
+        end_date = fields.Datetime.now()
+        run.write({
+            'state': state,
+            'message': message,
+            'end_date': end_date,
+            'duration': (end_date - run.start_date).total_seconds(),
+        })
+
+    def action_cancel(self):
+        """Cancel the statement running on the backend of the runs. The
+        backend is only signalled while it is still in the transaction of
+        the run, matched on its exact start, as PostgreSQL connections are
+        reused by other requests. A run whose transaction is gone is closed
+        as failed; a run is only closed as cancelled once its statement was
+        actually cancelled."""
+        for run in self.filtered(lambda r: r.state == 'running'):
+            self.env.cr.execute("""
+                SELECT pg_cancel_backend(pid)
+                FROM pg_stat_activity
+                WHERE pid = %s
+                    AND xact_start = %s::timestamptz
+            """, (run.backend_pid, run.backend_xact_start))
+            row = self.env.cr.fetchone()
+            if not row:
+                run.sudo().write({
+                    'state': 'failed',
+                    'message': _("The run was no longer active."),
+                })
+            elif not row[0]:
+                raise UserError(_(
+                    "The %(report)s report could not be cancelled.",
+                    report=dict(REPORT_TYPES)[run.report_type]))
+            # Once signalled, the run records its cancellation itself when
+            # its statement stops, on its side cursor
+        return True
+
+    @api.autovacuum
+    def _gc_report_runs(self):
+        """Close the runs whose transaction ended without closing them, and
+        drop the runs finished more than 30 days ago"""
+        self.env.cr.execute("""
+            SELECT run.id
+            FROM inventory_report_run run
+            WHERE run.state = 'running'
+                AND NOT EXISTS (
+                    SELECT 1 FROM pg_stat_activity activity
+                    WHERE activity.pid = run.backend_pid
+                        AND activity.xact_start
+                            = run.backend_xact_start::timestamptz)
+        """)
+        self.browse([row[0] for row in self.env.cr.fetchall()]).write({
+            'state': 'failed',
+            'message': _("The run ended without being closed."),
+        })
+        self.search([
+            ('state', '!=', 'running'),
+            ('start_date', '<', fields.Datetime.subtract(
+                fields.Datetime.now(), days=30)),
+        ]).unlink()
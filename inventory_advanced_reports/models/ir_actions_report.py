@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#  Cybrosys Technologies Pvt. Ltd.
+#
+#  Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#  Author: Jumana Haseen (odoo@cybrosys.com)
+#
+#  You can modify it under the terms of the GNU LESSER
+#  GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#  You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#  (LGPL v3) along with this program.
+#  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+import os
+from concurrent.futures import ThreadPoolExecutor
+from odoo import api, models
+from odoo.tools import config
+from odoo.tools.pdf import merge_pdf
+from .inventory_report_engine import REPORT_NAMES
+
+DEFAULT_PDF_CHUNK_ROWS = 1000
+DEFAULT_PDF_WORKERS = 4
+
+
+class IrActionsReport(models.Model):
+    """Time the values and the rendering of the inventory PDF reports"""
+    _inherit = 'ir.actions.report'
+
+    def _render_qweb_pdf(self, report_ref, res_ids=None, data=None):
+        """Render the inventory reports under a report run, so their
+        statements and the rendering time are logged together"""
+        report_type = REPORT_NAMES.get(self._get_report(report_ref).report_name)
+        if not report_type:
+            return super()._render_qweb_pdf(report_ref, res_ids=res_ids,
+                                            data=data)
+        engine = self.env['inventory.report.engine']
+        chunk_rows = self._get_pdf_chunk_rows()
+        with engine._report_run(report_type, data):
+            # Tests render HTML, as in the standard rendering, unless they
+            # force the rendering of the PDF
+            if not chunk_rows or (
+                    config['test_enable']
+                    and not self.env.context.get('force_report_rendering')):
+                with engine._report_step('PDF rendering', 'render'):
+                    return super()._render_qweb_pdf(
+                        report_ref, res_ids=res_ids, data=data)
+            return self._render_inventory_pdf_chunks(
+                report_ref, res_ids, data, chunk_rows)
+
+    def _get_rendering_context(self, report, docids, data):
+        """Time the report values, the statements excluded"""
+        with self.env['inventory.report.engine']._report_step(
+                'Report values', 'python'):
+            values = super()._get_rendering_context(report, docids, data)
+        if report.report_name in REPORT_NAMES:
+            # Numbering of the rows of the chunk rendered
+            values.setdefault('row_offset', 0)
+        return values
+
+    def _get_pdf_chunk_rows(self):
+        """Return the number of rows of the chunks of the inventory PDF
+        reports, 0 to render them in one document"""
+        return int(self.env['ir.config_parameter'].sudo().get_param(
+            'inventory_advanced_reports.pdf_chunk_rows',
+            DEFAULT_PDF_CHUNK_ROWS))
+
+    def _get_pdf_workers(self):
+        """Return the number of wkhtmltopdf processes converting the chunks
+        of a report at once"""
+        workers = int(self.env['ir.config_parameter'].sudo().get_param(
+            'inventory_advanced_reports.pdf_workers', DEFAULT_PDF_WORKERS))
+        return max(1, min(workers, os.cpu_count() or 1))
+
+    def _render_inventory_pdf_chunks(self, report_ref, res_ids, data,
+                                     chunk_rows):
+        """Render an inventory report in chunks of ``chunk_rows`` rows.
+
+        The report values are computed once. Every chunk of their rows is
+        rendered to HTML and converted by a wkhtmltopdf process of its own,
+        several at a time, and the PDF documents are merged in order. This
+        keeps the HTML handed to wkhtmltopdf small on reports of many
+        thousand rows.
+        """
+        report = self._get_report(report_ref)
+        engine = self.env['inventory.report.engine']
+        renderer = self.with_context(debug=False)
+        values = renderer._get_rendering_context(report, res_ids, data)
+        rows = values.get('options') or []
+        with engine._report_step('PDF rendering', 'render'):
+            documents = []
+            for offset in range(0, max(len(rows), 1), chunk_rows):
+                html = renderer._render_template(
+                    report.report_name,
+                    dict(values, options=rows[offset:offset + chunk_rows],
+                         row_offset=offset))
+                bodies, _html_ids, header, footer, paperformat_args = \
+                    renderer._prepare_html(html, report_model=report.model)
+                documents.append({
+                    'bodies': bodies,
+                    'header': header,
+                    'footer': footer,
+                    'specific_paperformat_args': paperformat_args,
+                })
+            if len(documents) == 1:
+                return renderer._run_inventory_wkhtmltopdf(
+                    report_ref, documents[0], renderer.env), 'pdf'
+            if self.env.registry.in_test_mode():
+                # The test cursor is held by the run of this thread, the
+                # cursors of worker threads would wait for it
+                pdfs = [renderer._run_inventory_wkhtmltopdf(
+                    report_ref, document, renderer.env)
+                    for document in documents]
+            else:
+                workers = min(self._get_pdf_workers(), len(documents))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    pdfs = list(executor.map(
+                        lambda document: renderer._run_inventory_wkhtmltopdf(
+                            report_ref, document), documents))
+            return merge_pdf(pdfs), 'pdf'
+
+    def _run_inventory_wkhtmltopdf(self, report_ref, document, env=None):
+        """Convert a chunk of an inventory report with wkhtmltopdf. Without
+        ``env``, it runs in a worker thread, on a cursor of its own."""
+        if env is None:
+            with self.env.registry.cursor() as cr:
+                return self._run_inventory_wkhtmltopdf(
+                    report_ref, document,
+                    api.Environment(cr, self.env.uid, self.env.context))
+        return env['ir.actions.report']._run_wkhtmltopdf(
+            document['bodies'],
+            report_ref=report_ref,
+            header=document['header'],
+            footer=document['footer'],
+            landscape=self.env.context.get('landscape'),
+            specific_paperformat_args=document['specific_paperformat_args'],
+            set_viewport_size=self.env.context.get('set_viewport_size'),
+        )
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#  Cybrosys Technologies Pvt. Ltd.
+#
+#  Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#  Author: Jumana Haseen (odoo@cybrosys.com)
+#
+#  You can modify it under the terms of the GNU LESSER
+#  GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#  You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#  (LGPL v3) along with this program.
+#  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from odoo import models, tools
+
+PARENT_PATH_INDEX = 'product_category_report_parent_path_index'
+
+
+class ProductCategory(models.Model):
+    """Index the category subtrees matched by the report filters"""
+    _inherit = 'product.category'
+
+    def init(self):
+        """Index ``parent_path`` for the prefix patterns of the category
+        filter of the reports, which a plain index only serves under the C
+        collation. The categories are few, so the index is built at
+        install."""
+        tools.create_index(self.env.cr, PARENT_PATH_INDEX, self._table,
+                           ['parent_path text_pattern_ops'])
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#  Cybrosys Technologies Pvt. Ltd.
+#
+#  Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#  Author: Jumana Haseen (odoo@cybrosys.com)
+#
+#  You can modify it under the terms of the GNU LESSER
+#  GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#  You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#  (LGPL v3) along with this program.
+#  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from odoo import api, models
+
+# Fields of the report labels of the products
+LABEL_FIELDS = {'default_code', 'name', 'product_tmpl_id'}
+
+
+class ProductProduct(models.Model):
+    """Refresh the report labels of the products"""
+    _inherit = 'product.product'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Compute the report labels of the new products"""
+        products = super().create(vals_list)
+        self.env['inventory.report.label']._refresh_labels(products.ids)
+        return products
+
+    def write(self, vals):
+        """Refresh the report labels of the renamed products"""
+        result = super().write(vals)
+        if LABEL_FIELDS & set(vals):
+            self.env['inventory.report.label']._refresh_labels(self.ids)
+        return result
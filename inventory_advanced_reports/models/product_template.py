@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#  Cybrosys Technologies Pvt. Ltd.
+#
+#  Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#  Author: Jumana Haseen (odoo@cybrosys.com)
+#
+#  You can modify it under the terms of the GNU LESSER
+#  GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#  You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#  (LGPL v3) along with this program.
+#  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from odoo import models
+from .product_product import LABEL_FIELDS
+
+
+class ProductTemplate(models.Model):
+    """Refresh the report labels of the variants of the templates"""
+    _inherit = 'product.template'
+
+    def write(self, vals):
+        """Refresh the report labels of the variants of the renamed
+        templates"""
+        result = super().write(vals)
+        if LABEL_FIELDS & set(vals):
+            self.env['inventory.report.label']._refresh_labels(
+                self.with_context(active_test=False).product_variant_ids.ids)
+        return result
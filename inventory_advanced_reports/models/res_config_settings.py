@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#  Cybrosys Technologies Pvt. Ltd.
+#
+#  Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#  Author: Jumana Haseen (odoo@cybrosys.com)
+#
+#  You can modify it under the terms of the GNU LESSER
+#  GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#  You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#  (LGPL v3) along with this program.
+#  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from odoo import fields, models
+from .inventory_demand_engine import ADS_METHODS, DEFAULT_SMOOTHING_ALPHA
+from .inventory_report_engine import DEFAULT_REPLICA_MAX_LAG, \
+    DEFAULT_SLOW_REPORT_THRESHOLD, DEFAULT_STATEMENT_TIMEOUT
+from .ir_actions_report import DEFAULT_PDF_CHUNK_ROWS, DEFAULT_PDF_WORKERS
+
+
+class ResConfigSettings(models.TransientModel):
+    """Time limits of the inventory reports"""
+    _inherit = 'res.config.settings'
+
+    inventory_report_timeout = fields.Integer(
+        string="Default Report Time Limit",
+        default=DEFAULT_STATEMENT_TIMEOUT,
+        config_parameter='inventory_advanced_reports.statement_timeout',
+        help="Maximum duration in seconds of a statement of an inventory "
+             "report. Keep it below the real time limit of the workers. "
+             "0 disables the limit.")
+    inventory_report_timeout_fsn = fields.Integer(
+        string="FSN Report",
+        config_parameter='inventory_advanced_reports.statement_timeout_fsn',
+        help="Time limit in seconds of the FSN report, 0 for the default")
+    inventory_report_timeout_xyz = fields.Integer(
+        string="XYZ Report",
+        config_parameter='inventory_advanced_reports.statement_timeout_xyz',
+        help="Time limit in seconds of the XYZ report, 0 for the default")
+    inventory_report_timeout_fsn_xyz = fields.Integer(
+        string="FSN-XYZ Report",
+        config_parameter='inventory_advanced_reports.statement_timeout_fsn_xyz',
+        help="Time limit in seconds of the FSN-XYZ report, 0 for the default")
+    inventory_report_timeout_aging = fields.Integer(
+        string="Aging Report",
+        config_parameter='inventory_advanced_reports.statement_timeout_aging',
+        help="Time limit in seconds of the aging report, 0 for the default")
+    inventory_report_timeout_age_breakdown = fields.Integer(
+        string="Age Breakdown Report",
+        config_parameter='inventory_advanced_reports.'
+                         'statement_timeout_age_breakdown',
+        help="Time limit in seconds of the age breakdown report, 0 for the "
+             "default")
+    inventory_report_timeout_over_stock = fields.Integer(
+        string="Over Stock Report",
+        config_parameter='inventory_advanced_reports.'
+                         'statement_timeout_over_stock',
+        help="Time limit in seconds of the over stock report, 0 for the "
+             "default")
+    inventory_report_timeout_out_of_stock = fields.Integer(
+        string="Out Of Stock Report",
+        config_parameter='inventory_advanced_reports.'
+                         'statement_timeout_out_of_stock',
+        help="Time limit in seconds of the out of stock report, 0 for the "
+             "default")
+    inventory_report_timeout_stock_movement = fields.Integer(
+        string="Stock Movement Report",
+        config_parameter='inventory_advanced_reports.'
+                         'statement_timeout_stock_movement',
+        help="Time limit in seconds of the stock movement report, 0 for the "
+             "default")
+    inventory_report_timeout_analytics_pack = fields.Integer(
+        string="Analytics Pack",
+        config_parameter='inventory_advanced_reports.'
+                         'statement_timeout_analytics_pack',
+        help="Time limit in seconds of each statement of the analytics pack,"
+             " 0 for the default")
+    inventory_report_explain = fields.Boolean(
+        string="Explain Report Queries",
+        config_parameter='inventory_advanced_reports.explain_reports',
+        help="Capture EXPLAIN (ANALYZE, BUFFERS) of every report statement "
+             "in the slow report log. The statements run twice: enable it "
+             "only while investigating a slow report.")
+    inventory_report_slow_threshold = fields.Integer(
+        string="Slow Report Threshold",
+        default=DEFAULT_SLOW_REPORT_THRESHOLD,
+        config_parameter='inventory_advanced_reports.slow_report_threshold',
+        help="Reports running longer than this number of seconds are kept in "
+             "the slow report log. 0 disables the log.")
+    inventory_report_use_replica = fields.Boolean(
+        string="Run Reports on a Replica",
+        config_parameter='inventory_advanced_reports.use_replica',
+        help="Run the read-only report queries on the PostgreSQL connection "
+             "given by inventory_report_replica_dsn in the server "
+             "configuration, falling back on the main database when it is "
+             "unavailable or late.")
+    inventory_report_replica_max_lag = fields.Integer(
+        string="Maximum Replica Lag",
+        default=DEFAULT_REPLICA_MAX_LAG,
+        config_parameter='inventory_advanced_reports.replica_max_lag',
+        help="Seconds the replica may lag behind the main database before "
+             "the reports fall back on it. 0 accepts any lag.")
+    inventory_report_ads_method = fields.Selection(
+        ADS_METHODS, string="Average Daily Sales",
+        default='flat',
+        config_parameter='inventory_advanced_reports.ads_method',
+        help="Average daily sales used by the over stock and out of stock "
+             "reports to project the demand and the stock coverage")
+    inventory_report_smoothing_alpha = fields.Float(
+        string="Smoothing Factor",
+        default=DEFAULT_SMOOTHING_ALPHA,
+        config_parameter='inventory_advanced_reports.smoothing_alpha',
+        help="Weight of the most recent day in the exponentially smoothed "
+             "average daily sales, between 0.01 and 1")
+    inventory_report_pdf_chunk_rows = fields.Integer(
+        string="PDF Chunk Rows",
+        default=DEFAULT_PDF_CHUNK_ROWS,
+        config_parameter='inventory_advanced_reports.pdf_chunk_rows',
+        help="Number of rows of the chunks the PDF reports are rendered in "
+             "and merged from. 0 renders every report in one document.")
+    inventory_report_pdf_workers = fields.Integer(
+        string="PDF Workers",
+        default=DEFAULT_PDF_WORKERS,
+        config_parameter='inventory_advanced_reports.pdf_workers',
+        help="Number of wkhtmltopdf processes converting the chunks of a "
+             "report at once, at most the number of CPUs")
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#  Cybrosys Technologies Pvt. Ltd.
+#
+#  Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#  Author: Jumana Haseen (odoo@cybrosys.com)
+#
+#  You can modify it under the terms of the GNU LESSER
+#  GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#  You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#  (LGPL v3) along with this program.
+#  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from odoo import api, models
+
+
+class ResLang(models.Model):
+    """Compute the report labels of the activated languages"""
+    _inherit = 'res.lang'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Compute the report labels of the new active languages"""
+        langs = super().create(vals_list)
+        if langs.filtered('active'):
+            self.env['inventory.report.label']._refresh_labels(
+                langs=langs.filtered('active').mapped('code'))
+        return langs
+
+    def write(self, vals):
+        """Compute the report labels of the activated languages"""
+        result = super().write(vals)
+        if vals.get('active'):
+            self.env['inventory.report.label']._refresh_labels(
+                langs=self.mapped('code'))
+        return result
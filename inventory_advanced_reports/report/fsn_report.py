@@ -48,10 +48,11 @@ class FsnReport(models.AbstractModel):
         start_date = datetime.strptime(start_date, '%Y-%m-%d')
         end_date = datetime.strptime(end_date, '%Y-%m-%d')
         filtered_product_stock = []
-        query = """
+        product_join = self.env['inventory.report.engine'] \
+            ._get_product_join(product_ids, category_ids)
+        query = f"""
             SELECT
                 product_id,
-                product_code_and_name,
                 category_id,
                 category_name,
                 company_id,
@@ -89,13 +90,6 @@ class FsnReport(models.AbstractModel):
                 (SELECT
                     pp.id AS product_id,
                     pt.categ_id AS category_id,
-                    CASE
-                        WHEN pp.default_code IS NOT NULL 
-                            THEN CONCAT(pp.default_code, ' - ', 
-                            pt.name->>'en_US')
-                        ELSE
-                            pt.name->>'en_US'
-                    END AS product_code_and_name, 
                     pc.complete_name AS category_name,
                     company.id AS company_id,
                     sw.id AS warehouse_id,
@@ -135,6 +129,7 @@ class FsnReport(models.AbstractModel):
                     stock_location sld_dest ON sm.location_dest_id = sld_dest.id
                 LEFT JOIN
                     stock_location sld_src ON sm.location_id = sld_src.id
+                {product_join}
                 WHERE
                     sm.state = 'done'
                         """
@@ -145,22 +140,6 @@ class FsnReport(models.AbstractModel):
         sub_queries = []
         sub_params = []
         param_count = 0
-        if product_ids or category_ids:
-            query += " AND ("
-        if product_ids:
-            product_ids = [product_id for product_id in product_ids]
-            query += "pp.id = ANY(%s)"
-            params.append(product_ids)
-            param_count += 1
-        if product_ids and category_ids:
-            query += " OR "
-        if category_ids:
-            category_ids = [category_id for category_id in category_ids]
-            query += "pt.categ_id IN %s"
-            params.append(tuple(category_ids))
-            param_count += 1
-        if product_ids or category_ids:
-            query += ")"
         if company_ids:
             query += f" AND company.id IN %s"
             sub_params.append(tuple(company_ids))
@@ -172,17 +151,11 @@ class FsnReport(models.AbstractModel):
         if sub_queries:
             query += " AND " + " AND ".join(sub_queries)
         query += """
-                            GROUP BY pp.id, pt.categ_id,CASE
-                        WHEN pp.default_code IS NOT NULL 
-                            THEN CONCAT(pp.default_code, ' - ', 
-                            pt.name->>'en_US')
-                        ELSE
-                            pt.name->>'en_US'
-                    END, pc.complete_name, company.id, sw.id
+                            GROUP BY pp.id, pt.categ_id, pc.complete_name, company.id, sw.id
                         ) AS subquery
                         """
-        self.env.cr.execute(query, tuple(params + sub_params))
-        result_data = self.env.cr.dictfetchall()
+        result_data = self.env['inventory.report.engine']._run_query(
+            'fsn', query, tuple(params + sub_params), labels=True)
         for fsn_data in result_data:
             if fsn_data.get('fsn_classification') == str(fsn):
                 filtered_product_stock.append(fsn_data)
@@ -48,10 +48,11 @@ class FsnXyzReport(models.AbstractModel):
         start_date = fields.datetime.strptime(start_date, '%Y-%m-%d')
         end_date = fields.datetime.strptime(end_date, '%Y-%m-%d')
         filtered_product_stock = []
-        query = """
+        product_join = self.env['inventory.report.engine'] \
+            ._get_product_join(product_ids, category_ids)
+        query = f"""
                     SELECT
                         product_id,
-        product_code_and_name,
         category_id,
         category_name,
         company_id,
@@ -135,13 +136,6 @@ class FsnXyzReport(models.AbstractModel):
                 (SELECT
                     pp.id AS product_id,
                     pt.categ_id AS category_id,
-                    CASE
-                        WHEN pp.default_code IS NOT NULL 
-                            THEN CONCAT(pp.default_code, ' - ', 
-                            pt.name->>'en_US')
-                        ELSE
-                            pt.name->>'en_US'
-                    END AS product_code_and_name, 
                     pc.complete_name AS category_name,
                     company.id AS company_id,
                     sw.id AS warehouse_id,
@@ -188,6 +182,7 @@ class FsnXyzReport(models.AbstractModel):
             stock_location sld_dest ON sm.location_dest_id = sld_dest.id
         LEFT JOIN
             stock_location sld_src ON sm.location_id = sld_src.id
+        {product_join}
         WHERE
             sm.state = 'done'
             AND pp.active = TRUE
@@ -202,22 +197,6 @@ class FsnXyzReport(models.AbstractModel):
         sub_queries = []
         sub_params = []
         param_count = 0
-        if product_ids or category_ids:
-            query += " AND ("
-        if product_ids:
-            product_ids = [product_id for product_id in product_ids]
-            query += "pp.id = ANY(%s)"
-            params.append(product_ids)
-            param_count += 1
-        if product_ids and category_ids:
-            query += " OR "
-        if category_ids:
-            category_ids = [category_id for category_id in category_ids]
-            query += "pt.categ_id IN %s"
-            params.append(tuple(category_ids))
-            param_count += 1
-        if product_ids or category_ids:
-            query += ")"
         if company_ids:
             query += f" AND sm.company_id IN %s"
             sub_params.append(tuple(company_ids))
@@ -230,12 +209,12 @@ class FsnXyzReport(models.AbstractModel):
             query += " AND " + " AND ".join(sub_queries)
         query += """
                     GROUP BY
-            pp.id,pt.name, pt.categ_id,pc.complete_name, company.id, sw.id  
+            pp.id, pt.categ_id,pc.complete_name, company.id, sw.id  
     ) AS subquery
     ORDER BY stock_value DESC
                     """
-        self.env.cr.execute(query, tuple(params + sub_params))
-        result_data = self.env.cr.dictfetchall()
+        result_data = self.env['inventory.report.engine']._run_query(
+            'fsn_xyz', query, tuple(params + sub_params), labels=True)
         for fsn_data in result_data:
             if (
                     (fsn == 'All' and xyz == 'All') or
@@ -46,10 +46,11 @@ class OverStockReport(models.AbstractModel):
                 "Missing start_date or end_date in the data")
         processed_product_ids = []
         filtered_result_data = []
-        query = """
+        product_join = self.env['inventory.report.engine'] \
+            ._get_product_join(product_ids, category_ids)
+        query = f"""
                     SELECT
                             product_id,
-                            product_code_and_name,
                             category_id,
                             category_name,
                             company_id,
@@ -97,13 +98,6 @@ class OverStockReport(models.AbstractModel):
                 END AS fsn_classification
                 FROM(
                 SELECT 
-                    CASE
-                        WHEN pp.default_code IS NOT NULL 
-                            THEN CONCAT(pp.default_code, ' - ', 
-                            pt.name->>'en_US')
-                        ELSE
-                            pt.name->>'en_US'
-                    END AS product_code_and_name,
                     company.id AS company_id,
                     company.name AS company_name,
                     sm.product_id AS product_id,
@@ -175,6 +169,7 @@ class OverStockReport(models.AbstractModel):
                     FROM stock_location sld
                     INNER JOIN stock_move sm ON sld.id = sm.location_id
                 ) sld_src ON sm.id = sld_src.move_id
+                {product_join}
                 WHERE pp.active = TRUE
                         AND pt.active = TRUE
                         AND pt.type = 'product'
@@ -188,22 +183,6 @@ class OverStockReport(models.AbstractModel):
         sub_queries = []
         sub_params = []
         param_count = 0
-        if product_ids or category_ids:
-            query += " AND ("
-        if product_ids:
-            product_ids = [product_id for product_id in product_ids]
-            query += "pp.id = ANY(%s)"
-            params.append(product_ids)
-            param_count += 1
-        if product_ids and category_ids:
-            query += " OR "
-        if category_ids:
-            category_ids = [category for category in category_ids]
-            params.append(category_ids)
-            query += "(pt.categ_id = ANY(%s))"
-            param_count += 1
-        if product_ids or category_ids:
-            query += ")"
         if company_ids:
             company_ids = [company for company in company_ids]
             query += " AND (sm.company_id = ANY(%s))"
@@ -216,10 +195,19 @@ class OverStockReport(models.AbstractModel):
             param_count += 1
         if sub_queries:
             query += " AND " + " AND ".join(sub_queries)
-        query += """ GROUP BY pp.id, pt.name, pc.id, company.id, sm.product_id, 
+        query += """ GROUP BY pp.id, pc.id, company.id, sm.product_id, 
         sw.id) AS sub_query """
-        self.env.cr.execute(query, tuple(params + sub_params))
-        result_data = self.env.cr.dictfetchall()
+        result_data = self.env['inventory.report.engine']._run_query(
+            'over_stock', query, tuple(params + sub_params), labels=True)
+        self.env['inventory.demand.engine']._apply_demand(
+            result_data, 'over_stock', {
+                'start_date': start_date,
+                'end_date': end_date,
+                'product_ids': product_ids,
+                'category_ids': category_ids,
+                'company_ids': company_ids,
+                'inventory_for_next_x_days': inventory_for_next_x_days,
+            })
         for data in result_data:
             product_id = data.get('product_id')
             if product_id not in processed_product_ids:
@@ -48,13 +48,6 @@ class StockMovementReport(models.AbstractModel):
         query = """
                         SELECT
                             pp.id as product_id,
-                            CASE
-                            WHEN pp.default_code IS NOT NULL 
-                                THEN CONCAT(pp.default_code, ' - ', 
-                                pt.name->>'en_US')
-                            ELSE
-                                pt.name->>'en_US'
-                            END AS product_code_and_name, 
                             pc.complete_name AS category_name,
                             company.name AS company_name,                       
                 """
@@ -158,25 +151,17 @@ class StockMovementReport(models.AbstractModel):
                     INNER JOIN stock_warehouse sw ON sw.company_id = company.id
                     INNER JOIN product_category pc ON pc.id = pt.categ_id   
                 """
-        query += """
+        product_join = self.env['inventory.report.engine'] \
+            ._get_product_join(product_ids, category_ids)
+        query += f"""
                     LEFT JOIN stock_location sld_dest 
                     ON sm.location_dest_id = sld_dest.id
                     LEFT JOIN stock_location sld_src 
                     ON sm.location_id = sld_src.id
+                    {product_join}
                     WHERE
                 sm.state = 'done'
                         """
-        sub_queries = []
-        if product_ids:
-            product_ids = [product_id for product_id in product_ids]
-            sub_queries.append("pp.id = ANY(%s)")
-            params.append(product_ids)
-        if category_ids:
-            category_ids = [category for category in category_ids]
-            sub_queries.append("pt.categ_id = ANY(%s)")
-            params.append(category_ids)
-        if sub_queries:
-            query += " AND (" + " OR ".join(sub_queries) + ")"
         if company_ids:
             company_ids = [company for company in company_ids]
             query += " AND sm.company_id = ANY(%s)"
@@ -186,10 +171,10 @@ class StockMovementReport(models.AbstractModel):
             query += " AND sw.id = ANY(%s)"
             params.append(warehouse_ids)
         query += """
-                    GROUP BY pp.id,pt.name,pc.complete_name,company.name
+                    GROUP BY pp.id,pc.complete_name,company.name
                 """
-        self.env.cr.execute(query, params)
-        result_data = self.env.cr.dictfetchall()
+        result_data = self.env['inventory.report.engine']._run_query(
+            'stock_movement', query, params, labels=True)
         if result_data:
             return {
                 'doc_ids': docids,
@@ -38,14 +38,10 @@ class XyzReport(models.AbstractModel):
         xyz = data['xyz']
         params = []
         param_count = 0
-        query = """
+        product_join = self.env['inventory.report.engine'] \
+            ._get_product_join(product_ids, category_ids)
+        query = f"""
         SELECT 
-            CASE
-                WHEN pp.default_code IS NOT NULL 
-                    THEN CONCAT(pp.default_code, ' - ', pt.name->>'en_US')
-                ELSE
-                    pt.name->>'en_US'
-            END AS product_code_and_name,
             svl.company_id,
             company.name AS company_name,
             svl.product_id,
@@ -58,6 +54,7 @@ class XyzReport(models.AbstractModel):
         INNER JOIN product_product pp ON pp.id = svl.product_id
         INNER JOIN product_template pt ON pt.id = pp.product_tmpl_id
         INNER JOIN product_category c ON c.id = pt.categ_id
+        {product_join}
         WHERE pp.active = TRUE
             AND pt.active = TRUE
             AND pt.type = 'product'
@@ -68,39 +65,17 @@ class XyzReport(models.AbstractModel):
             query += f" AND (company.id IS NULL OR company.id = ANY(%s))"
             params.append(company_ids)
             param_count += 1
-        if product_ids or category_ids:
-            query += " AND ("
-            if product_ids:
-                product_ids = [product_id for product_id in product_ids]
-                query += f"pp.id = ANY(%s)"
-                params.append(product_ids)
-                param_count += 1
-            if product_ids and category_ids:
-                query += " OR "
-            if category_ids:
-                category_ids = [category_id for category_id in
-                                category_ids]
-                query += f"c.id = ANY(%s)"
-                params.append(category_ids)
-                param_count += 1
-            query += ")"
         query += """
                 GROUP BY 
                     svl.company_id,
             company.name,
             svl.product_id,
-            CASE
-                WHEN pp.default_code IS NOT NULL 
-                    THEN CONCAT(pp.default_code, ' - ', pt.name->>'en_US')
-                ELSE
-                    pt.name->>'en_US'
-            END,
             pt.categ_id,
             c.complete_name
             ORDER BY SUM(svl.remaining_value) DESC;
                 """
-        self.env.cr.execute(query, params)
-        result_data = self.env.cr.dictfetchall()
+        result_data = self.env['inventory.report.engine']._run_query(
+            'xyz', query, params, labels=True)
         total_current_value = 0
         cumulative_stock = 0
         filtered_stock = []
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#  Cybrosys Technologies Pvt. Ltd.
+#
+#  Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#  Author: Jumana Haseen (odoo@cybrosys.com)
+#
+#  You can modify it under the terms of the GNU LESSER
+#  GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#  You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#  (LGPL v3) along with this program.
+#  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from datetime import timedelta
+from unittest.mock import patch
+import numpy as np
+from odoo import fields
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestDemandEngine(TransactionCase):
+    """Average daily sales and stockout projection of the demand engine"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.engine = cls.env['inventory.demand.engine']
+
+    def test_compute_demand(self):
+        """The vectorised ADS variants match their day by day definition"""
+        series = np.array([
+            [float(day % 3) for day in range(10)],
+            [0.0] * 9 + [10.0],
+        ])
+        alpha = 0.3
+        demand = self.engine._compute_demand(series, alpha)
+        for position, days in enumerate(series.tolist()):
+            level = days[0]
+            for quantity in days[1:]:
+                level = alpha * quantity + (1 - alpha) * level
+            self.assertAlmostEqual(demand['flat'][position],
+                                   round(sum(days) / 10, 2))
+            self.assertAlmostEqual(demand['window_7'][position],
+                                   round(sum(days[-7:]) / 7, 2))
+            self.assertAlmostEqual(demand['smoothed'][position],
+                                   round(level, 2))
+
+    def test_project_stockout(self):
+        """The stockout day is the first day the current stock plus the
+        pending moves minus the daily sales is not positive, and the rows
+        are sorted by urgency"""
+        engine_class = type(self.engine)
+        flows = [
+            {'product_id': 1, 'warehouse_id': 1, 'day': 0, 'qty': 10},
+            {'product_id': 1, 'warehouse_id': 1, 'day': 3, 'qty': 5},
+            {'product_id': 2, 'warehouse_id': 1, 'day': 0, 'qty': 100},
+        ]
+        demand = (np.array([[1, 1], [2, 1]]),
+                  {'flat': np.array([2.0, 0.0])}, 'flat')
+        rows = [{'product_id': 2, 'warehouse_id': 1},
+                {'product_id': 1, 'warehouse_id': 1}]
+        with patch.object(engine_class, '_get_stock_flows',
+                          return_value=flows), \
+                patch.object(engine_class, '_get_demand',
+                             return_value=demand):
+            rows = self.engine._project_stockout(
+                rows, 'out_of_stock', {}, horizon=30)
+        # 10, 8, 6, then 5 received on day 3: 9, 7, 5, 3, 1, -1
+        self.assertEqual([row['product_id'] for row in rows], [1, 2])
+        self.assertEqual(rows[0]['days_until_stockout'], 8)
+        self.assertEqual(rows[0]['stockout_date'],
+                         fields.Date.context_today(self.engine)
+                         + timedelta(days=8))
+        self.assertEqual(rows[0]['warehouse_ads'], 2.0)
+        self.assertIsNone(rows[1]['days_until_stockout'])
+        self.assertIsNone(rows[1]['stockout_date'])
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#  Cybrosys Technologies Pvt. Ltd.
+#
+#  Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#  Author: Jumana Haseen (odoo@cybrosys.com)
+#
+#  You can modify it under the terms of the GNU LESSER
+#  GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#  You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#  (LGPL v3) along with this program.
+#  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from datetime import timedelta
+from odoo import fields
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestReportCache(TransactionCase):
+    """Stamps, entity tags and invalidation of the cached report results"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.Cache = cls.env['inventory.report.cache']
+        cls.product, cls.other_product = cls.env['product.product'].create([
+            {'name': 'Cached Product', 'is_storable': True},
+            {'name': 'Other Product', 'is_storable': True},
+        ])
+        cls.warehouse = cls.env['stock.warehouse'].search(
+            [('company_id', '=', cls.env.company.id)], limit=1)
+        today = fields.Date.today()
+        cls.filters = {
+            'start_date': today - timedelta(days=30),
+            'end_date': today,
+            'product_ids': cls.product.ids,
+            'category_ids': [],
+            'company_ids': cls.env.company.ids,
+            'warehouse_ids': [],
+            'inventory_for_next_x_days': 0,
+            'age_breakdown_days': 30,
+        }
+
+    def setUp(self):
+        super().setUp()
+        # The report runs of the cached results commit on the test cursor
+        self.registry.enter_test_mode(self.cr)
+        self.addCleanup(self.registry.leave_test_mode)
+
+    def _backdate(self, records):
+        """Move the last write of records to yesterday, as if they were
+        written by an earlier transaction"""
+        self.env.flush_all()
+        self.env.cr.execute(f"""
+            UPDATE {records._table}
+            SET write_date = write_date - interval '1 day'
+            WHERE id = ANY(%s)
+        """, (records.ids,))
+        records.invalidate_recordset(['write_date'])
+
+    def _create_move(self, product):
+        return self.env['stock.move'].create({
+            'name': product.name,
+            'product_id': product.id,
+            'product_uom_qty': 1,
+            'product_uom': product.uom_id.id,
+            'location_id': self.warehouse.lot_stock_id.id,
+            'location_dest_id': self.env.ref(
+                'stock.stock_location_customers').id,
+        })
+
+    def test_stamp_follows_the_data_of_the_scope(self):
+        """The stamp changes with the moves and products of the filters
+        only"""
+        self._backdate(self.product)
+        self._backdate(self.product.product_tmpl_id)
+        stamp = self.Cache._get_stock_stamp(self.filters)
+        self.assertEqual(self.Cache._get_stock_stamp(self.filters), stamp)
+        self._create_move(self.other_product)
+        self.other_product.name = 'Other Product, renamed'
+        self.assertEqual(self.Cache._get_stock_stamp(self.filters), stamp)
+        move = self._create_move(self.product)
+        moved = self.Cache._get_stock_stamp(self.filters)
+        self.assertNotEqual(moved, stamp)
+        self._backdate(move)
+        moved = self.Cache._get_stock_stamp(self.filters)
+        move.product_uom_qty = 2
+        written = self.Cache._get_stock_stamp(self.filters)
+        self.assertNotEqual(written, moved)
+        move.unlink()
+        self.assertNotEqual(self.Cache._get_stock_stamp(self.filters),
+                            written)
+        self.assertEqual(self.Cache._get_stock_stamp(self.filters), stamp)
+        self.product.name = 'Cached Product, renamed'
+        self.assertNotEqual(self.Cache._get_stock_stamp(self.filters),
+                            stamp)
+
+    def test_etag_and_result_invalidation(self):
+        """A result and its entity tag are reused until the stock of the
+        report changes"""
+        etag = self.Cache._get_etag('fsn', self.filters)
+        cache = self.Cache._get_result('fsn', self.filters)
+        self.assertEqual(self.Cache._get_etag('fsn', self.filters), etag)
+        self.assertEqual(self.Cache._get_result('fsn', self.filters), cache)
+        self.assertNotEqual(
+            self.Cache._get_etag('xyz', self.filters), etag)
+        self._create_move(self.product)
+        self.assertNotEqual(self.Cache._get_etag('fsn', self.filters), etag)
+        recomputed = self.Cache._get_result('fsn', self.filters)
+        self.assertNotEqual(recomputed, cache)
+        self.assertFalse(cache.exists())
+
+    def test_fsn_xyz_result(self):
+        """The FSN-XYZ report is cached with both classifications"""
+        cache = self.Cache._get_result('fsn_xyz', self.filters)
+        columns = cache._read_page()['columns']
+        for column in ('warehouse_id', 'fsn_classification',
+                       'xyz_classification', 'combined_classification'):
+            self.assertIn(column, columns)
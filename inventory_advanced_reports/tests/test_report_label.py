@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#  Cybrosys Technologies Pvt. Ltd.
+#
+#  Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#  Author: Jumana Haseen (odoo@cybrosys.com)
+#
+#  You can modify it under the terms of the GNU LESSER
+#  GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#  You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#  (LGPL v3) along with this program.
+#  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestReportLabel(TransactionCase):
+    """Product labels of the reports kept in sync with the products"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.Label = cls.env['inventory.report.label'].with_context(
+            lang='en_US')
+        cls.product = cls.env['product.product'].create({
+            'name': 'Label Product',
+            'default_code': 'LBL',
+        })
+
+    def _get_label(self):
+        return self.Label._get_labels(self.product.ids)[self.product.id]
+
+    def test_label_of_new_product(self):
+        """A new product gets its label at once"""
+        self.assertEqual(self._get_label(), 'LBL - Label Product')
+
+    def test_label_refreshed_on_rename(self):
+        """Renaming a product, its template or its code refreshes its label
+        in the same transaction"""
+        self.product.name = 'Renamed Product'
+        self.assertEqual(self._get_label(), 'LBL - Renamed Product')
+        self.product.product_tmpl_id.name = 'Renamed Template'
+        self.assertEqual(self._get_label(), 'LBL - Renamed Template')
+        self.product.default_code = False
+        self.assertEqual(self._get_label(), 'Renamed Template')
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#  Cybrosys Technologies Pvt. Ltd.
+#
+#  Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#  Author: Jumana Haseen (odoo@cybrosys.com)
+#
+#  You can modify it under the terms of the GNU LESSER
+#  GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#  You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#  (LGPL v3) along with this program.
+#  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+import io
+from unittest.mock import patch
+from odoo.tests import TransactionCase, tagged
+from odoo.tools.pdf import PdfFileReader
+
+XYZ_REPORT = 'inventory_advanced_reports.report_inventory_xyz'
+
+
+@tagged('post_install', '-at_install')
+class TestReportPdf(TransactionCase):
+    """Rendering of the inventory PDF reports in chunks"""
+
+    def setUp(self):
+        super().setUp()
+        if self.env['ir.actions.report'].get_wkhtmltopdf_state() != 'ok':
+            self.skipTest("wkhtmltopdf is not available")
+        # The report runs of the renderings commit on the test cursor
+        self.registry.enter_test_mode(self.cr)
+        self.addCleanup(self.registry.leave_test_mode)
+        self.env['ir.config_parameter'].sudo().set_param(
+            'inventory_advanced_reports.pdf_chunk_rows', 2)
+
+    def _get_report_values(self, docids, data=None):
+        return {
+            'doc_ids': docids,
+            'doc_model': f'report.{XYZ_REPORT}',
+            'data': data,
+            'options': [{
+                'product_code_and_name': f'Product {index}',
+                'category_name': 'All',
+                'current_stock': 1.0,
+                'stock_value': 10.0,
+                'stock_percentage': 20.0,
+                'cumulative_stock_percentage': 20.0 * (index + 1),
+                'xyz_classification': 'X',
+            } for index in range(5)],
+        }
+
+    def test_chunks_merged(self):
+        """A report of more rows than a chunk is rendered in chunks of a
+        page each, merged in one document"""
+        report_model = type(self.env[f'report.{XYZ_REPORT}'])
+        with patch.object(report_model, '_get_report_values',
+                          self._get_report_values):
+            pdf, report_format = self.env['ir.actions.report'] \
+                .with_context(force_report_rendering=True) \
+                ._render_qweb_pdf(XYZ_REPORT, data={'xyz': 'All'})
+        self.assertEqual(report_format, 'pdf')
+        self.assertEqual(len(PdfFileReader(io.BytesIO(pdf)).pages), 3)
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#  Cybrosys Technologies Pvt. Ltd.
+#
+#  Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#  Author: Jumana Haseen (odoo@cybrosys.com)
+#
+#  You can modify it under the terms of the GNU LESSER
+#  GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#  You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#  (LGPL v3) along with this program.
+#  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from unittest.mock import patch
+
+import psycopg2
+
+from odoo import fields
+from odoo.tests import TransactionCase, tagged
+from odoo.tools import mute_logger
+from ..models.inventory_report_engine import ReportCancelled, ReportTimeout
+
+
+@tagged('post_install', '-at_install')
+class TestReportRun(TransactionCase):
+    """Statement timeouts, cancellation and bookkeeping of the report runs"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.engine = cls.env['inventory.report.engine']
+        cls.Run = cls.env['inventory.report.run']
+        cls.env['ir.config_parameter'].set_param(
+            'inventory_advanced_reports.statement_timeout', 1)
+        cls.env['ir.config_parameter'].set_param(
+            'inventory_advanced_reports.slow_report_threshold', 0)
+
+    def setUp(self):
+        super().setUp()
+        # The side cursor of the runs joins the transaction of the test, so
+        # that the runs it commits are seen by the test and rolled back
+        # with it
+        self.registry.enter_test_mode(self.cr)
+        self.addCleanup(self.registry.leave_test_mode)
+
+    def _last_run(self):
+        return self.Run.search([], limit=1)
+
+    def test_run_done(self):
+        """A run is registered with the exact start of its transaction and
+        closed as done"""
+        self.env.cr.execute("""
+            SELECT xact_start::text FROM pg_stat_activity
+            WHERE pid = pg_backend_pid()
+        """)
+        xact_start = self.env.cr.fetchone()[0]
+        with self.engine._report_run('fsn'):
+            self.engine._execute("SELECT 1")
+        run = self._last_run()
+        self.assertEqual(run.state, 'done')
+        self.assertEqual(run.report_type, 'fsn')
+        self.assertEqual(run.backend_xact_start, xact_start)
+
+    def test_statement_savepoint_released(self):
+        """The statements return their rows or row count and release their
+        savepoint"""
+        with self.engine._report_run('fsn'):
+            self.assertEqual(self.engine._execute(
+                "SELECT generate_series(1, 3)"), 3)
+            rows = self.engine._fetch("SELECT 1 AS value")
+        self.assertEqual(rows, [{'value': 1}])
+        error = psycopg2.errors.InvalidSavepointSpecification
+        with self.assertRaises(error), mute_logger('odoo.sql_db'), \
+                self.env.cr.savepoint():
+            self.env.cr.execute(
+                'RELEASE SAVEPOINT "inventory_report_statement"')
+
+    def test_timeout(self):
+        """A statement over the time limit is rolled back on its own, the
+        run is closed as timed out and the previous limit is restored"""
+        self.env.cr.execute("SHOW statement_timeout")
+        previous = self.env.cr.fetchone()[0]
+        with self.assertRaises(ReportTimeout):
+            with self.engine._report_run('fsn'):
+                self.engine._execute("SELECT pg_sleep(3)")
+        self.assertEqual(self._last_run().state, 'timeout')
+        self.env.cr.execute("SHOW statement_timeout")
+        self.assertEqual(self.env.cr.fetchone()[0], previous)
+        # The transaction is still usable
+        self.env.cr.execute("SELECT 1")
+
+    def test_timeout_logged(self):
+        """A run stopped by its time limit leaves its steps in the slow
+        report log"""
+        self.env['ir.config_parameter'].set_param(
+            'inventory_advanced_reports.slow_report_threshold', 0.5)
+        with self.assertRaises(ReportTimeout):
+            with self.engine._report_run('fsn', {'warehouse_ids': []}):
+                self.engine._execute("SELECT 1")
+                self.engine._execute("SELECT pg_sleep(3)")
+        run = self._last_run()
+        log = self.env['inventory.report.log'].search(
+            [('run_id', '=', run.id)])
+        self.assertEqual(len(log), 1)
+        self.assertEqual(log.state, 'timeout')
+        self.assertGreaterEqual(log.duration, 1)
+        self.assertEqual(log.query_count, 1)
+
+    def test_failed_run(self):
+        """A run failing on a Python error is closed as failed and the
+        previous limit is restored"""
+        self.env.cr.execute("SHOW statement_timeout")
+        previous = self.env.cr.fetchone()[0]
+        with self.assertRaises(ZeroDivisionError):
+            with self.engine._report_run('aging'):
+                self.engine._execute("SELECT 1")
+                1 / 0
+        run = self._last_run()
+        self.assertEqual(run.state, 'failed')
+        self.assertEqual(run.message, 'division by zero')
+        self.env.cr.execute("SHOW statement_timeout")
+        self.assertEqual(self.env.cr.fetchone()[0], previous)
+
+    def test_cancel(self):
+        """A statement cancelled on its backend closes the run as
+        cancelled"""
+        with self.assertRaises(ReportCancelled):
+            with self.engine._report_run('xyz'):
+                self.engine._execute(
+                    "SELECT pg_cancel_backend(pg_backend_pid()),"
+                    " pg_sleep(0.5)")
+        self.assertEqual(self._last_run().state, 'cancelled')
+
+    def test_wizard_single_run(self):
+        """All the statements of a report wizard run under a single run"""
+        wizard = self.env['inventory.xyz.report'].create({})
+
+        def get_report_data(wizard):
+            return {'data': [
+                row for statement in range(3)
+                for row in wizard.env['inventory.report.engine']._run_query(
+                    'xyz', "SELECT %s AS statement", [statement])]}
+
+        runs = self.Run.search_count([])
+        with patch.object(type(wizard), 'get_report_data', get_report_data):
+            data = wizard._get_run_report_data()
+        self.assertEqual(len(data['data']), 3)
+        self.assertEqual(self.Run.search_count([]), runs + 1)
+        self.assertEqual(self._last_run().report_type, 'xyz')
+
+    def test_partial(self):
+        """A run going on without a part of its result is partial"""
+        with self.engine._report_run('analytics_pack'):
+            self.engine._set_run_partial('XYZ: stopped')
+        run = self._last_run()
+        self.assertEqual(run.state, 'partial')
+        self.assertEqual(run.message, 'XYZ: stopped')
+
+    def test_cancel_inactive_run(self):
+        """A run whose transaction is gone is not signalled but closed as
+        failed"""
+        self.env.cr.execute("SELECT pg_backend_pid()")
+        run = self.Run.create({
+            'report_type': 'aging',
+            'backend_pid': self.env.cr.fetchone()[0],
+            'backend_xact_start': '2000-01-01 00:00:00.123456+00',
+            'start_date': fields.Datetime.now(),
+        })
+        run.action_cancel()
+        self.assertEqual(run.state, 'failed')
+
+    def test_gc_drops_old_runs(self):
+        """The autovacuum drops the runs finished more than 30 days ago"""
+        old, recent = self.Run.create([{
+            'report_type': 'aging',
+            'state': 'done',
+            'start_date': start_date,
+        } for start_date in ('2000-01-01 00:00:00', fields.Datetime.now())])
+        self.Run._gc_report_runs()
+        self.assertFalse(old.exists())
+        self.assertTrue(recent.exists())
+
+    def test_gc_closes_orphan_runs(self):
+        """The autovacuum closes the runs left running by a transaction
+        that ended without closing them, and keeps the live ones"""
+        orphan = self.Run.create({
+            'report_type': 'aging',
+            'backend_pid': 0,
+            'backend_xact_start': '2000-01-01 00:00:00+00',
+            'start_date': '2099-01-01 00:00:00',
+        })
+        self.env.cr.execute("""
+            SELECT pid, xact_start::text FROM pg_stat_activity
+            WHERE pid = pg_backend_pid()
+        """)
+        pid, xact_start = self.env.cr.fetchone()
+        live = self.Run.create({
+            'report_type': 'aging',
+            'backend_pid': pid,
+            'backend_xact_start': xact_start,
+            'start_date': '2099-01-01 00:00:00',
+        })
+        self.Run._gc_report_runs()
+        self.assertEqual(orphan.state, 'failed')
+        self.assertEqual(live.state, 'running')
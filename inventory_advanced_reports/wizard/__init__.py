@@ -20,6 +20,7 @@
 #
 ###############################################################################
 from . import inventory_age_breakdown_report
+from . import inventory_analytics_pack_report
 from . import inventory_aging_data_report
 from . import inventory_aging_report
 from . import inventory_fsn_data_report
@@ -30,6 +31,7 @@ from . import inventory_out_of_stock_data_report
 from . import inventory_out_of_stock_report
 from . import inventory_over_stock_data_report
 from . import inventory_over_stock_report
+from . import inventory_report_comparison
 from . import inventory_stock_movement_report
 from . import inventory_xyz_data_report
 from . import inventory_xyz_report
@@ -34,6 +34,7 @@ class InventoryAgeBreakdownReport(models.TransientModel):
     """This model is for creating a wizard for inventory age breakdown report"""
     _name = "inventory.age.breakdown.report"
     _description = "Inventory Age Breakdown Report"
+    _inherit = 'inventory.report.definition.mixin'
 
     product_ids = fields.Many2many(
         "product.product", string="Products",
@@ -52,123 +53,12 @@ class InventoryAgeBreakdownReport(models.TransientModel):
 
     def get_report_data(self):
         """Function to return necessary data for printing"""
-        params = []
-        param_count = 0
-        query = """
-            SELECT 
-            CASE
-                WHEN pp.default_code IS NOT NULL 
-                    THEN CONCAT(pp.default_code, ' - ', pt.name->>'en_US')
-                ELSE
-                    pt.name->>'en_US'
-            END AS product_code_and_name, 
-            c.complete_name AS category_name,
-            c.id AS category_id,
-            pp.id AS product_id,
-            company.id AS company_id,
-            company.name AS company_name,
-            COALESCE(SUM(svl.remaining_qty), 0) AS qty_available,
-            SUM(svl.remaining_value) AS stock_value,
-            SUM(CASE
-                WHEN age.days_between >= 1 AND age.days_between <= %s 
-                THEN svl.remaining_qty
-                ELSE 0
-            END) AS "age_breakdown_qty_1",
-            SUM(CASE
-                WHEN age.days_between >= %s+1 AND age.days_between <= %s*2 
-                THEN svl.remaining_qty
-                ELSE 0
-            END) AS "age_breakdown_qty_2",
-            SUM(CASE
-                WHEN age.days_between >=  (%s*2)+1 AND age.days_between <= %s*3 
-                THEN svl.remaining_qty
-                ELSE 0
-            END) AS "age_breakdown_qty_3",
-            SUM(CASE
-                WHEN age.days_between >= (%s*3)+1 AND age.days_between <= %s*4 
-                THEN svl.remaining_qty
-                ELSE 0
-            END) AS "age_breakdown_qty_4",
-            SUM(CASE
-                WHEN age.days_between >= (%s*4)+1 THEN svl.remaining_qty
-                ELSE 0
-            END) AS "age_breakdown_qty_5",
-            SUM(CASE
-                WHEN age.days_between >= 1 AND age.days_between <= %s 
-                THEN svl.remaining_value
-                ELSE 0
-            END) AS "age_breakdown_value_1",
-            SUM(CASE
-                WHEN age.days_between >= %s+1 AND age.days_between <= %s*2 
-                THEN svl.remaining_value
-                ELSE 0
-            END) AS "age_breakdown_value_2",
-            SUM(CASE
-                WHEN age.days_between >= (%s*2)+1 AND age.days_between <= %s*3 
-                THEN svl.remaining_value
-                ELSE 0
-            END) AS "age_breakdown_value_3",
-            SUM(CASE
-                WHEN age.days_between >= (%s*3)+1 AND age.days_between <= %s*4 
-                THEN svl.remaining_value
-                ELSE 0
-            END) AS "age_breakdown_value_4",
-            SUM(CASE
-                WHEN age.days_between >= (%s*4)+1 THEN svl.remaining_value
-                ELSE 0
-            END) AS "age_breakdown_value_5"
-            FROM product_product pp
-            INNER JOIN product_template pt ON pp.product_tmpl_id = pt.id
-            INNER JOIN product_category c ON pt.categ_id = c.id
-            LEFT JOIN stock_move sm ON sm.product_id = pp.id
-            LEFT JOIN stock_picking_type spt ON sm.picking_type_id = spt.id
-            LEFT JOIN res_company company ON sm.company_id = company.id
-            LEFT JOIN LATERAL (
-                SELECT EXTRACT(day FROM CURRENT_DATE - sm.date) AS days_between
-            ) AS age ON true
-            INNER JOIN stock_valuation_layer svl ON svl.stock_move_id = sm.id
-            WHERE pt.type = 'product'
-                AND sm.state = 'done'
-                AND svl.remaining_value IS NOT NULL
-                """
-        params.extend([self.age_breakdown_days] * 16)
-        if self.product_ids or self.category_ids:
-            query += " AND ("
-        if self.product_ids:
-            product_ids = [product_id.id for product_id in self.product_ids]
-            query += "pp.id = ANY(%s)"
-            params.append(product_ids)
-            param_count += 1
-        if self.product_ids and self.category_ids:
-            query += " OR "
-        if self.category_ids:
-            category_ids = [category.id for category in self.category_ids]
-            params.append(category_ids)
-            query += "(pt.categ_id = ANY(%s))"
-            param_count += 1
-        if self.product_ids or self.category_ids:
-            query += ")"
-        if self.company_ids:
-            company_ids = [company.id for company in self.company_ids]
-            query += " AND (sm.company_id = ANY(%s))"
-            params.append(company_ids)
-            param_count += 1
-        query += """
-            GROUP BY
-                CASE
-                    WHEN pp.default_code IS NOT NULL 
-                        THEN CONCAT(pp.default_code, ' - ', pt.name->>'en_US')
-                    ELSE
-                        pt.name->>'en_US'
-                END, 
-                c.complete_name,
-                company.id, 
-                c.id,
-                company.name,
-                pp.id;
-        """
-        self.env.cr.execute(query, params)
-        result_data = self.env.cr.dictfetchall()
+        result_data = self.env['inventory.report.engine']._get_layer_ages({
+            'product_ids': self.product_ids.ids,
+            'category_ids': self.category_ids.ids,
+            'company_ids': self.company_ids.ids,
+            'age_breakdown_days': self.age_breakdown_days,
+        })
         main_header = self.age_breakdown_days
         if result_data:
             data = {
@@ -185,7 +75,7 @@ class InventoryAgeBreakdownReport(models.TransientModel):
         age_breakdown2 = main_header * 2
         age_breakdown3 = main_header * 3
         age_breakdown4 = main_header * 4
-        return ['1-' + str(age_breakdown1),
+        return ['0-' + str(age_breakdown1),
                 str(age_breakdown1 + 1) + '-' + str(age_breakdown2),
                 str(age_breakdown2 + 1) + '-' + str(age_breakdown3),
                 str(age_breakdown3 + 1) + '-' + str(age_breakdown4),
@@ -208,7 +98,7 @@ class InventoryAgeBreakdownReport(models.TransientModel):
 
     def action_excel(self):
         """This function is for printing excel report"""
-        data = self.get_report_data()
+        data = self._get_run_report_data()
         return {
             'type': 'ir.actions.report',
             'data': {'model': 'inventory.age.breakdown.report',
@@ -34,6 +34,7 @@ class InventoryAgingReport(models.TransientModel):
     """This model is for creating a wizard for inventory aging report"""
     _name = "inventory.aging.report"
     _description = "Inventory Aging Report"
+    _inherit = 'inventory.report.definition.mixin'
 
     product_ids = fields.Many2many(
         "product.product", string="Products",
@@ -49,127 +50,11 @@ class InventoryAgingReport(models.TransientModel):
 
     def get_report_data(self):
         """Function for returning datas for printing"""
-        params = []
-        param_count = 0
-        query = """
-            SELECT 
-                CASE
-                    WHEN pp.default_code IS NOT NULL 
-                        THEN CONCAT(pp.default_code, ' - ', pt.name->>'en_US')
-                    ELSE
-                        pt.name->>'en_US'
-                END AS product_code_and_name, 
-                c.complete_name AS category_name,
-                c.id AS category_id,
-                pp.id AS product_id,
-                company.id AS company_id,
-                company.name AS company_name,
-                 COALESCE(SUM(svl.remaining_qty), 0) AS qty_available,
-                (SELECT SUM(sm_inner.product_uom_qty)
-                 FROM stock_move sm_inner
-                 INNER JOIN res_company company_inner 
-                 ON sm_inner.company_id = company_inner.id
-                 WHERE sm_inner.product_id = pp.id
-                 AND sm_inner.state = 'done'
-                 AND sm_inner.date < (
-                     SELECT MAX(sm_inner2.date)
-                     FROM stock_move sm_inner2
-                     WHERE sm_inner2.product_id = pp.id
-                     AND sm_inner2.state = 'done'
-                     AND company_inner.id = sm_inner2.company_id
-                 )
-                ) AS prev_qty_available,
-                (
-            SELECT MIN(sm_inner.date)
-            FROM stock_move sm_inner
-            WHERE sm_inner.product_id = pp.id
-            AND sm_inner.state = 'done'
-            AND (company.id IS NULL OR company.id = sm_inner.company_id)
-        ) AS receipt_date
-            FROM product_product pp
-            INNER JOIN product_template pt ON pp.product_tmpl_id = pt.id
-            INNER JOIN product_category c ON pt.categ_id = c.id
-            LEFT JOIN stock_move sm ON sm.product_id = pp.id
-            LEFT JOIN stock_picking_type spt ON sm.picking_type_id = spt.id
-            LEFT JOIN res_company company ON sm.company_id = company.id
-            INNER JOIN stock_valuation_layer svl ON svl.stock_move_id = sm.id
-            WHERE pt.type = 'product'
-            AND sm.state = 'done'
-                            """
-        if self.product_ids or self.category_ids:
-            query += " AND ("
-        if self.product_ids:
-            product_ids = [product_id.id for product_id in self.product_ids]
-            query += "pp.id = ANY(%s)"
-            params.append(product_ids)
-            param_count += 1
-        if self.product_ids and self.category_ids:
-            query += " OR "
-        if self.category_ids:
-            category_ids = [category.id for category in self.category_ids]
-            params.append(category_ids)
-            query += "(pt.categ_id = ANY(%s))"
-            param_count += 1
-        if self.product_ids or self.category_ids:
-            query += ")"
-        if self.company_ids:
-            company_ids = [company.id for company in self.company_ids]
-            query += " AND (sm.company_id = ANY(%s))"
-            params.append(company_ids)
-            param_count += 1
-        query += """
-            GROUP BY 
-                CASE
-                    WHEN pp.default_code IS NOT NULL 
-                        THEN CONCAT(pp.default_code, ' - ', pt.name->>'en_US')
-                    ELSE
-                        pt.name->>'en_US'
-                END, 
-                c.complete_name,
-                company.id, 
-                c.id,
-                company.name,
-                pp.id;
-        """
-        self.env.cr.execute(query, params)
-        result_data = self.env.cr.dictfetchall()
-        today = fields.datetime.now().date()
-        for row in result_data:
-            receipt_date = row.get('receipt_date')
-            if receipt_date:
-                receipt_date = receipt_date.date()  # Ensure it's a date object
-                row['days_since_receipt'] = (today - receipt_date).days
-            product = self.env['product.product'].browse(row.get('product_id'))
-            standard_price = product.standard_price
-            current_stock = row.get('qty_available')
-            prev_stock = row.get('prev_qty_available')
-            if prev_stock is None:
-                prev_stock = current_stock
-                row['prev_qty_available'] = current_stock
-            if standard_price and current_stock:
-                row['current_value'] = current_stock * standard_price
-            else:
-                row[
-                    'current_value'] = 0
-            row[
-                'prev_value'] = prev_stock * standard_price \
-                if prev_stock is not None else 0
-            total_current_stock = sum(
-                item.get('qty_available') for item in result_data if
-                item.get('qty_available') is not None)
-            if total_current_stock:
-                stock_percentage = (current_stock / total_current_stock) * 100
-            else:
-                stock_percentage = 0.0
-            row['stock_percentage'] = round(stock_percentage, 2)
-            current_value = row.get('current_value')
-            total_value = sum(
-                item.get('current_value', 0) for item in result_data)
-            if total_value:
-                stock_value_percentage = (current_value / total_value) * 100
-            else:
-                stock_value_percentage = 0.0
-            row['stock_value_percentage'] = round(stock_value_percentage, 2)
+        result_data = self.env['inventory.report.engine']._get_aging_data({
+            'product_ids': self.product_ids.ids,
+            'category_ids': self.category_ids.ids,
+            'company_ids': self.company_ids.ids,
+        })
         if result_data:
             data = {
                 'result_data': result_data,
@@ -194,7 +79,7 @@ class InventoryAgingReport(models.TransientModel):
 
     def action_excel(self):
         """This function is for printing excel report"""
-        data = self.get_report_data()
+        data = self._get_run_report_data()
         return {
             'type': 'ir.actions.report',
             'data': {'model': 'inventory.aging.report',
@@ -256,7 +141,7 @@ class InventoryAgingReport(models.TransientModel):
 
     def display_report_views(self):
         """Function for viewing tree and graph view"""
-        data = self.get_report_data()
+        data = self._get_run_report_data()
         for data_values in data.get('result_data'):
             data_values['data_id'] = self.id
             self.generate_data(data_values)
@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#  Cybrosys Technologies Pvt. Ltd.
+#
+#  Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#  Author: Jumana Haseen (odoo@cybrosys.com)
+#
+#  You can modify it under the terms of the GNU LESSER
+#  GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#  You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#  (LGPL v3) along with this program.
+#  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+import json
+import shutil
+import tempfile
+from odoo import fields, models
+from odoo.exceptions import ValidationError
+from ..models.inventory_report_engine import ReportTimeout
+
+try:
+    from odoo.tools.misc import xlsxwriter
+except ImportError:
+    import xlsxwriter
+
+PACK_SHEETS = {
+    'fsn': ('FSN', [
+        ('Product', 'product_code_and_name', 27),
+        ('Category', 'category_name', 24),
+        ('Company', 'company_name', 18),
+        ('Opening Stock', 'opening_stock', 13),
+        ('Closing Stock', 'closing_stock', 13),
+        ('Average Stock', 'average_stock', 13),
+        ('Sales', 'sales', 13),
+        ('Turnover Ratio', 'turnover_ratio', 13),
+        ('FSN Classification', 'fsn_classification', 18),
+    ]),
+    'xyz': ('XYZ', [
+        ('Product', 'product_code_and_name', 27),
+        ('Category', 'category_name', 24),
+        ('Company', 'company_name', 18),
+        ('Current Stock', 'stock_qty', 13),
+        ('Stock Value', 'stock_value', 13),
+        ('Stock Value(%)', 'stock_percentage', 13),
+        ('Cumulative Value(%)', 'cumulative_stock_percentage', 18),
+        ('XYZ Classification', 'xyz_classification', 18),
+    ]),
+    'aging': ('Aging', [
+        ('Product', 'product_code_and_name', 27),
+        ('Category', 'category_name', 24),
+        ('Company', 'company_name', 18),
+        ('Current Stock', 'qty_available', 13),
+        ('Current Value', 'current_value', 13),
+        ('Stock Quant(%)', 'stock_percentage', 13),
+        ('Stock Value(%)', 'stock_value_percentage', 13),
+        ('Oldest Stock Age', 'days_since_receipt', 15),
+        ('Oldest Stock', 'prev_qty_available', 13),
+        ('Oldest Stock Value', 'prev_value', 15),
+    ]),
+    'age_breakdown': ('Age Breakdown', [
+        ('Product', 'product_code_and_name', 27),
+        ('Category', 'category_name', 24),
+        ('Company', 'company_name', 18),
+        ('Current Stock', 'qty_available', 13),
+        ('Stock Value', 'stock_value', 13),
+    ]),
+    'over_stock': ('Over Stock', [
+        ('Product', 'product_code_and_name', 27),
+        ('Category', 'category_name', 24),
+        ('Current Stock', 'current_stock', 10),
+        ('Incoming', 'incoming_quantity', 10),
+        ('Outgoing', 'outgoing_quantity', 10),
+        ('Virtual Stock', 'virtual_stock', 10),
+        ('Sales', 'sales', 10),
+        ('ADS', 'ads', 10),
+        ('Demanded QTY', 'demanded_quantity', 15),
+        ('Coverage Days', 'in_stock_days', 15),
+        ('Over Stock QTY', 'over_stock_qty', 15),
+        ('Over Stock QTY(%)', 'over_stock_qty_percentage', 15),
+        ('Over Stock Value', 'over_stock_value', 15),
+        ('Over Stock Value(%)', 'over_stock_value_percentage', 15),
+        ('Turnover Ratio', 'turnover_ratio', 15),
+        ('FSN Classification', 'fsn_classification', 18),
+        ('Last PO Date', 'po_date', 13),
+        ('Last PO QTY', 'po_qty', 13),
+        ('Last PO Price', 'po_price_total', 13),
+        ('Currency', 'po_currency', 13),
+        ('Partner', 'po_partner', 20),
+    ]),
+    'out_of_stock': ('Out Of Stock', [
+        ('Product', 'product_code_and_name', 27),
+        ('Category', 'category_name', 24),
+        ('Current Stock', 'current_stock', 10),
+        ('Incoming', 'incoming_quantity', 10),
+        ('Outgoing', 'outgoing_quantity', 10),
+        ('Virtual Stock', 'virtual_stock', 10),
+        ('Sales', 'sales', 10),
+        ('ADS', 'ads', 10),
+        ('Demanded QTY', 'demanded_quantity', 15),
+        ('In Stock Days', 'in_stock_days', 15),
+        ('Out Of Stock Days', 'out_of_stock_days', 15),
+        ('Out Of Stock Ratio', 'out_of_stock_ratio', 15),
+        ('Cost Price', 'cost', 15),
+        ('Out Of Stock QTY', 'out_of_stock_qty', 17),
+        ('Out Of Stock QTY(%)', 'out_of_stock_qty_percentage', 17),
+        ('Out Of Stock Value', 'out_of_stock_value', 15),
+        ('Turnover Ratio', 'turnover_ratio', 15),
+        ('FSN Classification', 'fsn_classification', 18),
+    ]),
+}
+
+
+class InventoryAnalyticsPackReport(models.TransientModel):
+    """This model is for creating a wizard exporting several inventory
+    reports of the same filters as the sheets of one workbook."""
+    _name = 'inventory.analytics.pack.report'
+    _description = 'Inventory Analytics Pack'
+    _inherit = 'inventory.report.definition.mixin'
+
+    start_date = fields.Date('Start Date', required=True,
+                             help="Start date to analyse the report")
+    end_date = fields.Date('End Date', required=True,
+                           help="End date to analyse the report")
+    warehouse_ids = fields.Many2many(
+        "stock.warehouse", string="Warehouses",
+        help="Select the warehouses to generate the report")
+    product_ids = fields.Many2many(
+        "product.product", string="Products",
+        help="Select the products you want to generate the report for")
+    category_ids = fields.Many2many(
+        "product.category", string="Product categories",
+        help="Select the product categories you want to generate the report for"
+    )
+    company_ids = fields.Many2many(
+        "res.company", string="Company",
+        default=lambda self: self.env.company,
+        help="Select the companies you want to generate the report for")
+    inventory_for_next_x_days = fields.Integer(
+        string="Inventory For Next X Days", default=30,
+        help="Select next number of days for the over and out of stock "
+             "analysis")
+    age_breakdown_days = fields.Integer(
+        string="Age Breakdown Days", default=30,
+        help="Number of days of each slot of the age breakdown")
+    include_fsn = fields.Boolean(string="FSN", default=True,
+                                 help="Add the FSN analysis sheet")
+    include_xyz = fields.Boolean(string="XYZ", default=True,
+                                 help="Add the XYZ analysis sheet")
+    include_aging = fields.Boolean(string="Aging", default=True,
+                                   help="Add the aging analysis sheet")
+    include_age_breakdown = fields.Boolean(
+        string="Age Breakdown", help="Add the age breakdown sheet")
+    include_over_stock = fields.Boolean(
+        string="Over Stock", default=True,
+        help="Add the over stock analysis sheet")
+    include_out_of_stock = fields.Boolean(
+        string="Out Of Stock", default=True,
+        help="Add the out of stock analysis sheet")
+
+    def _get_selected_reports(self):
+        """Return the reports selected on the wizard, in sheet order"""
+        return [report for report in PACK_SHEETS
+                if self[f'include_{report}']]
+
+    def action_excel(self):
+        """This function is for printing the workbook of the selected
+        reports"""
+        if self.start_date > self.end_date:
+            raise ValidationError("Start date cant be greater than end date")
+        reports = self._get_selected_reports()
+        if not reports:
+            raise ValidationError("Select at least one report to export")
+        options = {
+            'reports': reports,
+            'product_ids': self.product_ids.ids,
+            'category_ids': self.category_ids.ids,
+            'company_ids': self.company_ids.ids,
+            'warehouse_ids': self.warehouse_ids.ids,
+            'start_date': self.start_date,
+            'end_date': self.end_date,
+            'inventory_for_next_x_days': self.inventory_for_next_x_days,
+            'age_breakdown_days': self.age_breakdown_days,
+        }
+        return {
+            'type': 'ir.actions.report',
+            'data': {'model': 'inventory.analytics.pack.report',
+                     'options': json.dumps(
+                         options, default=fields.date_utils.json_default),
+                     'output_format': 'xlsx',
+                     'report_name': 'Inventory Analytics Pack',
+                     },
+            'report_type': 'xlsx',
+        }
+
+    def get_xlsx_report(self, data, response):
+        """Build the base relation once and stream every selected report as
+        a sheet of the same workbook"""
+        filters = dict(data,
+                       start_date=fields.Date.to_date(data['start_date']),
+                       end_date=fields.Date.to_date(data['end_date']))
+        engine = self.env['inventory.report.engine']
+        with engine._report_run('analytics_pack'), \
+                tempfile.TemporaryFile() as output:
+            engine._create_base_table(filters)
+            workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+            styles = {
+                'head': workbook.add_format(
+                    {'align': 'center', 'bold': True, 'font_size': '20px'}),
+                'header': workbook.add_format(
+                    {'font_name': 'Times', 'bold': True, 'left': 1,
+                     'bottom': 1, 'right': 1, 'top': 1, 'align': 'center'}),
+                'text': workbook.add_format(
+                    {'font_name': 'Times', 'left': 1, 'bottom': 1, 'right': 1,
+                     'top': 1, 'align': 'left'}),
+                'bold': workbook.add_format(
+                    {'bold': True, 'font_size': '10px', 'align': 'left'}),
+                'txt': workbook.add_format(
+                    {'font_size': '10px', 'align': 'left'}),
+            }
+            for report in filters['reports']:
+                self._write_pack_sheet(workbook, styles, report, filters)
+            workbook.close()
+            output.seek(0)
+            shutil.copyfileobj(output, response.stream)
+
+    def _get_sheet_columns(self, report, filters):
+        """Return the (header, key, width) columns of a report sheet"""
+        columns = list(PACK_SHEETS[report][1])
+        if report == 'age_breakdown':
+            headers = self.env[
+                'report.inventory_advanced_reports.report_inventory_breakdown'
+            ].get_header(filters.get('age_breakdown_days') or 30)
+            for slot, header in enumerate(headers, start=1):
+                columns.append((f'{header} QTY', f'age_breakdown_qty_{slot}', 12))
+                columns.append(
+                    (f'{header} Value', f'age_breakdown_value_{slot}', 12))
+        return columns
+
+    def _write_pack_sheet(self, workbook, styles, report, filters):
+        """Write one report of the pack row by row. With constant memory
+        mode the rows must be written in order, headers first."""
+        title, dummy = PACK_SHEETS[report]
+        columns = self._get_sheet_columns(report, filters)
+        sheet = workbook.add_worksheet(title)
+        sheet.set_margins(0.5, 0.5, 0.5, 0.5)
+        for col, (dummy, dummy, width) in enumerate(columns):
+            sheet.set_column(col, col, width)
+        sheet.merge_range(1, 1, 2, 5, f'Inventory {title} Report',
+                          styles['head'])
+        sheet.write(4, 0, 'Start Date: ', styles['bold'])
+        sheet.write(4, 1, str(filters['start_date']), styles['txt'])
+        sheet.write(5, 0, 'End Date: ', styles['bold'])
+        sheet.write(5, 1, str(filters['end_date']), styles['txt'])
+        for col, (header, dummy, dummy) in enumerate(columns):
+            sheet.write(8, col, header, styles['header'])
+        row = 9
+        try:
+            for values in self.env['inventory.report.engine']._iter_base_rows(
+                    report, filters):
+                for col, (dummy, key, dummy) in enumerate(columns):
+                    value = values.get(key)
+                    if value is not None and not isinstance(
+                            value, (int, float, str)):
+                        value = str(value)
+                    sheet.write(row, col, value, styles['text'])
+                row += 1
+        except ReportTimeout as error:
+            # The statement ran in a savepoint: keep the sheets already
+            # written, tell the user which report is incomplete and close
+            # the run as partial.
+            sheet.write(row + 1, 0, error.args[0], styles['bold'])
+            self.env['inventory.report.engine']._set_run_partial(
+                f'{title}: {error.args[0]}')
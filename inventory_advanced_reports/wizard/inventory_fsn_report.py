@@ -34,6 +34,8 @@ class InventoryFsnReport(models.TransientModel):
     """This model is for creating a wizard for inventory turnover report."""
     _name = 'inventory.fsn.report'
     _description = 'Inventory FSN Report'
+    _inherit = ['inventory.report.definition.mixin',
+                'inventory.report.comparison.mixin']
 
     start_date = fields.Date('Start Date', required=True,
                              help="Start date to analyse the report")
@@ -70,10 +72,11 @@ class InventoryFsnReport(models.TransientModel):
         start_date = self.start_date
         end_date = self.end_date
         filtered_product_stock = []
-        query = """
+        product_join = self.env['inventory.report.engine'] \
+            ._get_product_join(self.product_ids.ids, self.category_ids.ids)
+        query = f"""
                 SELECT
                     product_id,
-                    product_code_and_name,
                     category_id,
                     category_name,
                     company_id,
@@ -114,13 +117,6 @@ class InventoryFsnReport(models.TransientModel):
                     (SELECT
                         pp.id AS product_id,
                         pt.categ_id AS category_id,
-                        CASE
-                            WHEN pp.default_code IS NOT NULL 
-                                THEN CONCAT(pp.default_code, ' - ',
-                                 pt.name->>'en_US')
-                            ELSE
-                                pt.name->>'en_US'
-                        END AS product_code_and_name, 
                         pc.complete_name AS category_name,
                         company.id AS company_id,
                         sw.id AS warehouse_id,
@@ -168,6 +164,7 @@ class InventoryFsnReport(models.TransientModel):
                         ON sm.location_dest_id = sld_dest.id
                     LEFT JOIN
                         stock_location sld_src ON sm.location_id = sld_src.id
+                    {product_join}
                     WHERE
                         sm.state = 'done'
                                 """
@@ -178,22 +175,6 @@ class InventoryFsnReport(models.TransientModel):
         sub_queries = []
         sub_params = []
         param_count = 0
-        if self.product_ids or self.category_ids:
-            query += " AND ("
-        if self.product_ids:
-            product_ids = [product_id.id for product_id in self.product_ids]
-            query += "pp.id = ANY(%s)"
-            params.append(product_ids)
-            param_count += 1
-        if self.product_ids and self.category_ids:
-            query += " OR "
-        if self.category_ids:
-            category_ids = [category_id.id for category_id in self.category_ids]
-            query += "pt.categ_id IN %s"
-            params.append(tuple(category_ids))
-            param_count += 1
-        if self.product_ids or self.category_ids:
-            query += ")"
         if self.company_ids:
             query += f" AND company.id IN %s"
             sub_params.append(tuple(self.company_ids.ids))
@@ -205,16 +186,11 @@ class InventoryFsnReport(models.TransientModel):
         if sub_queries:
             query += " AND " + " AND ".join(sub_queries)
         query += """
-                        GROUP BY pp.id, pt.categ_id,CASE
-                    WHEN pp.default_code IS NOT NULL 
-                        THEN CONCAT(pp.default_code, ' - ', pt.name->>'en_US')
-                    ELSE
-                        pt.name->>'en_US'
-                END, pc.complete_name, company.id, sw.id
+                        GROUP BY pp.id, pt.categ_id, pc.complete_name, company.id, sw.id
                     ) AS subquery
                                 """
-        self.env.cr.execute(query, tuple(params + sub_params))
-        result_data = self.env.cr.dictfetchall()
+        result_data = self.env['inventory.report.engine']._run_query(
+            'fsn', query, tuple(params + sub_params), labels=True)
         for fsn_data in result_data:
             if fsn_data.get('fsn_classification') == str(fsn):
                 filtered_product_stock.append(fsn_data)
@@ -248,7 +224,9 @@ class InventoryFsnReport(models.TransientModel):
 
     def action_excel(self):
         """This function is for printing excel report"""
-        data = self.get_report_data()
+        if self.compare:
+            return self._action_comparison_excel()
+        data = self._get_run_report_data()
         return {
             'type': 'ir.actions.report',
             'data': {'model': 'inventory.fsn.report',
@@ -262,6 +240,8 @@ class InventoryFsnReport(models.TransientModel):
 
     def get_xlsx_report(self, data, response):
         """Excel sheet format for printing the data"""
+        if data.get('comparison'):
+            return self._get_comparison_xlsx_report(data, response)
         datas = data['data']
         start_date = data['start_date']
         end_date = data['end_date']
@@ -318,7 +298,7 @@ class InventoryFsnReport(models.TransientModel):
 
     def display_report_views(self):
         """Function for displaying graph and tree view of data"""
-        data = self.get_report_data()
+        data = self._get_run_report_data()
         for data_values in data.get('data'):
             data_values['data_id'] = self.id
             self.generate_data(data_values)
@@ -72,6 +72,13 @@ class InventoryOutOfStockDataReport(models.TransientModel):
         string="FSN Classification",
         help="Classification which categorizes items based on their consumption"
              " or movement rate.")
+    days_until_stockout = fields.Integer(
+        string="Days To Stockout",
+        help="Days until the projected stock of the warehouse reaches zero")
+    stockout_date = fields.Date(
+        string="Stockout Date",
+        help="Date the projected stock of the warehouse reaches zero, empty "
+             "when it lasts beyond the projection horizon")
     data_id = fields.Many2one('inventory.out.of.stock.report',
                               string="Out Of Stock Data",
                               help="corresponding FSN data")
@@ -34,6 +34,7 @@ class InventoryOutOfStockReport(models.TransientModel):
     """This model is for creating a wizard for inventory turnover report."""
     _name = 'inventory.out.of.stock.report'
     _description = 'Inventory Out of Stock Report'
+    _inherit = 'inventory.report.definition.mixin'
 
     start_date = fields.Date('Start Date', required=True,
                              help="Start date to analyse the report")
@@ -59,10 +60,11 @@ class InventoryOutOfStockReport(models.TransientModel):
 
     def get_report_data(self):
         """Function for returning data to print"""
-        query = """
+        product_join = self.env['inventory.report.engine'] \
+            ._get_product_join(self.product_ids.ids, self.category_ids.ids)
+        query = f"""
                     SELECT
                     product_id,
-                    product_code_and_name,
                     category_id,
                     category_name,
                     company_id,
@@ -133,13 +135,6 @@ class InventoryOutOfStockReport(models.TransientModel):
                     END AS fsn_classification
                     FROM(
                         SELECT 
-                            CASE
-                                WHEN pp.default_code IS NOT NULL 
-                                    THEN CONCAT(pp.default_code, ' - ', 
-                                    pt.name->>'en_US')
-                                ELSE
-                                    pt.name->>'en_US'
-                            END AS product_code_and_name,
                             company.id AS company_id,
                             company.name AS company_name,
                             sm.product_id AS product_id,
@@ -216,6 +211,7 @@ class InventoryOutOfStockReport(models.TransientModel):
                     FROM stock_location sld
                     INNER JOIN stock_move sm ON sld.id = sm.location_id
                 ) sld_src ON sm.id = sld_src.move_id
+                {product_join}
                 WHERE pp.active = TRUE
                         AND pt.active = TRUE
                         AND pt.type = 'product'
@@ -229,22 +225,6 @@ class InventoryOutOfStockReport(models.TransientModel):
         sub_queries = []
         sub_params = []
         param_count = 0
-        if self.product_ids or self.category_ids:
-            query += " AND ("
-        if self.product_ids:
-            product_ids = [product_id.id for product_id in self.product_ids]
-            query += "pp.id = ANY(%s)"
-            params.append(product_ids)
-            param_count += 1
-        if self.product_ids and self.category_ids:
-            query += " OR "
-        if self.category_ids:
-            category_ids = [category.id for category in self.category_ids]
-            params.append(category_ids)
-            query += "(pt.categ_id = ANY(%s))"
-            param_count += 1
-        if self.product_ids or self.category_ids:
-            query += ")"
         if self.company_ids:
             company_ids = [company.id for company in self.company_ids]
             query += " AND (sm.company_id = ANY(%s))"  # Specify the table alias
@@ -257,10 +237,21 @@ class InventoryOutOfStockReport(models.TransientModel):
             param_count += 1
         if sub_queries:
             query += " AND " + " AND ".join(sub_queries)
-        query += """ GROUP BY pp.id, pt.name, pc.id, company.id, sm.product_id, 
+        query += """ GROUP BY pp.id, pc.id, company.id, sm.product_id, 
         sw.id) AS sub_query """
-        self.env.cr.execute(query, tuple(params + sub_params))
-        result_data = self.env.cr.dictfetchall()
+        result_data = self.env['inventory.report.engine']._run_query(
+            'out_of_stock', query, tuple(params + sub_params), labels=True)
+        filters = {
+            'start_date': self.start_date,
+            'end_date': self.end_date,
+            'product_ids': self.product_ids.ids,
+            'category_ids': self.category_ids.ids,
+            'company_ids': self.company_ids.ids,
+            'inventory_for_next_x_days': self.inventory_for_next_x_days,
+        }
+        demand_engine = self.env['inventory.demand.engine']
+        demand_engine._apply_demand(result_data, 'out_of_stock', filters)
+        demand_engine._project_stockout(result_data, 'out_of_stock', filters)
         for data in result_data:
             product_id = data.get('product_id')
             out_of_stock_qty = data.get('out_of_stock_qty')
@@ -308,7 +299,7 @@ class InventoryOutOfStockReport(models.TransientModel):
 
     def action_excel(self):
         """This function is for printing excel report"""
-        data = self.get_report_data()
+        data = self._get_run_report_data()
         return {
             'type': 'ir.actions.report',
             'data': {'model': 'inventory.out.of.stock.report',
@@ -356,7 +347,7 @@ class InventoryOutOfStockReport(models.TransientModel):
                    'In Stock Days', 'Out Of Stock Days', 'Out Of Stock Ratio',
                    'Cost Price', 'Out Of Stock QTY', 'Out Of Stock QTY(%)',
                    'Out Of Stock Value(%)', 'Turnover Ratio',
-                   'FSN Classification']
+                   'FSN Classification', 'Days To Stockout', 'Stockout Date']
         for col, header in enumerate(headers):
             sheet.write(8, col, header, header_style)
         sheet.set_column('A:A', 27, cell_format)
@@ -391,6 +382,8 @@ class InventoryOutOfStockReport(models.TransientModel):
             sheet.write(row, 15, val['out_of_stock_value'], text_style)
             sheet.write(row, 16, val['turnover_ratio'], text_style)
             sheet.write(row, 17, val['fsn_classification'], text_style)
+            sheet.write(row, 18, val.get('days_until_stockout'), text_style)
+            sheet.write(row, 19, val.get('stockout_date'), text_style)
             row += 1
             number += 1
         workbook.close()
@@ -400,7 +393,7 @@ class InventoryOutOfStockReport(models.TransientModel):
 
     def display_report_views(self):
         """Function for displaying the graph and tree view of data"""
-        data = self.get_report_data()
+        data = self._get_run_report_data()
         for data_values in data.get('data'):
             data_values['data_id'] = self.id
             self.generate_data(data_values)
@@ -449,5 +442,7 @@ class InventoryOutOfStockReport(models.TransientModel):
             'out_of_stock_value': data_values.get('out_of_stock_value'),
             'turnover_ratio': data_values.get('turnover_ratio'),
             'fsn_classification': data_values.get('fsn_classification'),
+            'days_until_stockout': data_values.get('days_until_stockout'),
+            'stockout_date': data_values.get('stockout_date'),
             'data_id': self.id,
         })
@@ -34,6 +34,7 @@ class InventoryOverStockReport(models.TransientModel):
     """This model is for creating a wizard for inventory Over Stock report."""
     _name = 'inventory.over.stock.report'
     _description = 'Inventory Over Stock Report'
+    _inherit = 'inventory.report.definition.mixin'
 
     start_date = fields.Date('Start Date', required=True,
                              help="Start date to analyse the report")
@@ -61,10 +62,11 @@ class InventoryOverStockReport(models.TransientModel):
         """Function for returning data to print"""
         processed_product_ids = []
         filtered_result_data = []
-        query = """
+        product_join = self.env['inventory.report.engine'] \
+            ._get_product_join(self.product_ids.ids, self.category_ids.ids)
+        query = f"""
                 SELECT
                 product_id,
-                product_code_and_name,
                 category_id,
                 category_name,
                 company_id,
@@ -111,13 +113,6 @@ class InventoryOverStockReport(models.TransientModel):
                 END AS fsn_classification
                 FROM(
                     SELECT 
-                        CASE
-                            WHEN pp.default_code IS NOT NULL 
-                                THEN CONCAT(pp.default_code, ' - ', 
-                                pt.name->>'en_US')
-                            ELSE
-                                pt.name->>'en_US'
-                        END AS product_code_and_name,
                         company.id AS company_id,
                         company.name AS company_name,
                         sm.product_id AS product_id,
@@ -192,6 +187,7 @@ class InventoryOverStockReport(models.TransientModel):
                 FROM stock_location sld
                 INNER JOIN stock_move sm ON sld.id = sm.location_id
             ) sld_src ON sm.id = sld_src.move_id
+            {product_join}
             WHERE pp.active = TRUE
                     AND pt.active = TRUE
                     AND pt.type = 'product'
@@ -205,22 +201,6 @@ class InventoryOverStockReport(models.TransientModel):
         sub_queries = []
         sub_params = []
         param_count = 0
-        if self.product_ids or self.category_ids:
-            query += " AND ("
-        if self.product_ids:
-            product_ids = [product_id.id for product_id in self.product_ids]
-            query += "pp.id = ANY(%s)"
-            params.append(product_ids)
-            param_count += 1
-        if self.product_ids and self.category_ids:
-            query += " OR "
-        if self.category_ids:
-            category_ids = [category.id for category in self.category_ids]
-            params.append(category_ids)
-            query += "(pt.categ_id = ANY(%s))"
-            param_count += 1
-        if self.product_ids or self.category_ids:
-            query += ")"
         if self.company_ids:
             company_ids = [company.id for company in self.company_ids]
             query += " AND (sm.company_id = ANY(%s))"  # Specify the table alias
@@ -233,10 +213,19 @@ class InventoryOverStockReport(models.TransientModel):
             param_count += 1
         if sub_queries:
             query += " AND " + " AND ".join(sub_queries)
-        query += """ GROUP BY pp.id, pt.name, pc.id, company.id, sm.product_id, 
+        query += """ GROUP BY pp.id, pc.id, company.id, sm.product_id, 
         sw.id) AS sub_query """
-        self.env.cr.execute(query, tuple(params + sub_params))
-        result_data = self.env.cr.dictfetchall()
+        result_data = self.env['inventory.report.engine']._run_query(
+            'over_stock', query, tuple(params + sub_params), labels=True)
+        self.env['inventory.demand.engine']._apply_demand(
+            result_data, 'over_stock', {
+                'start_date': self.start_date,
+                'end_date': self.end_date,
+                'product_ids': self.product_ids.ids,
+                'category_ids': self.category_ids.ids,
+                'company_ids': self.company_ids.ids,
+                'inventory_for_next_x_days': self.inventory_for_next_x_days,
+            })
         for data in result_data:
             product_id = data.get('product_id')
             if product_id not in processed_product_ids:
@@ -341,7 +330,7 @@ class InventoryOverStockReport(models.TransientModel):
 
     def action_excel(self):
         """This function is for printing excel report"""
-        data = self.get_report_data()
+        data = self._get_run_report_data()
         return {
             'type': 'ir.actions.report',
             'data': {'model': 'inventory.over.stock.report',
@@ -438,7 +427,7 @@ class InventoryOverStockReport(models.TransientModel):
 
     def display_report_views(self):
         """Function for displaying the graph and tree view of the data"""
-        data = self.get_report_data()
+        data = self._get_run_report_data()
         for data_values in data.get('data'):
             data_values['data_id'] = self.id
             self.generate_data(data_values)
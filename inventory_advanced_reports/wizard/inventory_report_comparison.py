@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#  Cybrosys Technologies Pvt. Ltd.
+#
+#  Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#  Author: Jumana Haseen (odoo@cybrosys.com)
+#
+#  You can modify it under the terms of the GNU LESSER
+#  GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#  You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#  (LGPL v3) along with this program.
+#  If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+import io
+import json
+from datetime import timedelta
+from odoo import api, fields, models
+from odoo.exceptions import ValidationError
+from ..models.inventory_report_engine import COMPARISON_MEASURES, \
+    REPORT_MODELS
+
+try:
+    from odoo.tools.misc import xlsxwriter
+except ImportError:
+    import xlsxwriter
+
+MEASURE_LABELS = {
+    'opening_stock': 'Opening Stock',
+    'closing_stock': 'Closing Stock',
+    'average_stock': 'Average Stock',
+    'sales': 'Sales',
+    'turnover_ratio': 'Turnover Ratio',
+    'sales_return': 'Sales Return',
+    'purchase': 'Purchase',
+    'purchase_return': 'Purchase Return',
+    'internal_in': 'Internal In',
+    'internal_out': 'Internal Out',
+    'adj_in': 'Adjustment In',
+    'adj_out': 'Adjustment Out',
+    'production_in': 'Production In',
+    'production_out': 'Production Out',
+    'transit_in': 'Transit In',
+    'transit_out': 'Transit Out',
+}
+
+
+class InventoryReportComparisonMixin(models.AbstractModel):
+    """Compare the measures of a report wizard over two periods"""
+    _name = 'inventory.report.comparison.mixin'
+    _description = 'Inventory Report Comparison Mixin'
+
+    compare = fields.Boolean(
+        string="Compare With Previous Period",
+        help="Export the measures of the period next to the measures of a "
+             "previous period, with their delta and change in percent")
+    compare_start_date = fields.Date(
+        string="Previous Start Date", compute='_compute_compare_dates',
+        store=True, readonly=False,
+        help="Start of the period compared, by default the period of the "
+             "same length before the start date")
+    compare_end_date = fields.Date(
+        string="Previous End Date", compute='_compute_compare_dates',
+        store=True, readonly=False,
+        help="End of the period compared, by default the day before the "
+             "start date")
+
+    @api.depends('start_date', 'end_date')
+    def _compute_compare_dates(self):
+        """Default the compared period to the previous period of the same
+        length"""
+        for wizard in self:
+            if not wizard.start_date or not wizard.end_date:
+                continue
+            wizard.compare_end_date = wizard.start_date - timedelta(days=1)
+            wizard.compare_start_date = wizard.compare_end_date - (
+                wizard.end_date - wizard.start_date)
+
+    def _get_comparison_data(self):
+        """Return the options of the comparison export"""
+        if self.start_date > self.end_date \
+                or self.compare_start_date > self.compare_end_date:
+            raise ValidationError("Start date cant be greater than end date")
+        report_type = REPORT_MODELS[self._name]
+        filters = {
+            'start_date': self.start_date,
+            'end_date': self.end_date,
+            'compare_start_date': self.compare_start_date,
+            'compare_end_date': self.compare_end_date,
+            'product_ids': self.product_ids.ids,
+            'category_ids': self.category_ids.ids,
+            'company_ids': self.company_ids.ids,
+            'warehouse_ids': self.warehouse_ids.ids,
+        }
+        engine = self.env['inventory.report.engine']
+        with engine._report_run(report_type, filters):
+            rows = engine._get_comparison_rows(report_type, filters)
+        if 'fsn' in self._fields and self.fsn != 'all':
+            classification = dict(self._fields['fsn'].selection)[self.fsn]
+            rows = [row for row in rows
+                    if row['fsn_classification'] == classification]
+        if not rows:
+            raise ValidationError("No corresponding data to print")
+        return dict(filters, comparison=True, report_type=report_type,
+                    title=self._description, data=rows)
+
+    def _action_comparison_excel(self):
+        """Export the comparison of the two periods"""
+        return {
+            'type': 'ir.actions.report',
+            'data': {'model': self._name,
+                     'options': json.dumps(
+                         self._get_comparison_data(),
+                         default=fields.date_utils.json_default),
+                     'output_format': 'xlsx',
+                     'report_name': 'Excel Report',
+                     },
+            'report_type': 'xlsx',
+        }
+
+    def _get_comparison_xlsx_report(self, data, response):
+        """Write the comparison of the two periods: every measure of the
+        period is followed by its previous value, delta and change"""
+        output = io.BytesIO()
+        workbook = xlsxwriter.Workbook(output, {'in_memory': True})
+        sheet = workbook.add_worksheet()
+        sheet.set_margins(0.5, 0.5, 0.5, 0.5)
+        header_style = workbook.add_format(
+            {'font_name': 'Times', 'bold': True, 'left': 1, 'bottom': 1,
+             'right': 1, 'top': 1, 'align': 'center', 'text_wrap': True})
+        text_style = workbook.add_format(
+            {'font_name': 'Times', 'left': 1, 'bottom': 1, 'right': 1, 'top': 1,
+             'align': 'left'})
+        head = workbook.add_format(
+            {'align': 'center', 'bold': True, 'font_size': '20px'})
+        bold_format = workbook.add_format(
+            {'bold': True, 'font_size': '10px', 'align': 'left'})
+        txt = workbook.add_format({'font_size': '10px', 'align': 'left'})
+        sheet.merge_range('B2:H3', f"{data['title']} Comparison", head)
+        sheet.write('A5', 'Period: ', bold_format)
+        sheet.write('B5', f"{data['start_date']} - {data['end_date']}", txt)
+        sheet.write('A6', 'Previous Period: ', bold_format)
+        sheet.write('B6', f"{data['compare_start_date']} - "
+                          f"{data['compare_end_date']}", txt)
+        columns = [('Company', 'company_name'),
+                   ('Product', 'product_code_and_name'),
+                   ('Category', 'category_name')]
+        for measure in COMPARISON_MEASURES[data['report_type']]:
+            label = MEASURE_LABELS[measure]
+            columns += [(label, measure),
+                        (f'{label} (Previous)', f'{measure}_previous'),
+                        (f'{label} Delta', f'{measure}_delta'),
+                        (f'{label} Change (%)', f'{measure}_change')]
+        if data['report_type'] == 'fsn':
+            columns += [('FSN Classification', 'fsn_classification'),
+                        ('FSN Classification (Previous)',
+                         'fsn_classification_previous')]
+        for col, (header, _key) in enumerate(columns):
+            sheet.write(8, col, header, header_style)
+        sheet.set_column(0, 0, 23)
+        sheet.set_column(1, 1, 27)
+        sheet.set_column(2, 2, 25)
+        sheet.set_column(3, len(columns) - 1, 14)
+        sheet.freeze_panes(9, 3)
+        for row, val in enumerate(data['data'], start=9):
+            for col, (_header, key) in enumerate(columns):
+                sheet.write(row, col, val.get(key), text_style)
+        workbook.close()
+        output.seek(0)
+        response.stream.write(output.read())
+        output.close()
@@ -34,6 +34,8 @@ class InventoryStockMovementReport(models.TransientModel):
     """This model is for creating a wizard for inventory Over Stock report."""
     _name = 'inventory.stock.movement.report'
     _description = 'Inventory Stock Movement Report'
+    _inherit = ['inventory.report.definition.mixin',
+                'inventory.report.comparison.mixin']
 
     start_date = fields.Date('Start Date',
                              default=lambda self: fields.Date.today(),
@@ -68,12 +70,6 @@ class InventoryStockMovementReport(models.TransientModel):
         query = """
                 SELECT
                 pp.id as product_id,
-                CASE
-                WHEN pp.default_code IS NOT NULL 
-                    THEN CONCAT(pp.default_code, ' - ', pt.name->>'en_US')
-                ELSE
-                    pt.name->>'en_US'
-                END AS product_code_and_name, 
                 pc.complete_name AS category_name,
                 company.name AS company_name,                       
         """
@@ -177,25 +173,17 @@ class InventoryStockMovementReport(models.TransientModel):
                     INNER JOIN stock_warehouse sw ON sw.company_id = company.id
                     INNER JOIN product_category pc ON pc.id = pt.categ_id   
         """
-        query += """
+        product_join = self.env['inventory.report.engine'] \
+            ._get_product_join(self.product_ids.ids, self.category_ids.ids)
+        query += f"""
                     LEFT JOIN stock_location sld_dest 
                     ON sm.location_dest_id = sld_dest.id
                     LEFT JOIN stock_location sld_src 
                     ON sm.location_id = sld_src.id
+                    {product_join}
                     WHERE
                 sm.state = 'done'
                 """
-        sub_queries = []
-        if self.product_ids:
-            product_ids = [product_id.id for product_id in self.product_ids]
-            sub_queries.append("pp.id = ANY(%s)")
-            params.append(product_ids)
-        if self.category_ids:
-            category_ids = [category.id for category in self.category_ids]
-            sub_queries.append("pt.categ_id = ANY(%s)")
-            params.append(category_ids)
-        if sub_queries:
-            query += " AND (" + " OR ".join(sub_queries) + ")"
         if self.company_ids:
             company_ids = [company.id for company in self.company_ids]
             query += " AND sm.company_id = ANY(%s)"
@@ -205,10 +193,10 @@ class InventoryStockMovementReport(models.TransientModel):
             query += " AND sw.id = ANY(%s)"
             params.append(warehouse_ids)
         query += """
-            GROUP BY pp.id,pt.name,pc.complete_name,company.name
+            GROUP BY pp.id,pc.complete_name,company.name
         """
-        self.env.cr.execute(query, params)
-        result_data = self.env.cr.dictfetchall()
+        result_data = self.env['inventory.report.engine']._run_query(
+            'stock_movement', query, params, labels=True)
         if result_data:
             data = {
                 'data': result_data,
@@ -241,7 +229,9 @@ class InventoryStockMovementReport(models.TransientModel):
 
     def action_excel(self):
         """This function is for printing excel report"""
-        data = self.get_report_data()
+        if self.compare and not self.report_up_to_certain_date:
+            return self._action_comparison_excel()
+        data = self._get_run_report_data()
         return {
             'type': 'ir.actions.report',
             'data': {'model': 'inventory.stock.movement.report',
@@ -255,6 +245,8 @@ class InventoryStockMovementReport(models.TransientModel):
 
     def get_xlsx_report(self, data, response):
         """Excel format to print the data in Excel sheet"""
+        if data.get('comparison'):
+            return self._get_comparison_xlsx_report(data, response)
         datas = data['data']
         start_date = data['start_date']
         end_date = data['end_date']
@@ -34,6 +34,7 @@ class InventoryXyzReport(models.TransientModel):
     """This model is for creating a wizard for inventory aging report"""
     _name = "inventory.xyz.report"
     _description = "Inventory XYZ Report"
+    _inherit = 'inventory.report.definition.mixin'
 
     product_ids = fields.Many2many(
         "product.product", string="Products",
@@ -57,15 +58,10 @@ class InventoryXyzReport(models.TransientModel):
         xyz = dict(self._fields['xyz'].selection).get(self.xyz)
         params = []
         param_count = 0
-        query = """
+        product_join = self.env['inventory.report.engine'] \
+            ._get_product_join(self.product_ids.ids, self.category_ids.ids)
+        query = f"""
                 SELECT 
-                    CASE
-                        WHEN pp.default_code IS NOT NULL 
-                            THEN CONCAT(pp.default_code, ' - ', 
-                            pt.name->>'en_US')
-                        ELSE
-                            pt.name->>'en_US'
-                    END AS product_code_and_name,
                     svl.company_id,
                     company.name AS company_name,
                     svl.product_id,
@@ -78,6 +74,7 @@ class InventoryXyzReport(models.TransientModel):
                 INNER JOIN product_product pp ON pp.id = svl.product_id
                 INNER JOIN product_template pt ON pt.id = pp.product_tmpl_id
                 INNER JOIN product_category c ON c.id = pt.categ_id
+                {product_join}
                 WHERE pp.active = TRUE
                     AND pt.active = TRUE
                     AND pt.type = 'product'
@@ -88,39 +85,17 @@ class InventoryXyzReport(models.TransientModel):
             query += f" AND (company.id IS NULL OR company.id = ANY(%s))"
             params.append(company_ids)
             param_count += 1
-        if self.product_ids or self.category_ids:
-            query += " AND ("
-            if self.product_ids:
-                product_ids = [product_id.id for product_id in self.product_ids]
-                query += f"pp.id = ANY(%s)"
-                params.append(product_ids)
-                param_count += 1
-            if self.product_ids and self.category_ids:
-                query += " OR "
-            if self.category_ids:
-                category_ids = [category_id.id for category_id in
-                                self.category_ids]
-                query += f"c.id = ANY(%s)"
-                params.append(category_ids)
-                param_count += 1
-            query += ")"
         query += """
                 GROUP BY 
                 svl.company_id,
                 company.name,
                 svl.product_id,
-                CASE
-                    WHEN pp.default_code IS NOT NULL 
-                        THEN CONCAT(pp.default_code, ' - ', pt.name->>'en_US')
-                    ELSE
-                        pt.name->>'en_US'
-                END,
                 pt.categ_id,
                 c.complete_name
                 ORDER BY SUM(svl.remaining_value) DESC;
                         """
-        self.env.cr.execute(query, params)
-        result_data = self.env.cr.dictfetchall()
+        result_data = self.env['inventory.report.engine']._run_query(
+            'xyz', query, params, labels=True)
         total_current_value = 0
         cumulative_stock = 0
         filtered_stock = []
@@ -175,7 +150,7 @@ class InventoryXyzReport(models.TransientModel):
 
     def action_excel(self):
         """This function is for printing excel report"""
-        data = self.get_report_data()
+        data = self._get_run_report_data()
         return {
             'type': 'ir.actions.report',
             'data': {'model': 'inventory.xyz.report',
@@ -231,7 +206,7 @@ class InventoryXyzReport(models.TransientModel):
 
     def display_report_views(self):
         """Function for displaying graph and tree view of the data"""
-        data = self.get_report_data()
+        data = self._get_run_report_data()
         for data_values in data.get('data'):
             data_values['data_id'] = self.id
             self.generate_data(data_values)